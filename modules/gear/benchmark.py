@@ -0,0 +1,163 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+## @package gear.benchmark
+# @author Jeremie Passerin
+#
+# @brief benchmarks on synthetic data. Doesn't require Softimage.\n
+# Run with : python -m gear.benchmark
+
+##########################################################
+# GLOBAL
+##########################################################
+# Built-in
+import binascii
+import cPickle
+import random
+import time
+
+# gear
+import gear
+import gear.weights as wgt
+import gear.encode as enc
+import gear.buffer as buf
+
+##########################################################
+# TOOLS
+##########################################################
+# ========================================================
+## Return the time taken by a function call.
+# @param function Function - Function to call.
+# @param args Arguments of the function.
+# @return Tuple - The time in seconds and the returned value.
+def timeCall(function, *args):
+
+    start = time.time()
+    result = function(*args)
+
+    return time.time() - start, result
+
+## Create synthetic envelope weights.\n
+## Each point is normalized and weighted on a few deformers close to each other.
+# @param point_count Integer
+# @param deformer_count Integer
+# @param influences Integer - Maximum number of deformers per point.
+# @param seed Integer - Random seed.
+# @return Tuple of Tuple of Float - Deformer major weights, as EnvelopeOp.Weights.Array.
+def getSyntheticWeights(point_count=100000, deformer_count=250, influences=4, seed=0):
+
+    rand = random.Random(seed)
+
+    columns = [[0.0] * point_count for i in xrange(deformer_count)]
+    for point_index in xrange(point_count):
+
+        first = rand.randint(0, deformer_count - influences)
+        values = [rand.random() for i in xrange(rand.randint(1, influences))]
+        total = sum(values)
+
+        for i, value in enumerate(values):
+            columns[first + i][point_index] = value * 100 / total
+
+    return tuple([tuple(column) for column in columns])
+
+##########################################################
+# BENCHMARKS
+##########################################################
+# ========================================================
+## Compare the weights codec with the previous RLE and pickle compression.
+# @param point_count Integer
+# @param deformer_count Integer
+# @param influences Integer - Maximum number of deformers per point.
+# @return Dictionary - Size and times for each codec.
+def benchmarkWeightsCodec(point_count=100000, deformer_count=250, influences=4):
+
+    weights_tuple = getSyntheticWeights(point_count, deformer_count, influences)
+
+    results = {}
+
+    # Previous compression
+    encode_time, text = timeCall(lambda data: binascii.b2a_base64(binascii.rlecode_hqx(cPickle.dumps(data))), weights_tuple)
+    decode_time, data = timeCall(lambda text: cPickle.loads(binascii.rledecode_hqx(binascii.a2b_base64(text))), text)
+    results["rle_pickle"] = {"size":len(text), "encode":encode_time, "decode":decode_time}
+
+    # Weights codec (the conversion to sparse is part of the export)
+    encode_time, text = timeCall(lambda data: enc.encodeWeights(wgt.getSparseFromArray(data)), weights_tuple)
+    decode_time, data = timeCall(enc.decodeWeights, text)
+    results["weights_codec"] = {"size":len(text), "encode":encode_time, "decode":decode_time}
+
+    return results
+
+## Compare a full transpose of an operator output with a point buffer, for a small cluster.\n
+## Each evaluation gets a new, equal input tuple, as Softimage gives one per evaluation.
+# @param point_counts List of Integer - Mesh sizes.
+# @param cluster_size Integer - Number of points written by the operator.
+# @param evaluations Integer - Number of evaluations timed.
+# @return Dictionary - Time per evaluation for each mesh size.
+def benchmarkPointBuffer(point_counts=(1000, 10000, 100000), cluster_size=12, evaluations=20):
+
+    rand = random.Random(0)
+
+    results = {}
+    for point_count in point_counts:
+
+        positions = [[rand.random() for i in xrange(point_count)] for j in xrange(3)]
+        inputs = [tuple([tuple(row) for row in positions]) for i in xrange(evaluations)]
+        cluster = rand.sample(xrange(point_count), cluster_size)
+
+        def transpose():
+            for pos_tuple in inputs:
+                values = [pos_tuple[j][i] for i in range(len(pos_tuple[0])) for j in range(len(pos_tuple))]
+                for point in cluster:
+                    values[point*3:point*3+3] = [pos_tuple[0][point], pos_tuple[1][point], pos_tuple[2][point]]
+
+        def update():
+            point_buffer = buf.PointBuffer()
+            for pos_tuple in inputs:
+                point_buffer.update(pos_tuple)
+                for point in cluster:
+                    point_buffer.setPoint(point, point_buffer.getSourcePoint(point))
+
+        transpose_time = timeCall(transpose)[0]
+        update_time = timeCall(update)[0]
+        results["%s points"%point_count] = {"transpose":transpose_time / evaluations, "buffer":update_time / evaluations}
+
+    return results
+
+##########################################################
+# MAIN
+##########################################################
+## Log the results of a benchmark.
+# @param name String - Name of the benchmark.
+# @param results Dictionary - Values by case.
+def logResults(name, results):
+
+    gear.log(name)
+    for case in sorted(results.keys()):
+        gear.log("    %-20s %s"%(case, ", ".join(["%s=%s"%(k, results[case][k]) for k in sorted(results[case].keys())])))
+
+def main():
+    logResults("Weights codec", benchmarkWeightsCodec())
+    logResults("Point buffer", benchmarkPointBuffer())
+
+if __name__ == "__main__":
+    main()
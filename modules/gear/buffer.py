@@ -0,0 +1,111 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+## @package gear.buffer
+# @author Jeremie Passerin
+#
+# @brief output buffers for scripted operators. Doesn't require Softimage.
+#
+# Softimage gives arrays component major, as a tuple of rows (PositionArray, Elements.Array), and
+# expects them back as a flat point major list. A PointBuffer keeps that flat list between two
+# evaluations of an operator, so an update only rewrites the points of its cluster.
+
+##########################################################
+# GLOBAL
+##########################################################
+# Built-in
+from itertools import chain, izip
+
+##########################################################
+# POINT BUFFER
+##########################################################
+# ========================================================
+## Flat point major copy of an input array, kept between evaluations.
+class PointBuffer(object):
+
+    ## Init Method.
+    # @param self
+    def __init__(self):
+
+        self.source = None
+        self.values = None
+        self.stride = 0
+        self.written = set()
+
+    ## Set the input array of the evaluation.\n
+    ## The flat list is only rebuilt when the input changed, otherwise the points written by the
+    ## previous evaluation are restored from the input.
+    # @param self
+    # @param source Tuple of Tuple - Component major array, as PositionArray or Elements.Array.
+    # @return Boolean - True if the input changed.
+    def update(self, source):
+
+        if self.source is not None and source == self.source:
+
+            stride = self.stride
+            for point in self.written:
+                self.values[point*stride:(point+1)*stride] = [row[point] for row in source]
+
+            self.written = set()
+            return False
+
+        self.source = source
+        self.stride = len(source)
+        self.values = list(chain.from_iterable(izip(*source)))
+        self.written = set()
+
+        return True
+
+    ## Return the input values of a point.
+    # @param self
+    # @param point Integer - Point index.
+    # @return List of Float
+    def getSourcePoint(self, point):
+        return [row[point] for row in self.source]
+
+    ## Set the output values of a point.
+    # @param self
+    # @param point Integer - Point index.
+    # @param values List of Float - One value per component.
+    def setPoint(self, point, values):
+
+        self.values[point*self.stride:(point+1)*self.stride] = values
+        self.written.add(point)
+
+    ## Set the output values of some points.
+    # @param self
+    # @param points List of Integer - Point indexes.
+    # @param values List of List of Float - The values of each point.
+    def setPoints(self, points, values):
+
+        stride = self.stride
+        for point, point_values in zip(points, values):
+            self.values[point*stride:(point+1)*stride] = point_values
+
+        self.written.update(points)
+
+## Return the flat point major list of an array, without buffer.
+# @param source Tuple of Tuple - Component major array, as PositionArray or Elements.Array.
+# @return List of Float
+def getFlatArray(source):
+    return list(chain.from_iterable(izip(*source)))
@@ -29,20 +29,140 @@
 ##########################################################
 # GLOBAL
 ##########################################################
+import base64
 import binascii
 import cPickle
 import pickle
-import base64
+import struct
+import sys
+import zlib
+from array import array
+
+import gear.weights as wgt
+
+# =====================================================================
+# WEIGHTS CODEC
+WEIGHTS_MAGIC = "GWZ"
+WEIGHTS_VERSION = 1
+
+# magic, version, point count, deformer count, weight count, precision
+WEIGHTS_HEADER = struct.Struct("<3sBIIId")
+BLOCK_SIZE = struct.Struct("<I")
 
 ##########################################################
 # COMPRESSION
 ##########################################################
-def encodeData(data):
-     return binascii.b2a_base64(binascii.rlecode_hqx(cPickle.dumps(data)))
+# ========================================================
+## Encode envelope weights to a string that can be stored as xml text.\n
+## The number of weights of each point, the deformer indexes (as difference with the previous index of the point)
+## and the weights quantized to integers are stored in separate zlib compressed blocks.
+# @param weights SparseWeights - The weights to encode.
+# @param precision Float - Quantization step of the weights.
+# @param level Integer - zlib compression level.
+# @return String
+def encodeWeights(weights, precision=1E-6, level=6):
+
+    offsets = weights.offsets
+    indices = weights.indices
+
+    counts = array("I")
+    deltas = array("I")
+    for point_index in xrange(weights.point_count):
+
+        start = offsets[point_index]
+        end = offsets[point_index+1]
+        counts.append(end - start)
+
+        previous = 0
+        for deformer_index in indices[start:end]:
+            deltas.append(deformer_index - previous)
+            previous = deformer_index
+
+    scale = 1.0 / precision
+    quantized = array("i", [int(round(w * scale)) for w in weights.weights])
+
+    data = [WEIGHTS_HEADER.pack(WEIGHTS_MAGIC, WEIGHTS_VERSION, weights.point_count, weights.deformer_count, len(weights.weights), precision)]
+    for block in [counts, deltas, quantized]:
+        if sys.byteorder == "big":
+            block.byteswap()
+        block = zlib.compress(block.tostring(), level)
+        data.append(BLOCK_SIZE.pack(len(block)))
+        data.append(block)
+
+    return base64.b64encode("".join(data))
+
+## Decode envelope weights encoded with encodeWeights.\n
+## The weights written by older versions, without header, are decoded with decodeLegacyWeights.
+# @param text String - The encoded weights.
+# @return SparseWeights
+def decodeWeights(text):
+
+    try:
+        data = base64.b64decode(text.strip())
+    except TypeError, e:
+        raise ValueError("Invalid encoded weights : %s"%e)
+
+    if not data.startswith(WEIGHTS_MAGIC):
+        return decodeLegacyWeights(data)
 
-def decodeData(str):
-     return cPickle.loads(binascii.rledecode_hqx(binascii.a2b_base64(str)))
+    try:
+        magic, version, point_count, deformer_count, weight_count, precision = WEIGHTS_HEADER.unpack_from(data, 0)
+        if version > WEIGHTS_VERSION:
+            raise ValueError("Unsupported encoded weights version : %s"%version)
 
+        position = WEIGHTS_HEADER.size
+        blocks = []
+        for typecode in ["I", "I", "i"]:
+            size = BLOCK_SIZE.unpack_from(data, position)[0]
+            position += BLOCK_SIZE.size
+
+            block = array(typecode)
+            block.fromstring(zlib.decompress(data[position:position+size]))
+            if sys.byteorder == "big":
+                block.byteswap()
+
+            blocks.append(block)
+            position += size
+
+    except (struct.error, zlib.error), e:
+        raise ValueError("Corrupted encoded weights : %s"%e)
+
+    counts, deltas, quantized = blocks
+
+    offsets = array("l", [0])
+    indices = array("i")
+    start = 0
+    for count in counts:
+        end = start + count
+        deformer_index = 0
+        for delta in deltas[start:end]:
+            deformer_index += delta
+            indices.append(deformer_index)
+        offsets.append(end)
+        start = end
+
+    weights = array("d", [q * precision for q in quantized])
+
+    if len(offsets) != point_count + 1 or len(weights) != weight_count:
+        raise ValueError("Corrupted encoded weights")
+
+    return wgt.SparseWeights(offsets, indices, weights, deformer_count)
+
+## Decode envelope weights written by the encodeData of older versions, the pickled weights tuple of the envelope.
+# @param data String - The weights, decoded from base64.
+# @return SparseWeights
+def decodeLegacyWeights(data):
+
+    try:
+        weights_tuple = cPickle.loads(binascii.rledecode_hqx(data))
+    except Exception:
+        raise ValueError("Invalid encoded weights")
+
+    return wgt.getSparseFromArray(weights_tuple)
+
+##########################################################
+# SERIALIZATION
+##########################################################
 def serializeToBuffer(data):
      return base64.b64encode(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
 
@@ -0,0 +1,238 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+## @package gear.graph
+# @author Jeremie Passerin
+#
+# @brief dependency graphs. Doesn't require Softimage.
+#
+# The nodes are kept in insertion order, so the orders returned by a graph only depend on the
+# dependencies and on that order.\n
+# Weak dependencies are followed by getDependents() but don't constrain the order, so they can't close a cycle.
+
+##########################################################
+# GLOBAL
+##########################################################
+# Built-in
+import heapq
+
+##########################################################
+# DEPENDENCY GRAPH
+##########################################################
+# ========================================================
+## Nodes and the nodes they depend on.
+class DependencyGraph(object):
+
+    ## Init Method.
+    # @param self
+    def __init__(self):
+
+        self.nodes = [] ## List of node names, in insertion order.
+        self.dependencies = {} ## Dictionary of node names, the nodes each node depends on, with the kind of each dependency.
+        self.dependents = {} ## Dictionary of node names, the nodes depending on each node.
+        self.orderDependencies = {} ## Dictionary of node names, the nodes each node must come after.
+        self.orderDependents = {} ## Dictionary of node names, the nodes that must come after each node.
+
+    ## Add a node to the graph.
+    # @param self
+    # @param name String - Name of the node.
+    def add(self, name):
+
+        if name in self.dependencies:
+            return
+
+        self.nodes.append(name)
+        self.dependencies[name] = {}
+        self.dependents[name] = []
+        self.orderDependencies[name] = set()
+        self.orderDependents[name] = []
+
+    ## Add a dependency between two nodes. Missing nodes are added.
+    # @param self
+    # @param name String - Name of the dependent node.
+    # @param dependency String - Name of the node it depends on.
+    # @param kind String - Kind of dependency (ie. 'parent', 'uiHost').
+    # @param weak Boolean - True if the dependency doesn't constrain the order.
+    def addDependency(self, name, dependency, kind=None, weak=False):
+
+        if name == dependency:
+            return
+
+        self.add(name)
+        self.add(dependency)
+
+        if dependency not in self.dependencies[name]:
+            self.dependents[dependency].append(name)
+            self.dependencies[name][dependency] = []
+
+        if kind not in self.dependencies[name][dependency]:
+            self.dependencies[name][dependency].append(kind)
+
+        if not weak and dependency not in self.orderDependencies[name]:
+            self.orderDependents[dependency].append(name)
+            self.orderDependencies[name].add(dependency)
+
+    ## Return the nodes a node depends on directly.
+    # @param self
+    # @param name String - Name of the node.
+    # @return List of String
+    def getDependencies(self, name):
+        return [node for node in self.nodes if node in self.dependencies[name]]
+
+    ## Return the nodes depending on some nodes, directly or not, with these nodes.
+    # @param self
+    # @param names List of String - Names of the nodes.
+    # @return List of String - In insertion order.
+    def getDependents(self, names):
+
+        found = set()
+        stack = [name for name in names if name in self.dependents]
+        while stack:
+            name = stack.pop()
+            if name in found:
+                continue
+
+            found.add(name)
+            stack.extend(self.dependents[name])
+
+        return [node for node in self.nodes if node in found]
+
+    ## Return the nodes a node must come after.
+    # @param self
+    # @param name String - Name of the node.
+    # @return List of String
+    def getOrderDependencies(self, name):
+        return [node for node in self.nodes if node in self.orderDependencies[name]]
+
+    ## Return a cycle of dependencies. Weak dependencies are ignored.
+    # @param self
+    # @return List of String - The nodes of the cycle, the first one repeated at the end. None if there is no cycle.
+    def getCycle(self):
+
+        # 0: not visited, 1: in the current path, 2: done
+        states = dict.fromkeys(self.nodes, 0)
+        for start in self.nodes:
+            if states[start]:
+                continue
+
+            path = [start]
+            iterators = [iter(self.getOrderDependencies(start))]
+            states[start] = 1
+            while iterators:
+                for dependency in iterators[-1]:
+                    if states[dependency] == 1:
+                        return path[path.index(dependency):] + [dependency]
+                    if not states[dependency]:
+                        states[dependency] = 1
+                        path.append(dependency)
+                        iterators.append(iter(self.getOrderDependencies(dependency)))
+                        break
+                else:
+                    states[path.pop()] = 2
+                    iterators.pop()
+
+        return None
+
+    ## Return the nodes by levels. Each node only depends on nodes of the previous levels,
+    ## so the nodes of a level are independent of each other.
+    # @param self
+    # @return List of List of String - None if the graph has a cycle.
+    def getLevels(self):
+
+        counts = {}
+        for name in self.nodes:
+            counts[name] = len(self.orderDependencies[name])
+
+        levels = []
+        level = [name for name in self.nodes if not counts[name]]
+        done = 0
+        while level:
+            levels.append(level)
+            done += len(level)
+
+            ready = set()
+            for name in level:
+                for dependent in self.orderDependents[name]:
+                    counts[dependent] -= 1
+                    if not counts[dependent]:
+                        ready.add(dependent)
+
+            level = [name for name in self.nodes if name in ready]
+
+        if done < len(self.nodes):
+            return None
+
+        return levels
+
+    ## Return the nodes in dependency order, each node after the nodes it depends on.\n
+    ## The order is the closest to the insertion order : each time, the first node whose dependencies are done comes next.
+    ## If the insertion order respects the dependencies, it is returned as it is.
+    # @param self
+    # @return List of String - None if the graph has a cycle.
+    def getOrder(self):
+
+        counts = {}
+        for name in self.nodes:
+            counts[name] = len(self.orderDependencies[name])
+
+        index = {}
+        for i, name in enumerate(self.nodes):
+            index[name] = i
+
+        ready = [index[name] for name in self.nodes if not counts[name]]
+        heapq.heapify(ready)
+
+        order = []
+        while ready:
+            name = self.nodes[heapq.heappop(ready)]
+            order.append(name)
+
+            for dependent in self.orderDependents[name]:
+                counts[dependent] -= 1
+                if not counts[dependent]:
+                    heapq.heappush(ready, index[dependent])
+
+        if len(order) < len(self.nodes):
+            return None
+
+        return order
+
+    ## Return True if two nodes don't depend on each other, directly or not.
+    # @param self
+    # @param a String - Name of a node.
+    # @param b String - Name of another node.
+    # @return Boolean
+    def isIndependent(self, a, b):
+        return b not in self.getDependents([a]) and a not in self.getDependents([b])
+
+    ## Return a readable description of a cycle, with the kind of each dependency.
+    # @param self
+    # @param cycle List of String - As returned by getCycle().
+    # @return String
+    def getCycleAsString(self, cycle):
+
+        text = cycle[0]
+        for name, dependency in zip(cycle[:-1], cycle[1:]):
+            text += " -(%s)-> %s"%("/".join([str(kind) for kind in self.dependencies[name][dependency]]), dependency)
+
+        return text
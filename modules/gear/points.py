@@ -0,0 +1,97 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+## @package gear.points
+# @author Jeremie Passerin
+#
+# @brief point position kernels. Doesn't require Softimage.
+#
+# Positions are given component major, as Points.PositionArray : a tuple of the x, y and z rows.
+# The kernels work on a list of point indexes and return one (x, y, z) tuple per point.
+# Matrices are given as Matrix4.Get2() : 16 values, row major, with the translation on the last row.
+
+##########################################################
+# GLOBAL
+##########################################################
+# Built-in
+from itertools import izip
+
+##########################################################
+# GATHER
+##########################################################
+# ========================================================
+## Return the positions of some points.
+# @param positions Tuple of Tuple of Float - x, y and z rows.
+# @param points List of Integer - Point indexes.
+# @return List of Tuple of Float
+def getPoints(positions, points):
+
+    x, y, z = positions
+
+    return zip(map(x.__getitem__, points), map(y.__getitem__, points), map(z.__getitem__, points))
+
+##########################################################
+# KERNELS
+##########################################################
+# ========================================================
+## Return the transformed positions of some points.
+# @param positions Tuple of Tuple of Float - x, y and z rows.
+# @param points List of Integer - Point indexes.
+# @param matrix List of Float - 4x4 matrix, as Matrix4.Get2().
+# @return List of Tuple of Float
+def transformPoints(positions, points, matrix):
+
+    m00, m01, m02, m03, m10, m11, m12, m13, m20, m21, m22, m23, m30, m31, m32, m33 = matrix
+
+    return [(x*m00 + y*m10 + z*m20 + m30,
+             x*m01 + y*m11 + z*m21 + m31,
+             x*m02 + y*m12 + z*m22 + m32) for x, y, z in getPoints(positions, points)]
+
+## Blend some points toward the points of a target.
+# @param positions Tuple of Tuple of Float - x, y and z rows.
+# @param target_positions Tuple of Tuple of Float - x, y and z rows of the target.
+# @param points List of Integer - Point indexes.
+# @param blend Float - 0 returns the positions, 1 the target positions.
+# @param matrix List of Float - 4x4 matrix applied to the target positions, as Matrix4.Get2(). None to use the positions as they are.
+# @return List of Tuple of Float
+def blendPoints(positions, target_positions, points, blend, matrix=None):
+
+    if matrix is None:
+        targets = getPoints(target_positions, points)
+    else:
+        targets = transformPoints(target_positions, points, matrix)
+
+    return [(x + (tx - x) * blend,
+             y + (ty - y) * blend,
+             z + (tz - z) * blend) for (x, y, z), (tx, ty, tz) in izip(getPoints(positions, points), targets)]
+
+## Return the positions of some points mirrored on a plane.
+# @param positions Tuple of Tuple of Float - x, y and z rows.
+# @param points List of Integer - Point indexes.
+# @param axis Integer - Normal of the mirror plane. 0 for YZ, 1 for XZ, 2 for XY.
+# @return List of Tuple of Float
+def mirrorPoints(positions, points, axis=0):
+
+    sx, sy, sz = [(i == axis and -1.0 or 1.0) for i in range(3)]
+
+    return [(x*sx, y*sy, z*sz) for x, y, z in getPoints(positions, points)]
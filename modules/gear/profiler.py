@@ -0,0 +1,198 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+## @package gear.profiler
+# @author Jeremie Passerin
+#
+# @brief build profiler. Doesn't require Softimage.
+#
+# The profiler records the wall time, the command count and the object count of each build step.
+# Commands are counted by countCommand(), called by the OnBeginCommand event of gear_riggingSystem
+# while a profiler is active.
+
+##########################################################
+# GLOBAL
+##########################################################
+# Built-in
+import time
+import json
+
+# gear
+import gear
+
+## The profiler currently recording, if any.
+ACTIVE = None
+
+## Columns of the report table, and the record keys to sort by.
+COLUMNS = ["component", "step", "time", "commands", "objects"]
+
+##########################################################
+# PROFILER
+##########################################################
+# ========================================================
+## Record the cost of the steps of a build.
+class BuildProfiler(object):
+
+    ## Init Method.
+    # @param self
+    # @param object_counter Function - Return the current object count. None to skip object counting.
+    def __init__(self, object_counter=None):
+
+        self.object_counter = object_counter
+        self.records = []
+        self.commands = 0
+        self.startTime = time.time()
+
+    ## Set the profiler as the active one. Commands are counted until stop() is called.
+    # @param self
+    def start(self):
+
+        global ACTIVE
+        ACTIVE = self
+
+        self.startTime = time.time()
+
+    ## Stop counting the commands.
+    # @param self
+    def stop(self):
+
+        global ACTIVE
+        if ACTIVE is self:
+            ACTIVE = None
+
+    ## Call a function and record its cost.\n
+    ## Objects are counted after the time is taken, so counting doesn't add to the step time.
+    # @param self
+    # @param component String - Name of the component, or of the build phase.
+    # @param step String - Name of the step.
+    # @param function Function - The function to call.
+    # @param args Arguments of the function.
+    # @return The value returned by the function.
+    def call(self, component, step, function, *args):
+
+        objects = self.__countObjects()
+        commands = self.commands
+        start = time.time()
+        try:
+            return function(*args)
+        finally:
+            duration = time.time() - start
+            self.records.append({"component":component,
+                                 "step":step,
+                                 "start":start - self.startTime,
+                                 "time":duration,
+                                 "commands":self.commands - commands,
+                                 "objects":self.__countObjects() - objects})
+
+    def __countObjects(self):
+
+        if self.object_counter is None:
+            return 0
+
+        return self.object_counter()
+
+    # =====================================================
+    # REPORT
+    ## Return the records sorted by a column.
+    # @param self
+    # @param sort String - Column to sort by. Times and counts are sorted in decreasing order.
+    # @return List of Dictionary
+    def getRecords(self, sort="time"):
+
+        if sort not in COLUMNS:
+            gear.log("Invalid profiler column : " + str(sort), gear.sev_warning)
+            sort = "time"
+
+        return sorted(self.records, key=lambda record:record[sort], reverse=sort not in ["component", "step"])
+
+    ## Return the sum of the records by step.
+    # @param self
+    # @return Dictionary - time, commands and objects by step.
+    def getStepTotals(self):
+
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record["step"], {"time":0.0, "commands":0, "objects":0})
+            for key in ["time", "commands", "objects"]:
+                total[key] += record[key]
+
+        return totals
+
+    ## Return the report table.
+    # @param self
+    # @param sort String - Column to sort by.
+    # @param limit Integer - Maximum number of rows. None for all the records.
+    # @return String
+    def getTable(self, sort="time", limit=None):
+
+        row = "%-24s %-12s %10s %10s %10s"
+        lines = [row%tuple(COLUMNS), "-" * 70]
+
+        for record in self.getRecords(sort)[:limit]:
+            lines.append(row%(record["component"], record["step"], "%.3f"%record["time"], record["commands"], record["objects"]))
+
+        lines.append("-" * 70)
+        totals = self.getStepTotals()
+        for step in sorted(totals.keys(), key=lambda step:totals[step]["time"], reverse=True):
+            lines.append(row%("total", step, "%.3f"%totals[step]["time"], totals[step]["commands"], totals[step]["objects"]))
+
+        return "\n".join(lines)
+
+    ## Log the report table.
+    # @param self
+    # @param sort String - Column to sort by.
+    # @param limit Integer - Maximum number of rows. None for all the records.
+    def logTable(self, sort="time", limit=None):
+        gear.log("\n" + self.getTable(sort, limit))
+
+    ## Write the records as a Chrome trace file (chrome://tracing).\n
+    ## Each record is a complete event, with the counts as arguments.
+    # @param self
+    # @param path String - Path of the json file.
+    def writeTrace(self, path):
+
+        events = []
+        for record in self.records:
+            events.append({"name":record["component"] + " " + record["step"],
+                           "cat":record["step"],
+                           "ph":"X",
+                           "ts":int(record["start"] * 1E6),
+                           "dur":int(record["time"] * 1E6),
+                           "pid":0,
+                           "tid":0,
+                           "args":{"component":record["component"],
+                                   "commands":record["commands"],
+                                   "objects":record["objects"]}})
+
+        f = open(path, "w")
+        try:
+            json.dump({"traceEvents":events, "displayTimeUnit":"ms"}, f, indent=1)
+        finally:
+            f.close()
+
+# ========================================================
+## Count one command for the active profiler.
+def countCommand():
+
+    if ACTIVE is not None:
+        ACTIVE.commands += 1
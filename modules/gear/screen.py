@@ -29,7 +29,12 @@
 ##########################################################
 # GLOBAL
 ##########################################################
-from win32api import GetSystemMetrics
+try:
+    from win32api import GetSystemMetrics
+except ImportError:
+    # Without Windows, as with the stand-in backend of gear.xsi
+    def GetSystemMetrics(index):
+        return (1920, 1080)[index]
 
 ##########################################################
 # SCREEN
@@ -0,0 +1,305 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+## @package gear.skinfile
+# @author Jeremie Passerin
+#
+# @brief binary skin file. Doesn't require Softimage.
+#
+# All values are little endian.\n
+# File header : magic "GSKN", version (uint16), object count (uint32), user and date (strings).\n
+# Object table : for each object, its name (string) and the position of its block in the file (uint64).\n
+# Object block : point count, deformer count and weight count (uint32), the deformers model and name (strings),
+# then aligned on 8 bytes, the point offsets (int32 * (point count + 1)), the deformer indexes (int32 * weight count)
+# and the weights (float64 * weight count).\n
+# Strings are stored as their length (uint16) followed by their utf-8 characters.
+
+##########################################################
+# GLOBAL
+##########################################################
+# Built-in
+import mmap
+import struct
+import sys
+from array import array
+
+# gear
+import gear.weights as wgt
+
+# =====================================================================
+# VERSION
+VERSION = 1
+
+MAGIC = "GSKN"
+EXTENSION = "gskin"
+
+HEADER = struct.Struct("<4sHI")
+OBJECT = struct.Struct("<III")
+POSITION = struct.Struct("<Q")
+LENGTH = struct.Struct("<H")
+OFFSETS = struct.Struct("<ii")
+
+##########################################################
+# WRITE
+##########################################################
+# ========================================================
+## Write a binary skin file.
+# @param path String - Path of the file.
+# @param objects List of Tuple - (name, deformers, weights) for each object.
+# Deformers is a list of (model name, deformer name) and weights a SparseWeights.
+# @param user String - Name of the user.
+# @param date String - Date of the export.
+def writeSkin(path, objects, user="", date=""):
+
+    f = open(path, "wb")
+
+    try:
+        # Header and object table. Positions are written once the blocks are written.
+        f.write(HEADER.pack(MAGIC, VERSION, len(objects)))
+        __writeString(f, user)
+        __writeString(f, date)
+
+        positions = []
+        for name, deformers, weights in objects:
+            __writeString(f, name)
+            positions.append(f.tell())
+            f.write(POSITION.pack(0))
+
+        # Object blocks
+        for position, (name, deformers, weights) in zip(positions, objects):
+
+            start = f.tell()
+            f.seek(position)
+            f.write(POSITION.pack(start))
+            f.seek(start)
+
+            f.write(OBJECT.pack(weights.point_count, weights.deformer_count, weights.getNonZeroCount()))
+            for model_name, deformer_name in deformers:
+                __writeString(f, model_name)
+                __writeString(f, deformer_name)
+
+            f.write("\0" * (-f.tell() % 8))
+
+            __writeArray(f, array("i", weights.offsets))
+            __writeArray(f, array("i", weights.indices))
+            __writeArray(f, array("d", weights.weights))
+    finally:
+        f.close()
+
+def __writeString(f, string):
+    string = unicode(string).encode("utf-8")
+    f.write(LENGTH.pack(len(string)))
+    f.write(string)
+
+def __writeArray(f, a):
+    if sys.byteorder == "big":
+        a.byteswap()
+    a.tofile(f)
+
+##########################################################
+# READ
+##########################################################
+# ========================================================
+## Return True if the file is a binary skin file.
+# @param path String - Path of the file.
+# @return Boolean
+def isSkinFile(path):
+
+    f = open(path, "rb")
+    try:
+        return f.read(len(MAGIC)) == MAGIC
+    finally:
+        f.close()
+
+# ========================================================
+## Binary skin file.\n
+## The file is memory mapped, reading the weights of a few points only touches the pages that store them.\n
+## The file is only mapped while it is read, so it isn't locked between the listing of the objects and the import of their weights.
+class SkinFile(object):
+
+    ## Init Method.
+    # @param self
+    # @param path String - Path of the file.
+    def __init__(self, path):
+
+        self.path = path
+        self.map = None
+
+        self.open()
+        try:
+            magic, self.version, object_count = HEADER.unpack_from(self.map, 0)
+            if magic != MAGIC:
+                raise ValueError("%s is not a skin file"%path)
+            if self.version > VERSION:
+                raise ValueError("%s has an unsupported version : %s"%(path, self.version))
+
+            position = HEADER.size
+            self.user, position = self.readString(position)
+            self.date, position = self.readString(position)
+
+            self.names = []
+            self.objects = {}
+            for i in range(object_count):
+                name, position = self.readString(position)
+                self.names.append(name)
+                self.objects[name] = SkinObject(self, name, POSITION.unpack_from(self.map, position)[0])
+                position += POSITION.size
+        finally:
+            self.close()
+
+    ## Map the file.
+    # @param self
+    # @return Boolean - False if the file was already mapped.
+    def open(self):
+
+        if self.map is not None:
+            return False
+
+        f = open(self.path, "rb")
+        try:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
+            f.close()
+
+        return True
+
+    ## Release the mapping of the file.
+    # @param self
+    def close(self):
+
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+    ## Return the object of given name.
+    # @param self
+    # @param name String - Name of the object.
+    # @return SkinObject - None if there is no object with that name.
+    def getObject(self, name):
+        return self.objects.get(name, None)
+
+    ## Read a string.
+    # @param self
+    # @param position Integer - Position of the string in the file.
+    # @return Tuple - The string and the position after the string.
+    def readString(self, position):
+
+        length = LENGTH.unpack_from(self.map, position)[0]
+        position += LENGTH.size
+
+        return self.map[position:position+length].decode("utf-8"), position + length
+
+    ## Read an array.
+    # @param self
+    # @param typecode String - Array type code.
+    # @param position Integer - Position of the array in the file.
+    # @param count Integer - Number of items to read.
+    # @return array
+    def readArray(self, typecode, position, count):
+
+        a = array(typecode)
+        a.fromstring(self.map[position:position+count*a.itemsize])
+        if sys.byteorder == "big":
+            a.byteswap()
+
+        return a
+
+# ========================================================
+## Envelope of an object stored in a binary skin file.
+class SkinObject(object):
+
+    ## Init Method.
+    # @param self
+    # @param skin_file SkinFile - The file.
+    # @param name String - Name of the object.
+    # @param position Integer - Position of the object block in the file.
+    def __init__(self, skin_file, name, position):
+
+        self.skin_file = skin_file
+        self.name = name
+
+        self.point_count, self.deformer_count, self.weight_count = OBJECT.unpack_from(skin_file.map, position)
+        position += OBJECT.size
+
+        self.deformers = []
+        for i in range(self.deformer_count):
+            model_name, position = skin_file.readString(position)
+            deformer_name, position = skin_file.readString(position)
+            self.deformers.append((model_name, deformer_name))
+
+        position += -position % 8
+
+        self.offsets_position = position
+        self.indices_position = self.offsets_position + (self.point_count + 1) * 4
+        self.weights_position = self.indices_position + self.weight_count * 4
+
+    ## Return the name of the deformers.
+    # @param self
+    # @return List of String
+    def getDeformerNames(self):
+        return [deformer_name for model_name, deformer_name in self.deformers]
+
+    ## Return the weights of all the points.
+    # @param self
+    # @return SparseWeights
+    def getWeights(self):
+
+        opened = self.skin_file.open()
+        try:
+            read = self.skin_file.readArray
+            offsets = array("l", read("i", self.offsets_position, self.point_count + 1))
+            indices = read("i", self.indices_position, self.weight_count)
+            weights = read("d", self.weights_position, self.weight_count)
+        finally:
+            if opened:
+                self.skin_file.close()
+
+        return wgt.SparseWeights(offsets, indices, weights, self.deformer_count)
+
+    ## Return the weights of some points. Only the data of these points is read.
+    # @param self
+    # @param points List of Integer - Points to read.
+    # @return SparseWeights - The other points have no weight.
+    def getPointsWeights(self, points):
+
+        skin_file = self.skin_file
+
+        for point_index in points:
+            if point_index < 0 or point_index >= self.point_count:
+                raise IndexError("Point %s is out of range, %s has %s points"%(point_index, self.name, self.point_count))
+
+        points_weights = {}
+        opened = skin_file.open()
+        try:
+            for point_index in points:
+
+                start, end = OFFSETS.unpack_from(skin_file.map, self.offsets_position + point_index * 4)
+                indices = skin_file.readArray("i", self.indices_position + start * 4, end - start)
+                weights = skin_file.readArray("d", self.weights_position + start * 8, end - start)
+
+                points_weights[point_index] = (indices, weights)
+        finally:
+            if opened:
+                skin_file.close()
+
+        return wgt.getSparseFromDict(self.point_count, self.deformer_count, points_weights)
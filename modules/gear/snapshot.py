@@ -0,0 +1,192 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+## @package gear.snapshot
+# @author Jeremie Passerin
+#
+# @brief guide snapshots. Doesn't require Softimage.
+#
+# A snapshot keeps the xml definition of the options, the controlers and each component of a
+# guide, as exported by RigGuide.exportToXml(). Each component also has a content hash, and the
+# signature read from the scene when it was stored. A component whose signature didn't change can
+# be loaded from the snapshot instead of the scene.
+
+##########################################################
+# GLOBAL
+##########################################################
+# Built-in
+import json
+import hashlib
+import xml.etree.cElementTree as etree
+
+# gear
+import gear
+
+MAGIC = "gear_guide_snapshot"
+VERSION = 1
+
+##########################################################
+# SNAPSHOT
+##########################################################
+# ========================================================
+## Xml definitions of a guide, by component.
+class GuideSnapshot(object):
+
+    ## Init Method.
+    # @param self
+    # @param name String - Name of the guide.
+    def __init__(self, name=""):
+
+        self.name = name
+        self.options = None
+        self.controlers = None
+
+        ## List of component entries, in the guide order. Entries are dictionaries with name, type, parent, signature, hash and xml.
+        self.components = []
+        self.index = {}
+
+    ## Add a component to the snapshot.
+    # @param self
+    # @param name String - Full name of the component.
+    # @param comp_type String - Type of the component.
+    # @param signature String - Signature of the component in the scene.
+    # @param xml String - Xml definition of the component.
+    # @param parent String - Parent of the component as 'component.localName', 'None' if the component has no parent.
+    def addComponent(self, name, comp_type, signature, xml, parent="None"):
+
+        entry = {"name":name,
+                 "type":comp_type,
+                 "parent":parent,
+                 "signature":signature,
+                 "hash":getHash(xml),
+                 "xml":xml}
+
+        if name in self.index:
+            self.components.remove(self.index[name])
+
+        self.components.append(entry)
+        self.index[name] = entry
+
+    ## Return a component entry.
+    # @param self
+    # @param name String - Full name of the component.
+    # @return Dictionary - None if the component isn't in the snapshot.
+    def getComponent(self, name):
+        return self.index.get(name)
+
+    ## Return the names of the components, in the guide order.
+    # @param self
+    # @return List of String
+    def getNames(self):
+        return [entry["name"] for entry in self.components]
+
+    ## Return True if a component is in the snapshot with the same signature.
+    # @param self
+    # @param name String - Full name of the component.
+    # @param signature String - Signature of the component in the scene.
+    # @return Boolean
+    def isClean(self, name, signature):
+
+        entry = self.index.get(name)
+        return entry is not None and entry["signature"] == signature
+
+    ## Set the parent of a component.
+    # @param self
+    # @param name String - Full name of the component.
+    # @param parent String - Parent of the component as 'component.localName', 'None' if the component has no parent.
+    def setParent(self, name, parent):
+        self.index[name]["parent"] = parent
+
+    ## Return the xml nodes of the guide, as the children of a guide xml definition.
+    # @param self
+    # @return List of xml_node
+    def getXmlChildren(self):
+
+        children = []
+        for xml in [self.options, self.controlers]:
+            if xml:
+                children.append(etree.fromstring(xml))
+
+        for entry in self.components:
+            xml_comp = etree.fromstring(entry["xml"])
+            xml_comp.set("parent", entry["parent"])
+            children.append(xml_comp)
+
+        return children
+
+    ## Write the snapshot to a json file.
+    # @param self
+    # @param path String - Path of the file.
+    def write(self, path):
+
+        data = {"magic":MAGIC,
+                "version":VERSION,
+                "name":self.name,
+                "options":self.options,
+                "controlers":self.controlers,
+                "components":self.components}
+
+        f = open(path, "w")
+        try:
+            json.dump(data, f)
+        finally:
+            f.close()
+
+# ========================================================
+## Read a snapshot file.
+# @param path String - Path of the file.
+# @return GuideSnapshot - False if the file isn't a valid snapshot.
+def readSnapshot(path):
+
+    f = open(path, "r")
+    try:
+        data = json.load(f)
+    finally:
+        f.close()
+
+    if not isinstance(data, dict) or data.get("magic") != MAGIC:
+        gear.log("Invalid guide snapshot : " + path, gear.sev_warning)
+        return False
+
+    if data.get("version") != VERSION:
+        gear.log("Unsupported guide snapshot version (%s) : %s"%(data.get("version"), path), gear.sev_warning)
+        return False
+
+    snapshot = GuideSnapshot(data["name"])
+    snapshot.options = data["options"]
+    snapshot.controlers = data["controlers"]
+    for entry in data["components"]:
+        snapshot.components.append(entry)
+        snapshot.index[entry["name"]] = entry
+
+    return snapshot
+
+## Return the content hash of a text.
+# @param text String
+# @return String
+def getHash(text):
+
+    if isinstance(text, unicode):
+        text = text.encode("utf-8")
+
+    return hashlib.md5(text).hexdigest()
@@ -0,0 +1,104 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+
+## @package gear.tests.test_encode
+# @author Jeremie Passerin
+#
+# @brief tests of the envelope weights codec, with the weights written by older versions.
+
+##########################################################
+# GLOBAL
+##########################################################
+# Built-in
+import base64
+import binascii
+import cPickle
+import unittest
+
+# gear
+import gear.encode as enc
+import gear.weights as wgt
+
+from gear.tests.test_weights import getSyntheticWeights, getReferenceArray
+
+##########################################################
+# REFERENCE
+##########################################################
+# ========================================================
+## Encode weights as the encodeData of older versions did.
+# @param weights_tuple Tuple of Tuple of Float - Deformer major weights, as EnvelopeOp.Weights.Array.
+# @return String
+def encodeLegacyWeights(weights_tuple):
+    return binascii.b2a_base64(binascii.rlecode_hqx(cPickle.dumps(weights_tuple)))
+
+##########################################################
+# TESTS
+##########################################################
+# ========================================================
+class EncodeTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.weights_tuple = getSyntheticWeights()
+        self.reference = getReferenceArray(self.weights_tuple)
+
+    def assertArrayEqual(self, values, reference, places=9):
+
+        self.assertEqual(len(values), len(reference))
+        for value, expected in zip(values, reference):
+            self.assertAlmostEqual(value, expected, places)
+
+    # -----------------------------------------------------
+    def testRoundTrip(self):
+
+        weights = wgt.getSparseFromArray(self.weights_tuple)
+
+        for precision in [1E-6, 1E-3]:
+            decoded = enc.decodeWeights(enc.encodeWeights(weights, precision))
+
+            self.assertEqual(decoded.point_count, weights.point_count)
+            self.assertEqual(decoded.deformer_count, weights.deformer_count)
+            self.assertEqual(list(decoded.offsets), list(weights.offsets))
+            self.assertEqual(list(decoded.indices), list(weights.indices))
+            for value, expected in zip(decoded.weights, weights.weights):
+                self.assertTrue(abs(value - expected) <= precision * .5 + 1E-12)
+
+    def testLegacyWeights(self):
+
+        decoded = enc.decodeWeights(encodeLegacyWeights(self.weights_tuple))
+
+        self.assertEqual(decoded.deformer_count, len(self.weights_tuple))
+        self.assertArrayEqual(decoded.getArray(), self.reference)
+
+    def testInvalidWeights(self):
+
+        weights = wgt.getSparseFromArray(self.weights_tuple)
+        text = enc.encodeWeights(weights)
+        truncated = base64.b64encode(base64.b64decode(text)[:40])
+
+        for text in [truncated, base64.b64encode("not weights"), "#"]:
+            self.assertRaises(ValueError, enc.decodeWeights, text)
+
+if __name__ == "__main__":
+    unittest.main()
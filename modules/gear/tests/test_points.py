@@ -0,0 +1,210 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+
+## @package gear.tests.test_points
+# @author Jeremie Passerin
+#
+# @brief tests of the point kernels against the per point loops of the MatchGeometry and SymmetrizePoints operators.
+
+##########################################################
+# GLOBAL
+##########################################################
+# Built-in
+import random
+import unittest
+
+# gear
+import gear.points as pnt
+
+##########################################################
+# REFERENCE
+##########################################################
+# ========================================================
+## Create synthetic positions, as Points.PositionArray.
+# @param point_count Integer
+# @param seed Integer - Random seed.
+# @return Tuple of Tuple of Float - x, y and z rows.
+def getSyntheticPositions(point_count=100, seed=0):
+
+    rand = random.Random(seed)
+
+    return tuple([tuple([rand.uniform(-10, 10) for i in xrange(point_count)]) for j in xrange(3)])
+
+## Multiply a row vector by a matrix, as Vector3.MulByMatrix4InPlace.
+# @param v List of Float - x, y and z.
+# @param m List of Float - 4x4 matrix, as Matrix4.Get2().
+# @return List of Float
+def mulByMatrix4(v, m):
+    return [v[0]*m[i] + v[1]*m[4+i] + v[2]*m[8+i] + m[12+i] for i in range(3)]
+
+## Multiply two matrices, as Matrix4.Mul.
+# @param a List of Float - 4x4 matrix, as Matrix4.Get2().
+# @param b List of Float - 4x4 matrix, as Matrix4.Get2().
+# @return List of Float
+def mulMatrix4(a, b):
+    return [sum([a[row*4+k] * b[k*4+col] for k in range(4)]) for row in range(4) for col in range(4)]
+
+## Blend points as the per point loop of gear_MatchGeometryOp did.
+# @return Dictionary - Point index as key and position as value.
+def matchGeometryReference(out_pos, in_pos, points, blend, in_matrix=None, inv_out_matrix=None):
+
+    result = {}
+    for point_index in points:
+
+        vTarget = [in_pos[0][point_index], in_pos[1][point_index], in_pos[2][point_index]]
+        vSource = [out_pos[0][point_index], out_pos[1][point_index], out_pos[2][point_index]]
+
+        if in_matrix is not None:
+            vTarget = mulByMatrix4(vTarget, in_matrix)
+            vTarget = mulByMatrix4(vTarget, inv_out_matrix)
+
+        result[point_index] = [s + (t - s) * blend for t, s in zip(vTarget, vSource)]
+
+    return result
+
+## Mirror points as the per point loop of gear_SymmetrizePointsOp did.
+# @return Dictionary - Point index as key and position as value.
+def symmetrizeReference(pos_tuple, points, sym_points, axis, mirror):
+
+    result = {}
+    for point_index, sym_index in zip(points, sym_points):
+
+        if axis == 0:
+            result[sym_index] = [- pos_tuple[0][point_index], pos_tuple[1][point_index], pos_tuple[2][point_index]]
+            if mirror:
+                result[point_index] = [- pos_tuple[0][sym_index], pos_tuple[1][sym_index], pos_tuple[2][sym_index]]
+
+        elif axis == 1:
+            result[sym_index] = [pos_tuple[0][point_index], - pos_tuple[1][point_index], pos_tuple[2][point_index]]
+            if mirror:
+                result[point_index] = [pos_tuple[0][sym_index], - pos_tuple[1][sym_index], pos_tuple[2][sym_index]]
+
+        elif axis == 2:
+            result[sym_index] = [pos_tuple[0][point_index], pos_tuple[1][point_index], - pos_tuple[2][point_index]]
+            if mirror:
+                result[point_index] = [- pos_tuple[0][sym_index], pos_tuple[1][sym_index], - pos_tuple[2][sym_index]]
+
+    return result
+
+##########################################################
+# TESTS
+##########################################################
+# ========================================================
+class PointsTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.positions = getSyntheticPositions()
+        self.target_positions = getSyntheticPositions(seed=1)
+        self.points = range(0, 50, 3)
+
+        # Symmetry map, each point of the first half is mirrored by a point of the second half
+        self.sym_points = [99 - point_index for point_index in self.points]
+
+        # Rotation, scale and translation, and the inverse of a translation
+        self.in_matrix = [0.0, 2.0, 0.0, 0.0,
+                          -2.0, 0.0, 0.0, 0.0,
+                          0.0, 0.0, 2.0, 0.0,
+                          1.0, 2.0, 3.0, 1.0]
+        self.inv_out_matrix = [1.0, 0.0, 0.0, 0.0,
+                               0.0, 1.0, 0.0, 0.0,
+                               0.0, 0.0, 1.0, 0.0,
+                               -4.0, 5.0, -6.0, 1.0]
+
+    def assertPointsEqual(self, points, values, reference):
+
+        self.assertEqual(len(points), len(values))
+        for point_index, value in zip(points, values):
+            for v, r in zip(value, reference[point_index]):
+                self.assertAlmostEqual(v, r, 9)
+
+    def applySymmetrize(self, axis, mirror):
+
+        result = {}
+        for point_index, position in zip(self.sym_points, pnt.mirrorPoints(self.positions, self.points, axis)):
+            result[point_index] = position
+        if mirror:
+            for point_index, position in zip(self.points, pnt.mirrorPoints(self.positions, self.sym_points, axis)):
+                result[point_index] = position
+
+        return result
+
+    # -----------------------------------------------------
+    def testGetPoints(self):
+
+        reference = dict([(i, [self.positions[0][i], self.positions[1][i], self.positions[2][i]]) for i in self.points])
+        self.assertPointsEqual(self.points, pnt.getPoints(self.positions, self.points), reference)
+
+    def testTransformPoints(self):
+
+        reference = dict([(i, mulByMatrix4([self.positions[0][i], self.positions[1][i], self.positions[2][i]], self.in_matrix)) for i in self.points])
+        self.assertPointsEqual(self.points, pnt.transformPoints(self.positions, self.points, self.in_matrix), reference)
+
+    def testBlendPoints(self):
+
+        for blend in [0.0, .25, 1.0]:
+            reference = matchGeometryReference(self.positions, self.target_positions, self.points, blend)
+            values = pnt.blendPoints(self.positions, self.target_positions, self.points, blend)
+            self.assertPointsEqual(self.points, values, reference)
+
+    def testBlendPointsWithMatrix(self):
+
+        # The operator combines the matrices once instead of applying them to each point
+        matrix = mulMatrix4(self.in_matrix, self.inv_out_matrix)
+
+        reference = matchGeometryReference(self.positions, self.target_positions, self.points, .5, self.in_matrix, self.inv_out_matrix)
+        values = pnt.blendPoints(self.positions, self.target_positions, self.points, .5, matrix)
+        self.assertPointsEqual(self.points, values, reference)
+
+    def testMirrorPoints(self):
+
+        for axis in range(3):
+            for mirror in [False, True]:
+
+                # XY mirror : the points of the mirror side used to be flipped on x too, only the z flip is kept
+                if axis == 2 and mirror:
+                    continue
+
+                reference = symmetrizeReference(self.positions, self.points, self.sym_points, axis, mirror)
+                result = self.applySymmetrize(axis, mirror)
+
+                self.assertEqual(sorted(result.keys()), sorted(reference.keys()))
+                self.assertPointsEqual(result.keys(), result.values(), reference)
+
+    def testMirrorPointsXY(self):
+
+        reference = symmetrizeReference(self.positions, self.points, self.sym_points, 2, True)
+        result = self.applySymmetrize(2, True)
+
+        self.assertEqual(sorted(result.keys()), sorted(reference.keys()))
+
+        # Same as the previous loop, except the x sign of the points of the mirror side
+        for point_index in self.sym_points:
+            self.assertPointsEqual([point_index], [result[point_index]], reference)
+        for point_index in self.points:
+            x, y, z = reference[point_index]
+            self.assertPointsEqual([point_index], [result[point_index]], {point_index:(-x, y, z)})
+
+if __name__ == "__main__":
+    unittest.main()
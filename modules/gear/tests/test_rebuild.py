@@ -0,0 +1,119 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+
+## @package gear.tests.test_rebuild
+# @author Jeremie Passerin
+#
+# @brief tests of the rig rebuild against a full build, with the stand-in backend.
+
+##########################################################
+# GLOBAL
+##########################################################
+# Built-in
+import os
+import unittest
+
+# The rig is built with the pure python stand-in
+os.environ.setdefault("GEAR_BACKEND", "standin")
+
+# gear
+from gear.xsi import xsi
+from gear.xsi.rig import Rig
+from gear.xsi.rig.guide import RigGuide
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "xsi", "rig", "component", "_templates", "dog_guide.xml")
+
+##########################################################
+# TOOLS
+##########################################################
+# ========================================================
+## Return the names of the members of the groups of a model.
+# @param model Model
+# @return Dictionary - Sorted member names by group name.
+def getGroupMembers(model):
+
+    members = {}
+    for group in model.Groups:
+        members[group.Name] = sorted([obj.Name for obj in group.Members])
+
+    return members
+
+##########################################################
+# TESTS
+##########################################################
+# ========================================================
+class RebuildTest(unittest.TestCase):
+
+    def setUp(self):
+
+        guide = RigGuide()
+        guide.setFromFile(TEMPLATE_PATH)
+        guide.draw()
+        self.guide_model = guide.model
+
+        self.rig = Rig()
+        self.rig.guide = self.getGuide()
+        self.rig.build()
+
+    def tearDown(self):
+        xsi.DeleteObj([self.guide_model, self.rig.model])
+
+    def getGuide(self):
+
+        guide = RigGuide()
+        guide.setFromHierarchy(self.guide_model)
+
+        return guide
+
+    # -----------------------------------------------------
+    def testDeleteObj(self):
+
+        obj = self.rig.model.FindChild("tail_C0_root")
+        deleted = set([obj.Name] + [child.Name for child in obj.FindChildren()])
+
+        xsi.DeleteObj(obj)
+
+        for names in getGroupMembers(self.rig.model).values():
+            self.assertFalse(deleted.intersection(names))
+
+    def testRebuildGroups(self):
+
+        speed = self.guide_model.FindChild("tail_C0_root").Properties("settings").Parameters("speed")
+        speed.Value = speed.Value * .5
+
+        self.rig.rebuild(self.getGuide())
+        rebuilt = getGroupMembers(self.rig.model)
+
+        rig = Rig()
+        rig.guide = self.getGuide()
+        rig.build()
+        built = getGroupMembers(rig.model)
+        xsi.DeleteObj(rig.model)
+
+        self.assertEqual(sorted(rebuilt.keys()), sorted(built.keys()))
+        for name in built.keys():
+            self.assertEqual(rebuilt[name], built[name], name)
+
+if __name__ == "__main__":
+    unittest.main()
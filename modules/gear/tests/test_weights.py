@@ -0,0 +1,339 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+
+## @package gear.tests.test_weights
+# @author Jeremie Passerin
+#
+# @brief tests of SparseWeights against dense reference loops on synthetic weights, and of the binary skin file.
+
+##########################################################
+# GLOBAL
+##########################################################
+# Built-in
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+# gear
+import gear.weights as wgt
+import gear.topology as top
+import gear.skinfile as skf
+
+##########################################################
+# REFERENCE
+##########################################################
+# ========================================================
+## Create synthetic deformer major weights, with unnormalized, unweighted and small weights.
+# @param point_count Integer
+# @param deformer_count Integer
+# @param seed Integer - Random seed.
+# @return Tuple of Tuple of Float - Deformer major weights, as EnvelopeOp.Weights.Array.
+def getSyntheticWeights(point_count=200, deformer_count=8, seed=0):
+
+    rand = random.Random(seed)
+
+    columns = [[0.0] * point_count for i in xrange(deformer_count)]
+    for point_index in xrange(point_count):
+
+        # Some points have no weight
+        if point_index % 17 == 0:
+            continue
+
+        for deformer_index in rand.sample(xrange(deformer_count), rand.randint(1, 4)):
+            columns[deformer_index][point_index] = rand.choice([rand.uniform(0, .2), rand.uniform(0, 100)])
+
+    return tuple([tuple(column) for column in columns])
+
+## Return the flat point major weights of deformer major weights, as the envelope tools used to.
+# @param weights_tuple Tuple of Tuple of Float
+# @return List of Float
+def getReferenceArray(weights_tuple):
+    return [weights_tuple[j][i] for i in range(len(weights_tuple[0])) for j in range(len(weights_tuple))]
+
+## Normalize the points of a flat array, as the envelope tools used to.
+# @param weights List of Float
+# @param deformer_count Integer
+# @param points List of Integer
+def normalizeReference(weights, deformer_count, points):
+
+    for point_index in points:
+        point_weights = weights[point_index*deformer_count:(point_index+1)*deformer_count]
+        total = sum(point_weights)
+        if total > 0:
+            weights[point_index*deformer_count:(point_index+1)*deformer_count] = [(w*100) / total for w in point_weights]
+
+## Prune the points of a flat array, as the envelope tools used to.
+# @param weights List of Float
+# @param deformer_count Integer
+# @param threshold Float
+# @return List of Integer - The points with a pruned weight.
+def pruneReference(weights, deformer_count, threshold):
+
+    pruned = []
+    for point_index in range(len(weights) / deformer_count):
+        for deformer_index in range(deformer_count):
+            weight = weights[point_index*deformer_count + deformer_index]
+            if 0 < weight <= threshold:
+                weights[point_index*deformer_count + deformer_index] = 0
+                if point_index not in pruned:
+                    pruned.append(point_index)
+
+    return pruned
+
+## Average the points of a flat array with the mirror deformers, as the envelope tools used to.
+# @param weights_tuple Tuple of Tuple of Float
+# @param mirror_index List of Integer
+# @param points List of Integer
+# @return List of Float
+def averageMirrorReference(weights_tuple, mirror_index, points):
+
+    weights = getReferenceArray(weights_tuple)
+    deformer_count = len(weights_tuple)
+
+    for point_index in points:
+        for deformer_index in range(deformer_count):
+            weights[point_index*deformer_count + deformer_index] = (weights_tuple[deformer_index][point_index] + weights_tuple[mirror_index[deformer_index]][point_index]) * .5
+
+    return weights
+
+## Remove a deformer of a flat array, as the envelope tools used to.
+# @param weights List of Float
+# @param deformer_count Integer
+# @param index Integer
+# @return List of Float
+def removeDeformerReference(weights, deformer_count, index):
+
+    new_weights = []
+    for point_index in range(len(weights) / deformer_count):
+        new_weights.extend(weights[point_index*deformer_count : point_index*deformer_count+index])
+        new_weights.extend(weights[point_index*deformer_count+index+1 : point_index*deformer_count+deformer_count])
+
+    return new_weights
+
+## Return the polygon data of a grid of quads, as PolygonMesh.Get2().
+# @param size Integer - Number of vertices on each side.
+# @return List of Integer
+def getGridPolygonData(size):
+
+    polygon_data = []
+    for row in xrange(size - 1):
+        for col in xrange(size - 1):
+            index = row * size + col
+            polygon_data.extend([4, index, index + 1, index + size + 1, index + size])
+
+    return polygon_data
+
+## Fill the unweighted points of a flat array, ring by ring from the weighted points.
+# @param weights List of Float
+# @param deformer_count Integer
+# @param neighbors List of List of Integer - Connected vertices of each vertex.
+# @return List of Integer - The points that no weighted point reaches.
+def fillUnweightedReference(weights, deformer_count, neighbors):
+
+    point_count = len(neighbors)
+    rings = [-1] * point_count
+    ring = [i for i in xrange(point_count) if sum(weights[i*deformer_count:(i+1)*deformer_count]) > 0]
+    for point_index in ring:
+        rings[point_index] = 0
+
+    distance = 0
+    while ring:
+
+        distance += 1
+        next_ring = sorted(set([n for point_index in ring for n in neighbors[point_index] if rings[n] == -1]))
+        for point_index in next_ring:
+            rings[point_index] = distance
+
+        for point_index in next_ring:
+            point_weights = [0.0] * deformer_count
+            for n in neighbors[point_index]:
+                if rings[n] == distance - 1:
+                    for j in xrange(deformer_count):
+                        point_weights[j] += weights[n*deformer_count + j]
+
+            total = sum(point_weights)
+            weights[point_index*deformer_count:(point_index+1)*deformer_count] = [w * 100.0 / total for w in point_weights]
+
+        ring = next_ring
+
+    return [i for i in xrange(point_count) if rings[i] == -1]
+
+##########################################################
+# TESTS
+##########################################################
+# ========================================================
+class WeightsTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.weights_tuple = getSyntheticWeights()
+        self.deformer_count = len(self.weights_tuple)
+        self.point_count = len(self.weights_tuple[0])
+        self.reference = getReferenceArray(self.weights_tuple)
+
+        # Each deformer is mirrored by its neighbor, the last one is in the middle
+        self.mirror_index = [i ^ 1 for i in xrange(self.deformer_count - 1)] + [self.deformer_count - 1]
+
+    def getWeights(self):
+        return wgt.getSparseFromArray(self.weights_tuple)
+
+    def assertArrayEqual(self, values, reference):
+
+        self.assertEqual(len(values), len(reference))
+        for value, expected in zip(values, reference):
+            self.assertAlmostEqual(value, expected, 9)
+
+    # -----------------------------------------------------
+    def testConversion(self):
+
+        matrix = wgt.getMatrixFromArray(self.weights_tuple)
+        sparse = self.getWeights()
+
+        self.assertArrayEqual(matrix.values, self.reference)
+        self.assertArrayEqual(sparse.getArray(), self.reference)
+        self.assertArrayEqual(wgt.getSparseFromMatrix(matrix).getArray(), self.reference)
+        self.assertEqual(sparse.getNonZeroCount(), len([w for w in self.reference if w]))
+
+        count = self.deformer_count
+        for point_index in [0, 5, self.point_count - 1]:
+            self.assertArrayEqual(matrix.getPointWeights(point_index), self.reference[point_index*count:(point_index+1)*count])
+        for deformer_index in [0, count - 1]:
+            self.assertArrayEqual(matrix.getDeformerWeights(deformer_index), self.weights_tuple[deformer_index])
+
+    def testUnnormalizedPoints(self):
+
+        count = self.deformer_count
+        reference = [i for i in xrange(self.point_count) if abs(sum(self.reference[i*count:(i+1)*count]) - 100) > 1E-6]
+
+        weights = self.getWeights()
+        self.assertEqual(list(weights.getUnnormalizedPoints()), reference)
+        self.assertEqual(list(weights.getUnnormalizedPoints([0, 1, 2])), [i for i in reference if i in [0, 1, 2]])
+
+    def testNormalize(self):
+
+        points = range(0, self.point_count, 3)
+        normalizeReference(self.reference, self.deformer_count, points)
+        unweighted = [i for i in points if not sum(self.reference[i*self.deformer_count:(i+1)*self.deformer_count])]
+
+        weights = self.getWeights()
+        self.assertEqual(weights.normalize(points), unweighted)
+        self.assertArrayEqual(weights.getArray(), self.reference)
+
+    def testPrune(self):
+
+        pruned = pruneReference(self.reference, self.deformer_count, .1)
+        self.assertTrue(pruned)
+
+        weights = self.getWeights()
+        self.assertEqual(weights.prune(.1), pruned)
+        self.assertArrayEqual(weights.getArray(), self.reference)
+
+    def testAverageMirror(self):
+
+        points = range(1, self.point_count, 2)
+        reference = averageMirrorReference(self.weights_tuple, self.mirror_index, points)
+
+        weights = self.getWeights()
+        weights.averageMirror(self.mirror_index, points)
+        self.assertArrayEqual(weights.getArray(), reference)
+
+    def testRemoveDeformer(self):
+
+        for index in [0, 3, self.deformer_count - 1]:
+
+            reference = removeDeformerReference(self.reference, self.deformer_count, index)
+
+            weights = self.getWeights()
+            weights.removeDeformer(index)
+            self.assertEqual(weights.deformer_count, self.deformer_count - 1)
+            self.assertArrayEqual(weights.getArray(), reference)
+
+    def testFillUnweighted(self):
+
+        # 8x8 grid and one point connected to no polygon
+        size = 8
+        point_count = size * size + 1
+        deformer_count = 3
+        adjacency = top.getVertexAdjacency(point_count, getGridPolygonData(size))
+        neighbors = [list(adjacency.getNeighbors(i)) for i in xrange(point_count)]
+
+        reference = [0.0] * (point_count * deformer_count)
+        for point_index, deformer_index in [(0, 0), (size - 1, 1), (size * size - 1, 2), (size * 3 + 3, 0), (size * 3 + 3, 2)]:
+            reference[point_index*deformer_count + deformer_index] = 50.0
+
+        columns = tuple([tuple(reference[j::deformer_count]) for j in xrange(deformer_count)])
+        weights = wgt.getSparseFromArray(columns)
+
+        unreached = fillUnweightedReference(reference, deformer_count, neighbors)
+        self.assertEqual(unreached, [point_count - 1])
+
+        self.assertEqual(weights.fillUnweighted(adjacency), unreached)
+        self.assertArrayEqual(weights.getArray(), reference)
+
+        # The filled points are normalized
+        unnormalized = [i for i in xrange(point_count) if abs(sum(reference[i*deformer_count:(i+1)*deformer_count]) - 100) > 1E-6]
+        self.assertEqual(unnormalized, [0, size - 1, size * size - 1, point_count - 1])
+        self.assertEqual(list(weights.getUnnormalizedPoints()), unnormalized)
+
+    def testSkinFile(self):
+
+        folder = tempfile.mkdtemp()
+        try:
+            path = os.path.join(folder, "skin.gsk")
+            weights = self.getWeights()
+            deformers = [("char", "bone%s_jnt"%i) for i in xrange(self.deformer_count)]
+            skf.writeSkin(path, [("body", deformers, weights), ("empty", [], wgt.getEmptySparse(0, 0))], "user", "date")
+
+            self.assertTrue(skf.isSkinFile(path))
+
+            skin_file = skf.SkinFile(path)
+            self.assertEqual((skin_file.user, skin_file.date), ("user", "date"))
+            self.assertEqual(skin_file.names, ["body", "empty"])
+            self.assertEqual(skin_file.getObject("missing"), None)
+
+            skin_obj = skin_file.getObject("body")
+            self.assertEqual(skin_obj.deformers, deformers)
+            self.assertArrayEqual(skin_obj.getWeights().getArray(), self.reference)
+
+            points = [3, 0, self.point_count - 1]
+            read = skin_obj.getPointsWeights(points)
+            count = self.deformer_count
+            for point_index in xrange(self.point_count):
+                if point_index in points:
+                    expected = self.reference[point_index*count:(point_index+1)*count]
+                else:
+                    expected = [0.0] * count
+                self.assertArrayEqual(read.getArray()[point_index*count:(point_index+1)*count], expected)
+
+            self.assertRaises(IndexError, skin_obj.getPointsWeights, [self.point_count])
+
+            # The file is released between the reads
+            self.assertEqual(skin_file.map, None)
+        finally:
+            shutil.rmtree(folder)
+
+if __name__ == "__main__":
+    unittest.main()
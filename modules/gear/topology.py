@@ -0,0 +1,464 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+## @package gear.topology
+# @author Jeremie Passerin
+#
+# @brief mesh topology tables. Doesn't require Softimage.
+#
+# Polygons are described as in PolygonMesh.Get2() : a flat list with, for each polygon,
+# its vertex count followed by its vertex indexes.
+
+##########################################################
+# GLOBAL
+##########################################################
+# Built-in
+from array import array
+
+##########################################################
+# ADJACENCY
+##########################################################
+# ========================================================
+## Compressed adjacency table (CSR).\n
+## The items connected to item i are in indices[offsets[i]:offsets[i+1]].
+class Adjacency(object):
+
+    ## Init Method.
+    # @param self
+    # @param offsets array of Integer - Start of each item in indices, plus the total count.
+    # @param indices array of Integer - Connected items.
+    def __init__(self, offsets, indices):
+
+        self.offsets = offsets
+        self.indices = indices
+        self.count = len(offsets) - 1
+
+    ## Return the items connected to an item.
+    # @param self
+    # @param index Integer
+    # @return array of Integer
+    def getNeighbors(self, index):
+        return self.indices[self.offsets[index]:self.offsets[index+1]]
+
+# ========================================================
+## Build an adjacency table from a list of sets.
+# @param neighbors List of Set of Integer - Connected items for each item.
+# @return Adjacency
+def getAdjacencyFromSets(neighbors):
+
+    offsets = array("l", [0])
+    indices = array("i")
+    for items in neighbors:
+        indices.extend(sorted(items))
+        offsets.append(len(indices))
+
+    return Adjacency(offsets, indices)
+
+# ========================================================
+## Return the vertex indexes of each polygon.
+# @param polygon_data List of Integer - Polygon description, as returned by PolygonMesh.Get2().
+# @return List of Tuple of Integer
+def getPolygons(polygon_data):
+
+    polygons = []
+
+    i = 0
+    data_count = len(polygon_data)
+    while i < data_count:
+        count = polygon_data[i]
+        polygons.append(tuple(polygon_data[i+1:i+1+count]))
+        i += count + 1
+
+    return polygons
+
+## Build the vertex to vertex adjacency. Two vertices are connected if they share an edge.
+# @param point_count Integer - Number of vertices.
+# @param polygon_data List of Integer - Polygon description, as returned by PolygonMesh.Get2().
+# @return Adjacency
+def getVertexAdjacency(point_count, polygon_data):
+    return MeshTopology(point_count, polygon_data).getVertexAdjacency()
+
+## Return the items within a given distance of some items, as a breadth first sweep.
+# @param adjacency Adjacency
+# @param indices List of Integer - Items to start from.
+# @param depth Integer - Maximum distance.
+# @return List of Integer - The items found, excluding the start items, sorted.
+def getRing(adjacency, indices, depth):
+
+    visited = set(indices)
+    ring = list(visited)
+    found = []
+
+    offsets = adjacency.offsets
+    neighbors = adjacency.indices
+    for i in xrange(depth):
+
+        next_ring = []
+        for index in ring:
+            for neighbor in neighbors[offsets[index]:offsets[index+1]]:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    next_ring.append(neighbor)
+
+        if not next_ring:
+            break
+
+        found.extend(next_ring)
+        ring = next_ring
+
+    return sorted(found)
+
+## Return the connected component of each item.
+# @param adjacency Adjacency
+# @return array of Integer - The component index of each item. Components are numbered in order of their first item.
+def getComponentIds(adjacency):
+
+    ids = array("i", [-1]) * adjacency.count
+
+    offsets = adjacency.offsets
+    neighbors = adjacency.indices
+    component = 0
+    for start in xrange(adjacency.count):
+        if ids[start] != -1:
+            continue
+
+        ids[start] = component
+        stack = [start]
+        while stack:
+            index = stack.pop()
+            for neighbor in neighbors[offsets[index]:offsets[index+1]]:
+                if ids[neighbor] == -1:
+                    ids[neighbor] = component
+                    stack.append(neighbor)
+
+        component += 1
+
+    return ids
+
+## Group items by component.
+# @param ids List of Integer - The component index of each item, as returned by getComponentIds().
+# @return List of List of Integer - The items of each component.
+def getComponents(ids):
+
+    components = []
+    for index, component in enumerate(ids):
+        if component == len(components):
+            components.append([])
+        components[component].append(index)
+
+    return components
+
+##########################################################
+# MESH TOPOLOGY
+##########################################################
+# ========================================================
+## Topology tables of a polygon mesh.\n
+## The tables are built the first time they are needed and kept afterward.\n
+## Edges are the sorted vertex pairs, numbered in order of first appearance. Those indexes don't match Softimage's edge indexes.
+class MeshTopology(object):
+
+    ## Init Method.
+    # @param self
+    # @param point_count Integer - Number of vertices.
+    # @param polygon_data List of Integer - Polygon description, as returned by PolygonMesh.Get2().
+    def __init__(self, point_count, polygon_data):
+
+        self.point_count = point_count
+        self.hash = getTopologyHash(polygon_data)
+
+        # Polygon to vertex table
+        offsets = array("l", [0])
+        indices = array("i")
+        i = 0
+        data_count = len(polygon_data)
+        while i < data_count:
+            count = polygon_data[i]
+            indices.extend(polygon_data[i+1:i+1+count])
+            offsets.append(len(indices))
+            i += count + 1
+
+        self.polygon_vertex = Adjacency(offsets, indices)
+        self.polygon_count = self.polygon_vertex.count
+
+        self.__vertex_vertex = None
+        self.__vertex_polygon = None
+        self.__polygon_edge = None
+        self.__edges = None
+        self.__edge_polygon_count = None
+        self.__vertex_islands = None
+
+    # =====================================================
+    # TABLES
+    ## Return the vertices of a polygon.
+    # @param self
+    # @param index Integer - Polygon index.
+    # @return array of Integer
+    def getPolygonVertices(self, index):
+        return self.polygon_vertex.getNeighbors(index)
+
+    ## Return the vertex to vertex adjacency. Two vertices are connected if they share an edge.
+    # @param self
+    # @return Adjacency
+    def getVertexAdjacency(self):
+
+        if self.__vertex_vertex is None:
+            self.__buildEdges()
+
+        return self.__vertex_vertex
+
+    ## Return the vertex to polygon adjacency.
+    # @param self
+    # @return Adjacency
+    def getVertexPolygons(self):
+
+        if self.__vertex_polygon is None:
+
+            counts = array("l", [0]) * (self.point_count + 1)
+            for vertex in self.polygon_vertex.indices:
+                counts[vertex+1] += 1
+
+            for i in xrange(self.point_count):
+                counts[i+1] += counts[i]
+
+            offsets = array("l", counts)
+            indices = array("i", [0]) * len(self.polygon_vertex.indices)
+            poly_offsets = self.polygon_vertex.offsets
+            poly_indices = self.polygon_vertex.indices
+            for polygon in xrange(self.polygon_count):
+                for vertex in poly_indices[poly_offsets[polygon]:poly_offsets[polygon+1]]:
+                    indices[counts[vertex]] = polygon
+                    counts[vertex] += 1
+
+            self.__vertex_polygon = Adjacency(offsets, indices)
+
+        return self.__vertex_polygon
+
+    ## Return the polygon to edge adjacency. The edges are in the order of the polygon vertices.
+    # @param self
+    # @return Adjacency
+    def getPolygonEdges(self):
+
+        if self.__polygon_edge is None:
+            self.__buildEdges()
+
+        return self.__polygon_edge
+
+    ## Return the edges.
+    # @param self
+    # @return array of Integer - Flat list of the edges vertex pairs. Edge i is (edges[2*i], edges[2*i+1]).
+    def getEdges(self):
+
+        if self.__edges is None:
+            self.__buildEdges()
+
+        return self.__edges
+
+    ## Return the edge count.
+    # @param self
+    # @return Integer
+    def getEdgeCount(self):
+        return len(self.getEdges()) / 2
+
+    def __buildEdges(self):
+
+        edge_map = {}
+        edges = array("i")
+        edge_polygon_count = array("i")
+        neighbors = [set() for i in xrange(self.point_count)]
+
+        poly_offsets = self.polygon_vertex.offsets
+        poly_indices = self.polygon_vertex.indices
+        edge_indices = array("i")
+        for polygon in xrange(self.polygon_count):
+            vertices = poly_indices[poly_offsets[polygon]:poly_offsets[polygon+1]]
+            for a, b in zip(vertices, vertices[1:] + vertices[:1]):
+
+                key = a < b and (a, b) or (b, a)
+                edge = edge_map.get(key)
+                if edge is None:
+                    edge = len(edge_polygon_count)
+                    edge_map[key] = edge
+                    edges.extend(key)
+                    edge_polygon_count.append(0)
+                    neighbors[a].add(b)
+                    neighbors[b].add(a)
+
+                edge_polygon_count[edge] += 1
+                edge_indices.append(edge)
+
+        self.__edges = edges
+        self.__edge_polygon_count = edge_polygon_count
+        self.__polygon_edge = Adjacency(array("l", poly_offsets), edge_indices)
+        self.__vertex_vertex = getAdjacencyFromSets(neighbors)
+
+    # =====================================================
+    # QUERIES
+    ## Return the vertices within a given number of edges from some vertices, as NeighborVertices(depth).
+    # @param self
+    # @param indices List of Integer - Vertex indexes.
+    # @param depth Integer
+    # @return List of Integer - The vertices found, excluding the given ones, sorted.
+    def getVertexRing(self, indices, depth=1):
+        return getRing(self.getVertexAdjacency(), indices, depth)
+
+    ## Return the smoothing stencil of some vertices.
+    # @param self
+    # @param points List of Integer - Vertex indexes to smooth.
+    # @param depth Integer - Neighborhood depth, as NeighborVertices(depth).
+    # @return SmoothingStencil
+    def getSmoothingStencil(self, points, depth=1):
+        return getSmoothingStencil(self.getVertexAdjacency(), points, depth)
+
+    ## Return the polygons using all the given vertices.
+    # @param self
+    # @param vertices List of Integer - Vertex indexes.
+    # @return List of Integer - Polygon indexes.
+    def getPolygonsFromVertices(self, vertices):
+
+        if not vertices:
+            return []
+
+        vertex_set = set(vertices)
+        polygons = []
+        for polygon in self.getVertexPolygons().getNeighbors(vertices[0]):
+            if vertex_set.issubset(self.getPolygonVertices(polygon)):
+                polygons.append(polygon)
+
+        return polygons
+
+    ## Return the connected vertex islands.
+    # @param self
+    # @return List of List of Integer - Vertex indexes of each island.
+    def getVertexIslands(self):
+        return getComponents(self.__getVertexIslandIds())
+
+    ## Return the connected polygon islands.
+    # @param self
+    # @return List of List of Integer - Polygon indexes of each island.
+    def getPolygonIslands(self):
+
+        vertex_ids = self.__getVertexIslandIds()
+        poly_offsets = self.polygon_vertex.offsets
+        poly_indices = self.polygon_vertex.indices
+
+        ids = array("i", [vertex_ids[poly_indices[poly_offsets[i]]] for i in xrange(self.polygon_count)])
+
+        # Renumber the islands in order of their first polygon
+        remap = {}
+        for island in ids:
+            if island not in remap:
+                remap[island] = len(remap)
+
+        return getComponents([remap[island] for island in ids])
+
+    def __getVertexIslandIds(self):
+
+        if self.__vertex_islands is None:
+            self.__vertex_islands = getComponentIds(self.getVertexAdjacency())
+
+        return self.__vertex_islands
+
+    ## Return the boundary edges, the edges used by only one polygon.
+    # @param self
+    # @return List of Integer - Edge indexes.
+    def getBoundaryEdges(self):
+
+        self.getEdges()
+        return [i for i, count in enumerate(self.__edge_polygon_count) if count == 1]
+
+    ## Return the boundary vertices, the vertices of the boundary edges.
+    # @param self
+    # @return List of Integer - Vertex indexes, sorted.
+    def getBoundaryVertices(self):
+
+        edges = self.getEdges()
+
+        vertices = set()
+        for edge in self.getBoundaryEdges():
+            vertices.add(edges[2*edge])
+            vertices.add(edges[2*edge+1])
+
+        return sorted(vertices)
+
+# ========================================================
+## Return a hash of the mesh topology. Two meshes with the same polygons have the same hash.
+# @param polygon_data List of Integer - Polygon description, as returned by PolygonMesh.Get2().
+# @return Integer
+def getTopologyHash(polygon_data):
+    return hash(tuple(polygon_data))
+
+##########################################################
+# SMOOTHING
+##########################################################
+# ========================================================
+## Sparse smoothing matrix.\n
+## Each smoothed point gets the average value of its neighbors.
+class SmoothingStencil(object):
+
+    ## Init Method.
+    # @param self
+    # @param points List of Integer - Smoothed points.
+    # @param neighbors Adjacency - The neighbors of each smoothed point, in the order of points.
+    def __init__(self, points, neighbors):
+
+        self.points = points
+        self.neighbors = neighbors
+
+    ## Return the smoothed values. All the points are smoothed from the original values.
+    # @param self
+    # @param values List of Float - One value per vertex.
+    # @param blend Float - 0 returns the original values, 1 the average of the neighbors.
+    # @return List of Float
+    def smooth(self, values, blend=1.0):
+
+        result = list(values)
+
+        offsets = self.neighbors.offsets
+        indices = self.neighbors.indices
+        get = values.__getitem__
+        keep = 1.0 - blend
+        for i, point in enumerate(self.points):
+            start = offsets[i]
+            count = offsets[i+1] - start
+            if count:
+                result[point] = sum(map(get, indices[start:start+count])) * blend / count + values[point] * keep
+
+        return result
+
+## Build the smoothing stencil of some points.
+# @param adjacency Adjacency - Vertex to vertex adjacency.
+# @param points List of Integer - Vertex indexes to smooth.
+# @param depth Integer - Neighborhood depth, as NeighborVertices(depth).
+# @return SmoothingStencil
+def getSmoothingStencil(adjacency, points, depth=1):
+
+    offsets = array("l", [0])
+    indices = array("i")
+    for point in points:
+        if depth == 1:
+            indices.extend(adjacency.getNeighbors(point))
+        else:
+            indices.extend(getRing(adjacency, [point], depth))
+        offsets.append(len(indices))
+
+    return SmoothingStencil(list(points), Adjacency(offsets, indices))
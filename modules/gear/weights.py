@@ -0,0 +1,604 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+## @package gear.weights
+# @author Jeremie Passerin
+#
+# @brief envelope weights containers. Doesn't require Softimage.
+
+##########################################################
+# GLOBAL
+##########################################################
+# Built-in
+from array import array
+from itertools import chain, izip
+
+##########################################################
+# WEIGHT MATRIX
+##########################################################
+# ========================================================
+## Dense deformers x points weights matrix.\n
+## Weights are stored in a flat point major list, which is the layout expected when setting EnvelopeOp.Weights.Array.\n
+## A row (weights of one point) is a slice and a column (weights of one deformer) is an extended slice.\n
+## The matrix is only used to convert and access weights, the operations on the weights are done by SparseWeights.
+class WeightMatrix(object):
+
+    ## Init Method.
+    # @param self
+    # @param values List of Float - Flat point major weights.
+    # @param deformer_count Integer - Number of deformers.
+    def __init__(self, values, deformer_count):
+
+        self.values = values
+        self.deformer_count = deformer_count
+
+        if deformer_count:
+            self.point_count = len(values) / deformer_count
+        else:
+            self.point_count = 0
+
+    ## Return a copy of the matrix.
+    # @param self
+    # @return WeightMatrix
+    def copy(self):
+        return WeightMatrix(self.values[:], self.deformer_count)
+
+    # =====================================================
+    # ACCESS
+    ## Return the weights of a point.
+    # @param self
+    # @param point_index Integer
+    # @return List of Float - One weight per deformer.
+    def getPointWeights(self, point_index):
+        start = point_index * self.deformer_count
+        return self.values[start:start+self.deformer_count]
+
+    ## Set the weights of a point.
+    # @param self
+    # @param point_index Integer
+    # @param weights List of Float - One weight per deformer.
+    def setPointWeights(self, point_index, weights):
+        start = point_index * self.deformer_count
+        self.values[start:start+self.deformer_count] = weights
+
+    ## Return the weights of a deformer.
+    # @param self
+    # @param deformer_index Integer
+    # @return List of Float - One weight per point.
+    def getDeformerWeights(self, deformer_index):
+        return self.values[deformer_index::self.deformer_count]
+
+    ## Set the weights of a deformer.
+    # @param self
+    # @param deformer_index Integer
+    # @param weights List of Float - One weight per point.
+    def setDeformerWeights(self, deformer_index, weights):
+        self.values[deformer_index::self.deformer_count] = weights
+
+    ## Iterate over the rows of the matrix.
+    # @param self
+    # @return Iterator of Tuple of Float - The weights of each point.
+    def iterPoints(self):
+        return izip(*[iter(self.values)] * self.deformer_count)
+
+# ========================================================
+## Create a WeightMatrix from an EnvelopeOp.Weights.Array.
+# @param weights_tuple Tuple of Tuple of Float - Deformer major weights as returned by XSI.
+# @return WeightMatrix
+def getMatrixFromArray(weights_tuple):
+
+    if not weights_tuple:
+        return WeightMatrix([], 0)
+
+    values = list(chain.from_iterable(izip(*weights_tuple)))
+
+    return WeightMatrix(values, len(weights_tuple))
+
+## Create an empty WeightMatrix.
+# @param point_count Integer
+# @param deformer_count Integer
+# @return WeightMatrix
+def getEmptyMatrix(point_count, deformer_count):
+    return WeightMatrix([0.0] * (point_count * deformer_count), deformer_count)
+
+##########################################################
+# SPARSE WEIGHTS
+##########################################################
+# ========================================================
+## Sparse envelope weights, compressed by point (CSR).\n
+## For each point, only the deformers with a non zero weight are stored.
+## The deformer indexes and weights of point i are in indices[offsets[i]:offsets[i+1]] and weights[offsets[i]:offsets[i+1]].\n
+## Indexes are sorted and zero weights are never stored, so memory and time scale with the number of non zero weights.
+class SparseWeights(object):
+
+    ## Init Method.
+    # @param self
+    # @param offsets array of Integer - Start of each point in indices and weights, plus the total count.
+    # @param indices array of Integer - Deformer indexes.
+    # @param weights array of Float - Weights.
+    # @param deformer_count Integer - Number of deformers.
+    def __init__(self, offsets, indices, weights, deformer_count):
+
+        self.offsets = offsets
+        self.indices = indices
+        self.weights = weights
+        self.deformer_count = deformer_count
+        self.point_count = len(offsets) - 1
+
+    ## Return a copy of the sparse weights.
+    # @param self
+    # @return SparseWeights
+    def copy(self):
+        return SparseWeights(self.offsets[:], self.indices[:], self.weights[:], self.deformer_count)
+
+    ## Return the number of non zero weights.
+    # @param self
+    # @return Integer
+    def getNonZeroCount(self):
+        return len(self.weights)
+
+    # =====================================================
+    # ACCESS
+    ## Return the weights of a point.
+    # @param self
+    # @param point_index Integer
+    # @return Tuple of array - The deformer indexes and the weights.
+    def getPointWeights(self, point_index):
+        start = self.offsets[point_index]
+        end = self.offsets[point_index+1]
+        return self.indices[start:end], self.weights[start:end]
+
+    ## Iterate over the points.
+    # @param self
+    # @return Iterator of Tuple - (point index, deformer indexes, weights) for each point.
+    def iterPoints(self):
+
+        offsets = self.offsets
+        for point_index in xrange(self.point_count):
+            start = offsets[point_index]
+            end = offsets[point_index+1]
+            yield point_index, self.indices[start:end], self.weights[start:end]
+
+    ## Replace the weights of some points.
+    # @param self
+    # @param points_weights Dictionary - Point index as key and (deformer indexes, weights) as value.
+    def setPointsWeights(self, points_weights):
+
+        if not points_weights:
+            return
+
+        def setWeights(point_index, indices, weights):
+            return points_weights[point_index]
+
+        self.__process(setWeights, points_weights.keys())
+
+    ## Return the total weight of each point.
+    # @param self
+    # @param points List of Integer - Points to process. None for all.
+    # @return List of Float
+    def getTotals(self, points=None):
+
+        if points is None:
+            points = xrange(self.point_count)
+
+        offsets = self.offsets
+        weights = self.weights
+
+        return [sum(weights[offsets[point_index]:offsets[point_index+1]]) for point_index in points]
+
+    ## Return the indexes of deformers with at least one point weighted.
+    # @param self
+    # @return List of Integer
+    def getUsedDeformers(self):
+        return sorted(set(self.indices))
+
+    # =====================================================
+    # CONVERSION
+    ## Return the dense flat point major weights, as expected by EnvelopeOp.Weights.Array.
+    # @param self
+    # @return List of Float
+    def getArray(self):
+        return self.getMatrix().values
+
+    ## Return the dense weight matrix.
+    # @param self
+    # @return WeightMatrix
+    def getMatrix(self):
+
+        count = self.deformer_count
+        matrix = getEmptyMatrix(self.point_count, count)
+        values = matrix.values
+
+        for point_index, indices, weights in self.iterPoints():
+            start = point_index * count
+            for deformer_index, weight in izip(indices, weights):
+                values[start + deformer_index] = weight
+
+        return matrix
+
+    # =====================================================
+    # OPERATIONS
+    ## Return the indexes of unormalized points.
+    # @param self
+    # @param points List of Integer - Points to check. None for all.
+    # @param threshold Float - the threshold.
+    # @return List of Integer
+    def getUnnormalizedPoints(self, points=None, threshold=1E-6):
+
+        if points is None:
+            points = xrange(self.point_count)
+
+        low = 100 - threshold
+        high = 100 + threshold
+
+        return [point_index for point_index, total in izip(points, self.getTotals(points)) if total < low or total > high]
+
+    ## Normalize the weights of given points so their sum is equal to 100.
+    # @param self
+    # @param points List of Integer - Points to normalize. None for all.
+    # @return List of Integer - Points that couldn't be normalized because they have no weight.
+    def normalize(self, points=None):
+
+        unweighted = []
+
+        def normalizePoint(point_index, indices, weights):
+
+            total = sum(weights)
+
+            if total == 0:
+                unweighted.append(point_index)
+            elif total != 100:
+                ratio = 100.0 / total
+                return indices, [w * ratio for w in weights]
+
+        self.__process(normalizePoint, points)
+
+        return unweighted
+
+    ## Add the missing weight of given points to a set of deformers.
+    # @param self
+    # @param deformers_index List of Integer - Deformers to receive the weight.
+    # @param points List of Integer - Points to process. None for all.
+    # @param threshold Float - the threshold.
+    def normalizeToDeformers(self, deformers_index, points=None, threshold=1E-6):
+
+        ratio = 1.0 / len(deformers_index)
+
+        def normalizePoint(point_index, indices, weights):
+
+            total = sum(weights)
+            if total >= (100 - threshold):
+                return
+
+            point_weights = dict(izip(indices, weights))
+            weight = (100 - total) * ratio
+            for deformer_index in deformers_index:
+                point_weights[deformer_index] = point_weights.get(deformer_index, 0) + weight
+
+            return splitWeights(point_weights)
+
+        self.__process(normalizePoint, points)
+
+    ## Give the points without weight the normalized weights of their closest weighted vertices.\n
+    ## The mesh is walked once, ring by ring from all the weighted vertices at the same time.
+    ## Each unweighted vertex gets the average of its neighbors of the previous ring.
+    # @param self
+    # @param adjacency Adjacency - Vertex to vertex adjacency of the mesh.
+    # @param points List of Integer - Points to fill. None for all the unweighted points.
+    # @return List of Integer - Points that couldn't be filled because no weighted vertex is connected to them.
+    def fillUnweighted(self, adjacency, points=None):
+
+        offsets = self.offsets
+        totals = self.getTotals()
+
+        # Ring of each vertex, -1 if not reached yet
+        rings = array("i", [-1] * self.point_count)
+        ring = [point_index for point_index, total in enumerate(totals) if total > 0]
+        for point_index in ring:
+            rings[point_index] = 0
+
+        filled = {}
+        distance = 0
+        while ring:
+
+            distance += 1
+            next_ring = []
+            for point_index in ring:
+                for neighbor_index in adjacency.getNeighbors(point_index):
+                    if rings[neighbor_index] == -1:
+                        rings[neighbor_index] = distance
+                        next_ring.append(neighbor_index)
+
+            for point_index in next_ring:
+
+                point_weights = {}
+                for neighbor_index in adjacency.getNeighbors(point_index):
+                    if rings[neighbor_index] != distance - 1:
+                        continue
+
+                    if neighbor_index in filled:
+                        indices, weights = filled[neighbor_index]
+                    else:
+                        start = offsets[neighbor_index]
+                        end = offsets[neighbor_index+1]
+                        indices, weights = self.indices[start:end], self.weights[start:end]
+
+                    for deformer_index, weight in izip(indices, weights):
+                        point_weights[deformer_index] = point_weights.get(deformer_index, 0) + weight
+
+                total = sum(point_weights.values())
+                for deformer_index in point_weights:
+                    point_weights[deformer_index] *= 100.0 / total
+
+                filled[point_index] = splitWeights(point_weights)
+
+            ring = next_ring
+
+        if points is None:
+            points = [point_index for point_index, total in enumerate(totals) if total == 0]
+
+        self.setPointsWeights(dict([(point_index, filled[point_index]) for point_index in points if point_index in filled]))
+
+        return [point_index for point_index in points if rings[point_index] == -1]
+
+    ## Remove the influence of deformers that are smaller than threshold.
+    # @param self
+    # @param threshold Float - Minimum influence a deformer can have.
+    # @param points List of Integer - Points to process. None for all.
+    # @return List of Integer - Points that have been modified and need to be normalized.
+    def prune(self, threshold, points=None):
+
+        def prunePoint(point_index, indices, weights):
+
+            if min(weights or [threshold+1]) > threshold:
+                return
+
+            kept = [(i, w) for i, w in izip(indices, weights) if w > threshold]
+            return [i for i, w in kept], [w for i, w in kept]
+
+        return self.__process(prunePoint, points)
+
+    ## Average the weights of each deformer with the weights of its mirror deformer.
+    # @param self
+    # @param mirror_index List of Integer - For each deformer, the index of its mirror deformer.
+    # @param points List of Integer - Points to process. None for all.
+    def averageMirror(self, mirror_index, points=None):
+
+        # For each deformer, the deformers that use it as mirror
+        mirrored_by = [[] for i in xrange(self.deformer_count)]
+        for deformer_index, mirror in enumerate(mirror_index):
+            mirrored_by[mirror].append(deformer_index)
+
+        def mirrorPoint(point_index, indices, weights):
+
+            point_weights = dict(izip(indices, weights))
+
+            deformers = set(indices)
+            for deformer_index in indices:
+                deformers.update(mirrored_by[deformer_index])
+
+            return splitWeights(dict([(i, (point_weights.get(i, 0) + point_weights.get(mirror_index[i], 0)) * .5) for i in deformers]))
+
+        self.__process(mirrorPoint, points)
+
+    ## Move the weights of source deformers to target deformers.\n
+    ## The weights are equally splitted between the target deformers.
+    # @param self
+    # @param source_index List of Integer - Deformers to take the weights from.
+    # @param target_index List of Integer - Deformers to give the weights to.
+    # @param points List of Integer - Points to process. None for all.
+    def replaceDeformers(self, source_index, target_index, points=None):
+
+        source_index = set(source_index)
+        ratio = 1.0 / len(target_index)
+
+        def replacePoint(point_index, indices, weights):
+
+            if source_index.isdisjoint(indices):
+                return
+
+            point_weights = dict(izip(indices, weights))
+
+            point_weight = 0
+            for deformer_index in source_index.intersection(indices):
+                point_weight += point_weights.pop(deformer_index)
+
+            point_weight *= ratio
+            for deformer_index in target_index:
+                point_weights[deformer_index] = point_weights.get(deformer_index, 0) + point_weight
+
+            return splitWeights(point_weights)
+
+        self.__process(replacePoint, points)
+
+    ## Change the deformer indexes.\n
+    ## Weights of deformers mapped to the same index are added. Weights of deformers mapped to -1 are removed.
+    # @param self
+    # @param mapping List of Integer - For each deformer, its new index or -1.
+    # @param deformer_count Integer - New number of deformers.
+    def remapDeformers(self, mapping, deformer_count):
+
+        offsets = array("l", [0])
+        indices = array("i")
+        weights = array("d")
+
+        for point_index, point_indices, point_weights in self.iterPoints():
+
+            point_weights = [(mapping[i], w) for i, w in izip(point_indices, point_weights) if mapping[i] != -1]
+
+            new_weights = {}
+            for i, w in point_weights:
+                new_weights[i] = new_weights.get(i, 0) + w
+
+            new_indices = sorted(new_weights.keys())
+            indices.extend(new_indices)
+            weights.extend([new_weights[i] for i in new_indices])
+            offsets.append(len(indices))
+
+        self.offsets = offsets
+        self.indices = indices
+        self.weights = weights
+        self.deformer_count = deformer_count
+
+    ## Remove a deformer. The weights of the deformer are lost.
+    # @param self
+    # @param deformer_index Integer - Index of the deformer to remove.
+    def removeDeformer(self, deformer_index):
+
+        mapping = range(self.deformer_count)
+        mapping[deformer_index] = -1
+        for i in xrange(deformer_index+1, self.deformer_count):
+            mapping[i] = i - 1
+
+        self.remapDeformers(mapping, self.deformer_count - 1)
+
+    # =====================================================
+    ## Rebuild the arrays, calling the method on each point to process.\n
+    ## The method receives the point index, deformer indexes and weights of the point,
+    ## and return the new deformer indexes and weights or None if the point is unchanged.
+    # @param self
+    # @param method Function.
+    # @param points List of Integer - Points to process. None for all.
+    # @return List of Integer - The modified points.
+    def __process(self, method, points=None):
+
+        if points is not None:
+            points = set(points)
+
+        offsets = array("l", [0])
+        indices = array("i")
+        weights = array("d")
+
+        modified = []
+        for point_index, point_indices, point_weights in self.iterPoints():
+
+            if points is None or point_index in points:
+                result = method(point_index, point_indices, point_weights)
+                if result is not None:
+                    point_indices, point_weights = result
+                    modified.append(point_index)
+
+            indices.extend(point_indices)
+            weights.extend(point_weights)
+            offsets.append(len(indices))
+
+        self.offsets = offsets
+        self.indices = indices
+        self.weights = weights
+
+        return modified
+
+# ========================================================
+## Create a SparseWeights from an EnvelopeOp.Weights.Array.
+# @param weights_tuple Tuple of Tuple of Float - Deformer major weights as returned by XSI.
+# @return SparseWeights
+def getSparseFromArray(weights_tuple):
+
+    offsets = array("l", [0])
+    indices = array("i")
+    weights = array("d")
+
+    for point_weights in izip(*weights_tuple):
+        for deformer_index, weight in enumerate(point_weights):
+            if weight:
+                indices.append(deformer_index)
+                weights.append(weight)
+        offsets.append(len(indices))
+
+    return SparseWeights(offsets, indices, weights, len(weights_tuple))
+
+## Create a SparseWeights from a WeightMatrix.
+# @param matrix WeightMatrix
+# @return SparseWeights
+def getSparseFromMatrix(matrix):
+
+    offsets = array("l", [0])
+    indices = array("i")
+    weights = array("d")
+
+    for point_weights in matrix.iterPoints():
+        for deformer_index, weight in enumerate(point_weights):
+            if weight:
+                indices.append(deformer_index)
+                weights.append(weight)
+        offsets.append(len(indices))
+
+    return SparseWeights(offsets, indices, weights, matrix.deformer_count)
+
+## Create a SparseWeights from a dictionary of point weights.
+# @param point_count Integer
+# @param deformer_count Integer
+# @param points_weights Dictionary - Point index as key and (deformer indexes, weights) as value. Missing points have no weight.
+# @return SparseWeights
+def getSparseFromDict(point_count, deformer_count, points_weights):
+
+    offsets = array("l", [0])
+    indices = array("i")
+    weights = array("d")
+
+    for point_index in xrange(point_count):
+        if point_index in points_weights:
+            point_indices, point_weights = points_weights[point_index]
+            indices.extend(point_indices)
+            weights.extend(point_weights)
+        offsets.append(len(indices))
+
+    return SparseWeights(offsets, indices, weights, deformer_count)
+
+## Create an empty SparseWeights.
+# @param point_count Integer
+# @param deformer_count Integer
+# @return SparseWeights
+def getEmptySparse(point_count, deformer_count):
+    return SparseWeights(array("l", [0] * (point_count + 1)), array("i"), array("d"), deformer_count)
+
+## Return the weights to apply on an envelope from imported weights.\n
+## The deformers of the imported weights are remapped to the deformers of the envelope.
+## With a point selection, only the selected points are replaced in the current weights of the envelope.
+# @param weights SparseWeights - Imported weights. They are remapped in place.
+# @param mapping List of Integer - For each imported deformer, its index in the envelope or -1 if it's missing.
+# @param deformer_count Integer - Number of deformers of the envelope.
+# @param points List of Integer - Points to apply. None for all.
+# @param current SparseWeights - Current weights of the envelope. None if the object wasn't enveloped.
+# @return SparseWeights
+def getEnvelopeWeights(weights, mapping, deformer_count, points=None, current=None):
+
+    weights.remapDeformers(mapping, deformer_count)
+
+    if not points:
+        return weights
+
+    if current is None:
+        current = getEmptySparse(weights.point_count, deformer_count)
+
+    current.setPointsWeights(dict([(point_index, weights.getPointWeights(point_index)) for point_index in set(points)]))
+
+    return current
+
+## Split a dictionary of point weights into sorted deformer indexes and non zero weights.
+# @param point_weights Dictionary - Deformer index as key and weight as value.
+# @return Tuple of List - The deformer indexes and the weights.
+def splitWeights(point_weights):
+
+    indices = sorted([i for i, w in point_weights.items() if w])
+    return indices, [point_weights[i] for i in indices]
@@ -31,6 +31,7 @@
 ##########################################################
 # built-in
 import xml.etree.cElementTree as etree
+import xml.parsers.expat as expat
 
 ##########################################################
 # METHODS
@@ -82,3 +83,141 @@ def indent(elem, level=0):
     else:
         if level and (not elem.tail or not elem.tail.strip()):
             elem.tail = i
+
+##########################################################
+# STREAMING
+##########################################################
+# ========================================================
+## Return the root element of a file, without its children.\n
+## Only the beginning of the file is parsed.
+# @param path String - Path of the xml file.
+# @return etree.Element - None if the file is empty.
+def getRoot(path):
+
+    for event, elem in etree.iterparse(path, events=("start",)):
+        return elem
+
+    return None
+
+## Iterate over the children of the root element of a file.\n
+## The file is parsed while iterating and each child is detached from the root once the next one is requested,
+## so the parsed children are not kept alive by the document.
+# @param path String - Path of the xml file.
+# @return Iterator of etree.Element
+def iterChildren(path):
+
+    root = None
+    depth = 0
+    for event, elem in etree.iterparse(path, events=("start", "end")):
+
+        if event == "start":
+            if root is None:
+                root = elem
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth == 1:
+            yield elem
+            root.remove(elem)
+
+## Index the children of the root element with given tag by the value of an attribute.\n
+## The file is scanned once without building any element.
+# @param path String - Path of the xml file.
+# @param tag String - Tag of the children to index.
+# @param attr String - Attribute used as key.
+# @return ElementIndex
+def indexChildren(path, tag, attr="name"):
+
+    index = ElementIndex(path)
+    parser = expat.ParserCreate()
+
+    # depth, current child (key, start) and child waiting for its end position
+    state = {"depth":0, "current":None, "closed":None}
+
+    def closePending():
+        if state["closed"] is not None:
+            key, start = state["closed"]
+            index.add(key, start, parser.CurrentByteIndex)
+            state["closed"] = None
+
+    def startElement(name, attrs):
+        closePending()
+        if state["depth"] == 1 and name == tag:
+            state["current"] = (attrs.get(attr), parser.CurrentByteIndex)
+        state["depth"] += 1
+
+    def endElement(name):
+        closePending()
+        state["depth"] -= 1
+        if state["depth"] == 1 and state["current"] is not None:
+            state["closed"] = state["current"]
+            state["current"] = None
+
+    def otherData(data):
+        closePending()
+
+    parser.StartElementHandler = startElement
+    parser.EndElementHandler = endElement
+    parser.CharacterDataHandler = otherData
+    parser.CommentHandler = otherData
+
+    f = open(path, "rb")
+    try:
+        parser.ParseFile(f)
+    finally:
+        f.close()
+
+    return index
+
+## Read an element from a part of a file.
+# @param path String - Path of the xml file.
+# @param start Integer - Position of the first byte of the element.
+# @param end Integer - Position after the last byte of the element.
+# @return etree.Element
+def readElement(path, start, end):
+
+    f = open(path, "rb")
+    try:
+        f.seek(start)
+        return etree.fromstring(f.read(end - start))
+    finally:
+        f.close()
+
+# ========================================================
+## Position of some elements in a xml file.\n
+## Behave as a read only dictionary, the elements are only parsed when requested.
+class ElementIndex(object):
+
+    ## Init Method.
+    # @param self
+    # @param path String - Path of the xml file.
+    def __init__(self, path):
+
+        self.path = path
+        self.names = []
+        self.positions = {}
+
+    ## Add an element to the index.
+    # @param self
+    # @param key String - Key of the element.
+    # @param start Integer - Position of the first byte of the element.
+    # @param end Integer - Position after the last byte of the element.
+    def add(self, key, start, end):
+
+        if key not in self.positions:
+            self.names.append(key)
+        self.positions[key] = (start, end)
+
+    def keys(self):
+        return self.names[:]
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, key):
+        start, end = self.positions[key]
+        return readElement(self.path, start, end)
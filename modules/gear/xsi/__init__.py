@@ -25,27 +25,57 @@
 # @author Jeremie Passerin
 #
 # @brief main xsi module, xsi constants, preferences mangement
+#
+# The xsi objects come from Softimage, or from the pure python stand-in (gear.xsi.standin) when the
+# GEAR_BACKEND environment variable is set to "standin" before gear.xsi is imported.
 
 ##########################################################
 # GLOBAL
 ##########################################################
 # Built-in
-import win32com.client
+import os
+
+## Backend of the xsi objects, "xsi" or "standin".
+BACKEND = os.environ.get("GEAR_BACKEND", "xsi")
+
+if BACKEND == "standin":
+
+    from gear.xsi import standin
+
+    Dispatch = standin.dispatch
+    dynDispatch = standin.dispatch
+
+    constants = standin.Constants()
+    c = constants
+
+    # Constants
+    XSIMath = standin.Math()
+
+    Application = standin.Application()
+    xsi = Application
+
+    XSIFactory = standin.Factory(xsi)
+    XSIUIToolkit = standin.UIToolkit(xsi)
+    XSIUtils = standin.Utils(xsi)
+
+else:
+
+    import win32com.client
 
-from win32com.client import Dispatch
-from win32com.client.dynamic import Dispatch as dynDispatch
+    from win32com.client import Dispatch
+    from win32com.client.dynamic import Dispatch as dynDispatch
 
-from win32com.client import constants
-from win32com.client import constants as c
+    from win32com.client import constants
+    from win32com.client import constants as c
 
-# Constants
-Application = Dispatch("XSI.Application").Application
-xsi = Dispatch("XSI.Application").Application
+    # Constants
+    Application = Dispatch("XSI.Application").Application
+    xsi = Dispatch("XSI.Application").Application
 
-XSIFactory = Dispatch("XSI.Factory")
-XSIUIToolkit = Dispatch("XSI.UIToolkit")
-XSIMath = Dispatch("XSI.Math")
-XSIUtils = Dispatch("XSI.Utils")
+    XSIFactory = Dispatch("XSI.Factory")
+    XSIUIToolkit = Dispatch("XSI.UIToolkit")
+    XSIMath = Dispatch("XSI.Math")
+    XSIUtils = Dispatch("XSI.Utils")
 
 
 ##########################################################
@@ -96,8 +96,9 @@ def createMirrorCnxTemplate(model, in_controlers=None):
     cnx_prop = model.Properties(MIRROR_PROP_NAME)
     if not cnx_prop:
         cnx_prop = model.AddProperty("gear_Mirror", False, MIRROR_PROP_NAME)
-        cnx_grid = cnx_prop.Parameters("CnxGridHidden").Value
-        connections = par.getDictFromGridData(cnx_grid)
+
+    cnx_grid = cnx_prop.Parameters("CnxGridHidden").Value
+    connections = par.getDictFromGridData(cnx_grid)
 
     if in_controlers is not None:
         
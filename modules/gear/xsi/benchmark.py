@@ -0,0 +1,235 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+## @package gear.xsi.benchmark
+# @author Jeremie Passerin
+#
+# @brief benchmarks of the rig builder. Run from the script editor :\n
+# import gear.xsi.benchmark\n
+# gear.xsi.benchmark.main()\n
+# Or without Softimage, with the stand-in backend (see gear.xsi.standin) :\n
+# GEAR_BACKEND=standin python -m gear.xsi.benchmark
+
+##########################################################
+# GLOBAL
+##########################################################
+# Built-in
+import os
+import copy
+import xml.etree.cElementTree as etree
+
+# gear
+import gear
+from gear.xsi import xsi
+
+import gear.xsi.registry as reg
+import gear.xsi.ppg as ppg
+import gear.xsi.rig.component as comp
+from gear.xsi.rig import Rig
+from gear.xsi.rig.guide import RigGuide
+
+from gear.benchmark import timeCall, logResults
+
+TEMPLATE_PATH = os.path.join(comp.__path__[0], "_templates")
+
+##########################################################
+# BENCHMARKS
+##########################################################
+# ========================================================
+## Compare the rig build with and without batch mode.\n
+## Each rig is deleted after its build.
+# @param path String - Path of the xml guide.
+# @param refresh_steps List of Integer - Refresh cadences tested in batch mode.
+# @return Dictionary - Build time for each mode.
+def benchmarkBuild(path=os.path.join(TEMPLATE_PATH, "dog_guide.xml"), refresh_steps=(0, 10)):
+
+    cases = [("default", False, 0)]
+    for refresh_step in refresh_steps:
+        cases.append(("batch refresh_step=%s"%refresh_step, True, refresh_step))
+
+    results = {}
+    for name, batch, refresh_step in cases:
+
+        rig = Rig()
+        build_time, model = timeCall(rig.buildFromFile, path, False, None, batch, refresh_step)
+        results[name] = {"time":build_time}
+
+        if model:
+            xsi.DeleteObj(model)
+
+    return results
+
+## Create the xml definition of a guide made of a chain of control components.
+# @param component_count Integer - Number of components.
+# @param path String - Path of the template guide. Its first control_01 component is duplicated.
+# @return xml_node - The guide definition.
+def getSyntheticGuide(component_count=150, path=os.path.join(TEMPLATE_PATH, "dog_guide.xml")):
+
+    xml_guide = etree.parse(path).getroot()
+
+    xml_components = [xml_comp for xml_comp in xml_guide.findall("component") if xml_comp.get("type") == "control_01"]
+    prototype = xml_components[0]
+    for xml_comp in xml_guide.findall("component"):
+        xml_guide.remove(xml_comp)
+
+    for i in range(component_count):
+
+        name = "ctl%s"%i
+        xml_comp = copy.deepcopy(prototype)
+        xml_comp.set("name", name+"_C0")
+        xml_comp.set("parent", i and "ctl%s_C0.root"%(i-1) or "None")
+
+        for xml_param in xml_comp.find("settings").findall("parameter"):
+            if xml_param.get("scriptName") == "comp_name":
+                xml_param.set("value", name)
+            elif xml_param.get("scriptName") == "comp_index":
+                xml_param.set("value", "0")
+
+        xml_guide.append(xml_comp)
+
+    return xml_guide
+
+## Resolve the guide parenting with the previous loop over every pair of components.
+# @param guide RigGuide - A guide loaded from the scene.
+def setParentingPairwise(guide):
+
+    for name in guide.componentsIndex:
+        compChild = guide.components[name]
+        for name in guide.componentsIndex:
+            compParent = guide.components[name]
+            for name, element in compParent.getObjects(guide.model).items():
+                if element is not None and element.IsEqualTo(compChild.root.Parent):
+                    compChild.parentComponent = compParent
+                    compChild.parentLocalName = name
+                    break
+
+## Time the loading of a synthetic guide from the scene, and compare the parenting resolutions.
+# @param component_count Integer - Number of components of the guide.
+# @return Dictionary - Times of each case.
+def benchmarkGuideLoading(component_count=150):
+
+    # Draw the guide
+    guide = RigGuide()
+    guide.setFromXml(getSyntheticGuide(component_count))
+    guide.draw()
+    model = guide.model
+
+    results = {}
+
+    guide = RigGuide()
+    load_time = timeCall(guide.setFromHierarchy, model, True)[0]
+    results["load"] = {"time":load_time}
+
+    results["parenting"] = {"time":timeCall(guide.setParenting, reg.getRegistry(model))[0]}
+    results["parenting pairwise"] = {"time":timeCall(setParentingPairwise, guide)[0]}
+
+    xsi.DeleteObj(model)
+
+    return results
+
+## Create a layout and a logic as the setup property of a ui host with many divided components.\n
+## Each component adds a stretch and a squash item and two lines of code after the layout per division, as arm_2jnt_01.
+# @param component_count Integer - Number of components.
+# @param divisions Integer - Number of divisions of each component.
+# @return Tuple - The PPGLayout and the PPGLogic.
+def getSyntheticLayout(component_count=20, divisions=50):
+
+    layout = ppg.PPGLayout()
+    logic = ppg.PPGLogic()
+
+    for i in range(component_count):
+
+        name = "arm_L%s"%i
+        tab = layout.addTab(name)
+        stretch_group = tab.addGroup("Stretch")
+        squash_group = tab.addGroup("Squash")
+        stretch_group.addCondition("PPG.%s_profile.Value == 0"%name)
+        squash_group.addCondition("PPG.%s_profile.Value == 1"%name)
+
+        for j in range(divisions):
+            stretch_group.addItem("%s_stretch_%s"%(name, j), "Stretch %s"%j)
+            squash_group.addItem("%s_squash_%s"%(name, j), "Squash %s"%j)
+
+            layout.setCodeAfter("PPG.%s_stretch_%s.ReadOnly = not PPG.%s_edit.Value"%(name, j, name))
+            layout.setCodeAfter("PPG.%s_squash_%s.ReadOnly = not PPG.%s_edit.Value"%(name, j, name))
+
+        comp_logic = ppg.PPGLogic()
+        comp_logic.addGlobalCode("import gear.xsi.rig.component.logic as logic")
+        comp_logic.addOnChangedRefresh("%s_edit"%name)
+        logic.merge(comp_logic)
+
+    return layout, logic
+
+## Return the code of a layout with the previous concatenation to the value attribute of the layout.
+# @param layout PPGLayout
+# @return String
+def getLayoutValueConcatenated(layout):
+
+    layout.value = ""
+
+    for code in layout.beforeCode:
+        layout.value += code + "\r\n"
+
+    layout.value += "\r\n"
+
+    for index in layout.tabIndex:
+        layout.value += layout.tabs[index].getValue()
+
+    layout.value += "\r\n"
+
+    for code in layout.afterCode:
+        layout.value += code + "\r\n"
+
+    return layout.value
+
+## Time the code generation of a large layout and logic.
+# @param component_count Integer - Number of components.
+# @param divisions Integer - Number of divisions of each component.
+# @return Dictionary - Times and sizes of each case.
+def benchmarkPPGValue(component_count=20, divisions=50):
+
+    layout, logic = getSyntheticLayout(component_count, divisions)
+
+    results = {}
+
+    concat_time, value = timeCall(getLayoutValueConcatenated, layout)
+    results["layout concatenated"] = {"time":concat_time, "size":len(value)}
+
+    join_time, value = timeCall(layout.getValue)
+    results["layout joined"] = {"time":join_time, "size":len(value)}
+
+    join_time, value = timeCall(logic.getValue)
+    results["logic joined"] = {"time":join_time, "size":len(value), "global_code":len(logic.globalCode)}
+
+    return results
+
+##########################################################
+# MAIN
+##########################################################
+def main():
+    logResults("PPG code", benchmarkPPGValue())
+    logResults("Guide loading", benchmarkGuideLoading())
+    logResults("Rig build", benchmarkBuild())
+
+if __name__ == "__main__":
+    main()
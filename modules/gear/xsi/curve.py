@@ -32,6 +32,7 @@
 
 from gear.xsi import xsi, c, XSIMath, XSIFactory
 import gear.xsi.utils as uti
+import gear.xsi.registry as reg
 
 ##########################################################
 # DRAW
@@ -65,6 +66,7 @@ def addCnsCurve(parent, name, centers, close=False, degree=1):
         points.append(1)
 
     curve = parent.AddNurbsCurve(points, None, close, degree, c.siNonUniformParameterization, c.siSINurbs, name)
+    reg.register(curve)
 
     for i, center in enumerate(centers):
         cluster = curve.ActivePrimitive.Geometry.AddCluster( c.siVertexCluster, "center_%s"%i, [i] )
@@ -98,6 +100,7 @@ def addCnsCurve(parent, name, centers, close=False, degree=1):
 def addCurve(parent, name, points, close=False, degree=1, t=XSIMath.CreateTransform(), color=[0,0,0]):
 
     curve = parent.AddNurbsCurve(points, None, close, degree, c.siNonUniformParameterization, c.siSINurbs, name)
+    reg.register(curve)
 
     uti.setColor(curve, color)
     curve.Kinematics.Global.Transform = t
@@ -123,6 +126,7 @@ def addCurve2(parent, name, points, ncp=[], kn=[], nkn=[], close=[], degree=[],
     aPar = [c.siNonUniformParameterization for i in range(pointCount)]
 
     curve = parent.AddNurbsCurveList2(pointCount, points, ncp, kn, nkn, close, degree, aPar, c.siSINurbs, name)
+    reg.register(curve)
 
     uti.setColor(curve, color)
     curve.Kinematics.Global.Transform = t
@@ -150,6 +154,7 @@ def addCurveFromPos(parent, name, positions, close=False, degree=1, t=XSIMath.Cr
         points.append(1)
 
     curve = parent.AddNurbsCurve(points, None, close, degree, c.siNonUniformParameterization, c.siSINurbs, name)
+    reg.register(curve)
 
     uti.setColor(curve, color)
     curve.Kinematics.Global.Transform = t
@@ -30,12 +30,14 @@
 ##########################################################
 
 import gear
+import gear.weights as wgt
 
 from gear.xsi import xsi, c, XSIFactory, XSIUtils
 
 import gear.xsi.uitoolkit as uit
 import gear.xsi.utils as uti
 import gear.xsi.operator as ope
+import gear.xsi.topology as topo
 
 ##########################################################
 # ENVELOPE
@@ -122,6 +124,58 @@ def copyMirrorEnvelope(source_mesh, target_mesh):
     # Apply Weights
     targetEnv_op.Weights.Array = sourceEnv_op.Weights.Array
 
+# Apply Envelope Weights ================================
+## Apply an envelope with given weights to an object.\n
+## Missing deformers are skipped.
+# @param obj Geometry - The object to envelope.
+# @param deformer_names List of String - Name of the deformers, in the model of the object.
+# @param weights SparseWeights - The weights, using the index of the deformer names.
+# @param pnt_selection List of Integer - Only apply the weights of these points. None for all.
+# @return Envelope Operator - The envelope operator.
+def applyEnvelopeWeights(obj, deformer_names, weights, pnt_selection=None):
+
+    if obj.ActivePrimitive.Geometry.Points.Count != weights.point_count:
+        gear.log("Point count doesn't match", gear.sev_error)
+        return
+
+    # Get Deformers
+    model = obj.Model
+    deformers = XSIFactory.CreateObject("XSI.Collection")
+    deformer_fullnames = []
+    for name in deformer_names:
+        deformer = model.FindChild(name)
+        if not deformer:
+            gear.log("Deformer is missing : " + name, gear.sev_warning)
+            deformer_fullnames.append(None)
+        else:
+            deformers.Add(deformer)
+            deformer_fullnames.append(deformer.FullName)
+
+    if not deformers.Count:
+        gear.log("All deformers are missing. Unable to retrieve envelope", gear.sev_warning)
+        return
+
+    # Apply or re-apply envelope
+    bWasNotEnveloped = not ope.getOperatorFromStack(obj, "envelopop")
+    envelope_op = obj.ApplyEnvelope(deformers)
+
+    # Get real deformer Index
+    envelope_names = envelope_op.Deformers.GetAsText().split(",")
+    envelope_index = dict([(name, i) for i, name in enumerate(envelope_names)])
+    mapping = [envelope_index.get(name, -1) for name in deformer_fullnames]
+
+    # if we have a point selection, we only apply weights on selection
+    current = None
+    if pnt_selection and not bWasNotEnveloped:
+        current = wgt.getSparseFromArray(envelope_op.Weights.Array)
+
+    weights = wgt.getEnvelopeWeights(weights.copy(), mapping, len(envelope_names), pnt_selection, current)
+
+    envelope_op.Weights.Array = weights.getArray()
+
+    # Rebuilt Envelope to have the good deformers colors and warning
+    return rebuiltEnvelope(envelope_op)
+
 # AddStaticKineState =====================================
 ## Add a static kine state property to objects
 # @param objs List or Collection of X3DObject - Objects to create a StaticKineState property on.
@@ -209,31 +263,12 @@ def replaceDeformerInEnvelope(envelope_op, source_deformers, target_deformers, p
         deformer_index = getDeformerIndex(envelope_op, obj)
         target_index.append(deformer_index)
 
-    # Get Weights
-    mesh = envelope_op.Parent3DObject
-    point_count = mesh.ActivePrimitive.Geometry.Points.Count
-    deformer_count = envelope_op.Deformers.Count
-    weights_tuple = envelope_op.Weights.Array
-    weights = [weights_tuple[j][i] for i in range(len(weights_tuple[0])) for j in range(len(weights_tuple))]
-
     # Process
-    if points is None:
-        points = range(point_count)
-
-    for point_index in points:
-
-        point_weight = 0
-        for deformer_index in source_index:
-            point_weight += weights_tuple[deformer_index][point_index]
-            weights[point_index * deformer_count + deformer_index] = 0
-
-        if point_weight == 0:
-            continue
-
-        for deformer_index in target_index:
-            weights[point_index * deformer_count + deformer_index] += point_weight / len(target_index)
+    mesh = envelope_op.Parent3DObject
+    weights = wgt.getSparseFromArray(envelope_op.Weights.Array)
+    weights.replaceDeformers(source_index, target_index, points)
 
-    envelope_op.Weights.Array = weights
+    envelope_op.Weights.Array = weights.getArray()
 
     freezeEnvelope(envelope_op)
 
@@ -262,13 +297,9 @@ def replaceDeformerInEnvelope(envelope_op, source_deformers, target_deformers, p
 def removeEnvDeformer(envelope_op, obj):
 
     mesh = envelope_op.Parent3DObject
-    points = mesh.ActivePrimitive.Geometry.Points
-    point_count = points.Count
     deformers = envelope_op.Deformers
-    deformer_count = deformers.Count
     index = 0
-    weights_tuple = envelope_op.Weights.Array
-    weights = [weights_tuple[j][i] for i in range(len(weights_tuple[0])) for j in range(len(weights_tuple))]
+    weights = wgt.getSparseFromArray(envelope_op.Weights.Array)
     new_deformers = XSIFactory.CreateObject("XSI.Collection")
 
     # Process
@@ -278,15 +309,12 @@ def removeEnvDeformer(envelope_op, obj):
         else:
             new_deformers.add(deformer)
 
-    newWeight = []
-    for point_index in range(point_count):
-        newWeight.extend(weights[point_index*deformer_count : point_index*deformer_count+index])
-        newWeight.extend(weights[point_index*deformer_count+index+1 : point_index* deformer_count + deformer_count])
+    weights.removeDeformer(index)
 
     # Delete the old Envelope and add the new one with the new Deformers
     xsi.RemoveFlexEnv(mesh)
     envelope_op = mesh.ApplyEnvelope(new_deformers)
-    envelope_op.Weights.Array = newWeight
+    envelope_op.Weights.Array = weights.getArray()
 
     return envelope_op
 
@@ -300,127 +328,62 @@ def removeEnvDeformer(envelope_op, obj):
 # @return List of Integer - the list of unnormalized point index .
 def getUnnormalizedPoints(envelope_op, points=None, threshold=1E-6):
 
-    mesh = envelope_op.Parent3DObject
-    deformer_count = envelope_op.Deformers.Count
-    point_count = mesh.ActivePrimitive.Geometry.Points.Count
-    weights_tuple = envelope_op.Weights.Array
-
-    unNormPntId = []
-
-    if points is None:
-        points = range(point_count)
-
-    for point_index in points:
-
-        total_weight = 0
-        for deformer_index in range(deformer_count):
-            total_weight += weights_tuple[deformer_index][point_index]
+    weights = wgt.getSparseFromArray(envelope_op.Weights.Array)
 
-        if total_weight < (100 - threshold) or total_weight > (100 + threshold):
-            unNormPntId.append(point_index)
-
-    return unNormPntId
+    return weights.getUnnormalizedPoints(points, threshold)
 
 # normalizeWeights ======================================
+## Normalize the weights of given points.\n
+## Points without any weight get the weights of their closest weighted neighbors.
+# @param envelope_op Envelope Operator - the envelope operator.
+# @param points List of Integer - list of point index to normalize.
+# @return Boolean - False if some points couldn't be normalized.
 def normalizeWeights(envelope_op, points):
 
-    mesh = envelope_op.Parent3DObject
-    deformer_count = envelope_op.Deformers.Count
-    point_count = mesh.ActivePrimitive.Geometry.Points.Count
-    weights_tuple = envelope_op.Weights.Array
-    weights = [weights_tuple[j][i] for i in range(len(weights_tuple[0])) for j in range(len(weights_tuple))]
-
-    for point_index in points:
-
-        point_weights = weights[point_index*deformer_count:(point_index+1)*deformer_count]
-        total_weight = sum(point_weights)
-
-        if total_weight > 0:
-            point_weights = normalizeArray(point_weights)
-        else:
-            point_weights = normalizeToClosestPoint(envelope_op, weights, point_index)
-
-        if not point_weights:
-            gear.log("Unable to normalize " + envelope_op.FullName, gear.sev_warning)
-            return False
+    weights = wgt.getSparseFromArray(envelope_op.Weights.Array)
 
-        # rebuilt weights array
-        for deformer_index in range(deformer_count):
-            weights[point_index*deformer_count + deformer_index] = point_weights[deformer_index]
+    if not normalizePoints(envelope_op, weights, points):
+        return False
 
-    envelope_op.Weights.Array = weights
+    envelope_op.Weights.Array = weights.getArray()
 
     return True
 
-# normalizeToClosestPoint ===============================
-##
+# normalizePoints =======================================
+## Normalize the weights of given points in the sparse weights of the envelope.\n
+## Points without weight get the weights of their closest weighted vertices.
 # @param envelope_op Envelope Operator - the envelope operator.
-# @param weights List of float - The weights of the envelope. We pass it as an argument for speed purpose.
-# @param point_index Integer - Index of the point to normalize.
-# @return List of Float - The weight of the point.
-def normalizeToClosestPoint(envelope_op, weights, point_index):
-
-    mesh = envelope_op.Parent3DObject
-    deformer_count = envelope_op.Deformers.Count
-    point_count = mesh.ActivePrimitive.Geometry.Points.Count
-
-    vertex = mesh.ActivePrimitive.Geometry.Points(point_index)
-
-    point_weights = [0] * deformer_count
-
-    distance = 1
-    neighbor_count = vertex.NeighborVertices(1).Count
-
-    while neighbor_count < point_count - 1:
-
-        neighbor_vertices = vertex.NeighborVertices(distance)
-        neighbor_count = neighbor_vertices.Count
-
-        for neighbor_vertex in neighbor_vertices:
-             neighbor_index = neighbor_vertex.Index
-             for deformer_index in range(deformer_count):
-                point_weights[deformer_index] += (weights[ neighbor_index*deformer_count + deformer_index ]) / neighbor_vertices.Count
-
-        if sum(point_weights) != 0:
-            point_weights = normalizeArray(point_weights)
-            return point_weights
-
-        distance += 1
+# @param weights SparseWeights - the weights of the envelope.
+# @param points List of Integer - list of point index to normalize.
+# @return Boolean - False if some points couldn't be normalized.
+def normalizePoints(envelope_op, weights, points):
+
+    unweighted = weights.normalize(points)
+    if not unweighted:
+        return True
+
+    adjacency = topo.getVertexAdjacency(envelope_op.Parent3DObject)
+    if weights.fillUnweighted(adjacency, unweighted):
+        gear.log("Unable to normalize " + envelope_op.FullName + ", some points are not connected to any weighted point", gear.sev_warning)
+        return False
 
-    gear.log("Normalize to Closest Point aborded at distance "+ str(distance), c.siWarning)
-    return False
+    return True
 
 # NormalizeTdeformer ===================================
 ##
 def normalizeToDeformer(envelope_op, deformers, points=None, threshold=1E-6):
 
-    mesh = envelope_op.Parent3DObject
-    deformer_count = envelope_op.Deformers.Count
-    point_count = mesh.ActivePrimitive.Geometry.Points.Count
-    weights_tuple = envelope_op.Weights.Array
-    weights = [weights_tuple[j][i] for i in range(len(weights_tuple[0])) for j in range(len(weights_tuple))]
-
     # Get Deformers Index
     deformers_index = [getDeformerIndex(envelope_op, obj) for obj in deformers if isDeformer(envelope_op, obj)]
     if not deformers_index:
         gear.log("No deformers to add weights", gear.sev_error)
         return False
 
-    if points is None:
-        points = range(point_count)
-
-    for point_index in points:
-
-        total_weights = 0
-        for deformer_index, deformer in enumerate(envelope_op.Deformers):
-            total_weights += weights[point_index*deformer_count + deformer_index]
-
-        if total_weights < (100 - threshold):
-            for deformer_index in deformers_index:
-                weights[point_index*deformer_count + deformer_index] += (100 - total_weights) / len(deformers_index)
+    weights = wgt.getSparseFromArray(envelope_op.Weights.Array)
+    weights.normalizeToDeformers(deformers_index, points, threshold)
 
     # Apply new Weights
-    envelope_op.Weights.Array = weights
+    envelope_op.Weights.Array = weights.getArray()
 
     return True
 
@@ -447,46 +410,31 @@ def pruneWeights(envelope_op, points=None, threshold=.1, remove=False, showPBar=
 
     # Get weights array
     mesh = envelope_op.Parent3DObject
-    point_count = mesh.ActivePrimitive.Geometry.Points.Count
-    weights_tuple = envelope_op.Weights.Array
-    weights = [weights_tuple[j][i] for i in range(len(weights_tuple[0])) for j in range(len(weights_tuple))]
-
-    deformer_count = envelope_op.Deformers.Count
-    used_deformers = XSIFactory.CreateObject("XSI.Collection")
-    used_deformers.Unique = True
-
-    if points is None:
-        points = range(point_count)
+    weights = wgt.getSparseFromArray(envelope_op.Weights.Array)
 
     if showPBar:
-        pbar = uit.progressBar(len(points), 1, str(len(points)) + " points to prune on : "+mesh.Name, "0", False)
+        pbar = uit.progressBar(2, 1, "Prune weights on : "+mesh.Name, "Prune", False)
 
     # Prune Weights
-    pointsToNormalize = []
-    for point_index in points:
-
-        if showPBar:
-            pbar.StatusText = point_index
+    pointsToNormalize = weights.prune(threshold, points)
 
-        for deformer_index, deformer in enumerate(envelope_op.Deformers):
-
-            if weights[point_index*deformer_count + deformer_index] <= threshold:
-                weights[point_index*deformer_count + deformer_index] = 0
-                if not point_index in pointsToNormalize:
-                    pointsToNormalize.append(point_index)
-            else:
-                used_deformers.Add(deformer)
+    if showPBar:
+        pbar.Increment()
+        pbar.StatusText = "Normalize " + str(len(pointsToNormalize)) + " points"
 
-        if showPBar:
-            pbar.Increment()
+    # Normalize points
+    normalizePoints(envelope_op, weights, pointsToNormalize)
+    envelope_op.Weights.Array = weights.getArray()
+    freezeEnvelope(envelope_op)
 
     if showPBar:
         pbar.Visible = False
 
-    # Normalize points
-    envelope_op.Weights.Array = weights
-    normalizeWeights(envelope_op, pointsToNormalize)
-    freezeEnvelope(envelope_op)
+    used_deformers = XSIFactory.CreateObject("XSI.Collection")
+    used_deformers.Unique = True
+    deformers = envelope_op.Deformers
+    for deformer_index in weights.getUsedDeformers():
+        used_deformers.Add(deformers(deformer_index))
 
     # Rebuilt Envelope ------------------------------------------------
     # If True, we rebuilt the envelope a first time without the unused deformers
@@ -517,27 +465,22 @@ def pruneWeights(envelope_op, points=None, threshold=.1, remove=False, showPBar=
 # @param points List of Integer - list of point index to mirror.
 def averageMirrorWeights(envelope_op, points):
 
-    weights_tuple = envelope_op.Weights.Array
-    weights = [weights_tuple[j][i] for i in range(len(weights_tuple[0])) for j in range(len(weights_tuple))]
+    weights = wgt.getSparseFromArray(envelope_op.Weights.Array)
     deformers = envelope_op.Deformers
-    deformer_count = deformers.Count
+    deformer_names = deformers.GetAsText().split(",")
 
     # Get Mirror Deformer Index
-    mirror_deformers = [0] * deformer_count
+    mirror_deformers = range(deformers.Count)
     for deformer_index, deformer in enumerate(deformers):
 
         mirror_deformer = deformer.Model.FindChild(uti.convertRLName(deformer.Name))
-        if mirror_deformer and isDeformer(envelope_op, mirror_deformer):
-            mirror_deformers[deformer_index] = getDeformerIndex(envelope_op, mirror_deformer)
-        else:
-            mirror_deformers[deformer_index] = deformer_index
+        if mirror_deformer and mirror_deformer.FullName in deformer_names:
+            mirror_deformers[deformer_index] = deformer_names.index(mirror_deformer.FullName)
 
-  # Replace weights in weight array
-    for point_index in points:
-        for deformer_index in range(deformer_count):
-            weights[point_index*deformer_count + deformer_index] = (weights_tuple[deformer_index][point_index] + weights_tuple[mirror_deformers[deformer_index]][point_index]) * .5
+    # Replace weights in weight array
+    weights.averageMirror(mirror_deformers, points)
 
-    envelope_op.Weights.Array = weights
+    envelope_op.Weights.Array = weights.getArray()
 
 
 def createSymmetryMappingTemplate(in_deformers):
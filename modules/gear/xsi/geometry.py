@@ -30,6 +30,7 @@
 ##########################################################
 from gear.xsi import xsi, c, XSIFactory, dynDispatch
 import gear.xsi.utils as uti
+import gear.xsi.topology as topo
 
 
 ##########################################################
@@ -60,32 +61,17 @@ def getSymSubComponent(indexes, subcomponentType, mesh):
      # Polygon Cluster -------------------------
      elif subcomponentType == "polySubComponent":
 
+          topology = topo.getTopology(mesh)
+
           for polyIndex in indexes:
 
                 # Get Symmetrical Polygon Points
-                symPoints = []
-                for vertex in geometry.Polygons(polyIndex).Vertices:
-                     symPoints.append(symmetryArray[vertex.Index])
-
-                # Get symmetrical Polygons (Get too much polygons, we filter them right after)
-                aSymPolygons = []
-                for pointIndex in symPoints:
-                     for polygon in geometry.Vertices(pointIndex).NeighborPolygons(1):
-                          if polygon.Index not in aSymPolygons:
-                                aSymPolygons.append(polygon.Index)
-
-                # Find the good one (the one which all points belongs to the symmetrical array)
-                for polyIndex in aSymPolygons:
-                     polygon = geometry.Polygons(polyIndex)
-
-                     b = True
-                     for vertex in polygon.Vertices:
-                          if vertex.Index not in symPoints:
-                                b = False
-                                break
+                symPoints = [symmetryArray[i] for i in topology.getPolygonVertices(polyIndex)]
 
-                     if b:
-                          symIndexes.append(polyIndex)
+                # Find the polygon using all the symmetrical points
+                for symIndex in topology.getPolygonsFromVertices(symPoints):
+                     if len(topology.getPolygonVertices(symIndex)) == len(symPoints):
+                          symIndexes.append(symIndex)
 
      # Edge Cluster ----------------------------
      elif subcomponentType == "edgeSubComponent":
@@ -247,30 +233,8 @@ def mergeWithClusters(objects):
 # @return List of Polymesh
 def splitPolygonIsland(obj):
 
-    geometry = obj.ActivePrimitive.Geometry
-    polygons_indexes = range(geometry.Polygons.Count)
-
     islands = []
-    while polygons_indexes:
-
-        depth = 1
-        old_count = 0
-
-        while True:
-
-            polygon = geometry.Polygons(polygons_indexes[0])
-
-            neighbors = polygon.NeighborPolygons(depth)
-
-            if neighbors.Count == old_count:
-                island_indexes = [poly.Index for poly in neighbors]
-                island_indexes.append(polygon.Index)
-                for i in island_indexes:
-                    polygons_indexes.remove(i)
-                break
-
-            depth += 1
-            old_count = neighbors.Count
+    for island_indexes in topo.getPolygonIslands(obj):
 
         # Extract Polygons
         isle = xsi.ExtractFromComponents("ExtractPolygonsOp", obj.FullName+".poly"+str(island_indexes), obj.Name+"_island", None, c.siPersistentOperation, c.siKeepGenOpInputs)(0)(0)
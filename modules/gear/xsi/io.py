@@ -36,10 +36,13 @@ import xml.etree.cElementTree as etree
 # gear
 import gear
 import gear.xmldom as xmldom
+import gear.weights as wgt
+import gear.skinfile as skf
 
 from gear.xsi import xsi, c, dynDispatch
 import gear.xsi.xmldom as xsixmldom
 import gear.xsi.operator as ope
+import gear.xsi.envelope as env
 
 ##########################################################
 # IMPORT
@@ -47,6 +50,9 @@ import gear.xsi.operator as ope
 # ========================================================
 def importSkin(xml_obj, obj):
 
+    if isinstance(xml_obj, skf.SkinObject):
+        return importBinaryEnvelope(xml_obj, obj)
+
     xml_env = xmldom.findChildByAttribute(xml_obj, "primitive/stack/operator", "type", "envelopop")
     if not xml_env:
         gear.log("No envelope definition for %s"%xml_obj.get("name"), gear.sev_warning)
@@ -60,6 +66,9 @@ def importSkin(xml_obj, obj):
 # ========================================================
 def importEnvelope(xml_obj, obj, pnt_selection=None):
 
+    if isinstance(xml_obj, skf.SkinObject):
+        return importBinaryEnvelope(xml_obj, obj, pnt_selection)
+
     xml_env = xmldom.findChildByAttribute(xml_obj, "primitive/stack/operator", "type", "envelopop")
     if not xml_env:
         gear.log("No envelope definition for %s"%xml_obj.get("name"), gear.sev_warning)
@@ -70,6 +79,22 @@ def importEnvelope(xml_obj, obj, pnt_selection=None):
 
     return op
 
+# ========================================================
+## Import the envelope of an object from a binary skin file.\n
+## With a point selection, only the weights of the selected points are read from the file.
+# @param skin_obj SkinObject - The envelope definition.
+# @param obj X3DObject - The object to envelope.
+# @param pnt_selection List of Integer - Point indexes to import. None for all.
+# @return Envelope Operator
+def importBinaryEnvelope(skin_obj, obj, pnt_selection=None):
+
+    if pnt_selection:
+        weights = skin_obj.getPointsWeights(set(pnt_selection))
+    else:
+        weights = skin_obj.getWeights()
+
+    return env.applyEnvelopeWeights(obj, skin_obj.getDeformerNames(), weights, pnt_selection)
+
 ##########################################################
 # EXPORT
 ##########################################################
@@ -150,6 +175,29 @@ def exportEnvelope(path, objects, compression=False):
 
     return True
 
+# ========================================================
+## Export the envelope of objects to a binary skin file.
+# @param path String - Path to a file to save the binary file.
+# @param objects Collection or List of X3DObjects - objects to export.
+def exportBinarySkin(path, objects):
+
+    skin_objects = []
+    for obj in objects:
+
+        envelope_op = ope.getOperatorFromStack(obj, "envelopop")
+        if not envelope_op:
+            gear.log("%s has no envelope skipped"%obj.Name, gear.sev_warning)
+            continue
+
+        deformers = [(deformer.Model.Name, deformer.Name) for deformer in envelope_op.Deformers]
+        weights = wgt.getSparseFromArray(envelope_op.Weights.Array)
+
+        skin_objects.append((obj.Name, deformers, weights))
+
+    skf.writeSkin(path, skin_objects, getpass.getuser(), str(datetime.datetime.now()))
+
+    return True
+
 ##########################################################
 # MISC
 ##########################################################
@@ -157,20 +205,28 @@ def exportEnvelope(path, objects, compression=False):
 def getObjectItems(path):
 
     # -----------------------------------------------------
-    tree = etree.parse(path)
-    xml_doc = tree.getroot()
+    # Binary skin file
+    if skf.isSkinFile(path):
+
+        skin_file = skf.SkinFile(path)
+
+        items = ["-- Skip --", "0"]
+        for name in skin_file.names:
+            items.append(name)
+            items.append(name)
+
+        return items, skin_file.objects
 
     # -----------------------------------------------------
-    items = ["-- Skip --", "0"]
-    xml_objs = {}
-    for xml_obj in xml_doc.findall("x3dobject"):
+    # Only the position of the objects is read here, the definitions are parsed when requested
+    xml_objs = xmldom.indexChildren(path, "x3dobject")
 
-        name = xml_obj.get("name")
+    # -----------------------------------------------------
+    items = ["-- Skip --", "0"]
+    for name in xml_objs.keys():
         items.append(name)
         items.append(name)
 
-        xml_objs[name] = xml_obj
-
     return items, xml_objs
 
 # ========================================================
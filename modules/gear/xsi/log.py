@@ -57,6 +57,21 @@ def setCmdLog(b):
 
     return bLog
 
+# suspendLog =============================================
+## Turn off the command and message logs.
+# @return Tuple of Boolean - The original values, to give to restoreLog().
+def suspendLog():
+    return setCmdLog(False), setMsgLog(False)
+
+# restoreLog =============================================
+## Restore the command and message logs turned off by suspendLog().
+# @param values Tuple of Boolean - The values returned by suspendLog().
+def restoreLog(values):
+
+    cmd_log, msg_log = values
+    setCmdLog(cmd_log)
+    setMsgLog(msg_log)
+
 ##########################################################
 # LOG
 ##########################################################
@@ -30,6 +30,8 @@
 ##########################################################
 from gear.xsi import xsi, c, XSIFactory
 
+import gear.buffer as buf
+
 ##########################################################
 # XSI OPERATORS APPLY
 ##########################################################
@@ -55,3 +57,45 @@ def getOperatorFromStack(obj, opType, firstOnly=True):
           return operators
 
      return False
+
+##########################################################
+# SCRIPTED OPERATORS
+##########################################################
+# Maximum number of buffers kept
+CACHE_SIZE = 32
+
+# Output buffers of the scripted operators, by operator full name
+BUFFERS = {}
+BUFFERS_KEYS = []
+
+# ========================================================
+## Return the output buffer of a scripted operator, kept between its evaluations.\n
+## The buffers of the least recently evaluated operators are removed above CACHE_SIZE, the operators free their own buffer in their Term callback.
+# @param op Operator - The scripted operator, ctxt.Source in the Update callback.
+# @return PointBuffer
+def getPointBuffer(op):
+
+    key = op.FullName
+    if key in BUFFERS:
+        BUFFERS_KEYS.remove(key)
+        BUFFERS_KEYS.append(key)
+        return BUFFERS[key]
+
+    BUFFERS[key] = buf.PointBuffer()
+    BUFFERS_KEYS.append(key)
+
+    while len(BUFFERS_KEYS) > CACHE_SIZE:
+        del BUFFERS[BUFFERS_KEYS.pop(0)]
+
+    return BUFFERS[key]
+
+## Remove the buffers of the operators.
+# @param op Operator - The operator to remove. None to clear all the buffers.
+def clearPointBuffers(op=None):
+
+    if op is None:
+        BUFFERS.clear()
+        del BUFFERS_KEYS[:]
+    elif op.FullName in BUFFERS:
+        del BUFFERS[op.FullName]
+        BUFFERS_KEYS.remove(op.FullName)
@@ -28,8 +28,13 @@
 ##########################################################
 # GLOBAL
 ##########################################################
+import os
+
 from gear.xsi import xsi
 
+## Codes of the plugin files by path, with their modification time.
+CODES = {}
+
 ##########################################################
 # PLUGINS
 ##########################################################
@@ -81,3 +86,29 @@ def getPluginFullPath(name):
         return plugin.FileName
     else:
         return False
+
+# GetPluginCode ==========================================
+## Return the code of given plugin name. The file is only read again when it is modified.
+# @param name String - Plugin Name.
+# @return String - plugin code. False if plugin wasn't found.
+def getPluginCode(name):
+
+    path = getPluginFullPath(name)
+    if not path:
+        return False
+
+    mtime = os.stat(path).st_mtime
+
+    cached = CODES.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    f = open(path, "r")
+    try:
+        code = f.read()
+    finally:
+        f.close()
+
+    CODES[path] = (mtime, code)
+
+    return code
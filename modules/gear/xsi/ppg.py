@@ -29,8 +29,17 @@
 # GLOBAL
 ##########################################################
 import types
+import hashlib
 
-from gear.xsi import xsi, c
+import gear
+
+from gear.xsi import xsi, c, Application, XSIFactory, XSIMath, XSIUtils
+
+## Name of the gear_PSet parameter storing the hash of the layout code.
+LAYOUT_HASH_NAME = "layout_hash"
+
+## Compiled layout codes of gear_PSet by hash.
+LAYOUTS = {}
 
 ##########################################################
 # PPG LAYOUT
@@ -130,28 +139,31 @@ class PPGLayout(object):
             return tab.getItems()
 
     # -----------------------------------------------------
-    ## Return the layout code as a string. Code is in Python.
+    ## Return the layout code as a string. Code is in Python.\n
+    ## The code is written in one list and joined, calling it again returns the same code.
     # @param self
     # @return String - The layout.
     def getValue(self):
 
+        lines = []
+
         # Before code
         for code in self.beforeCode:
-            self.value += code + "\r\n"
+            lines.append(code + "\r\n")
 
-        self.value += "\r\n"
+        lines.append("\r\n")
 
         # Layout
         for index in self.tabIndex:
-            tab = self.tabs[index]
-            self.value += tab.getValue()
+            self.tabs[index].writeValue(lines)
 
-        self.value += "\r\n"
+        lines.append("\r\n")
 
         # After code
         for code in self.afterCode:
-            self.value += code + "\r\n"
+            lines.append(code + "\r\n")
 
+        self.value = "".join(lines)
 
         return self.value
 
@@ -194,6 +206,26 @@ class LayoutComponent(object):
     def addCondition(self, condition):
         self.condition = condition
 
+    # -----------------------------------------------------
+    ## Return the layout code as a string. Code is in Python.
+    # @param self
+    # @return String - The layout.
+    def getValue(self):
+
+        lines = []
+        self.writeValue(lines)
+
+        return "".join(lines)
+
+    # -----------------------------------------------------
+    ## Write the layout code of the item.\n
+    # REIMPLEMENT.
+    # @param self
+    # @param lines List of String - The code is appended to this list.
+    # @param tabulation String - Indentation of the code.
+    def writeValue(self, lines, tabulation=""):
+        return
+
     # -----------------------------------------------------
     ## Make sure that all string in the list are in ascii and not unicode.
     # @param self
@@ -424,38 +456,37 @@ class LayoutCompound(LayoutComponent):
         return string
 
     # -----------------------------------------------------
-    ## Return the layout code as a string. Code is in Python.
+    ## Write the layout code of the compound and of its items.
     # @param self
-    # @return String - The layout.
-    def getValue(self):
+    # @param lines List of String - The code is appended to this list.
+    # @param tabulation String - Indentation of the code.
+    def writeValue(self, lines, tabulation=""):
 
         if not self.items:
-            return ""
-        else:
+            return
 
-            value = ""
-            if self.codeBefore is not None:
-                value += self.codeBefore
+        if self.codeBefore is not None:
+            lines.append(indentCode(self.codeBefore, tabulation))
 
-            tabulation = ""
-            if self.condition is not None:
-                value += "if "+self.condition+":\r\n"
-                tabulation = "    "
+        if self.condition is not None:
+            lines.append(tabulation + "if "+self.condition+":\r\n")
+            tabulation += "    "
 
-            self.args = self.convertToAscii(self.args)
-            args = self.getAsString(self.args)
-            value += tabulation + "layout." + self.prefixMethod + "(" + args + ")\r\n"
+        self.args = self.convertToAscii(self.args)
+        args = self.getAsString(self.args)
+        lines.append(tabulation + "layout." + self.prefixMethod + "(" + args + ")\r\n")
 
-            for item in self.items:
-                value += tabulation + item.getValue()
+        for item in self.items:
+            item.writeValue(lines, tabulation)
 
-            if self.suffixMethod:
-                value += tabulation + "layout." + self.suffixMethod + "()\r\n"
+        if self.suffixMethod:
+            lines.append(tabulation + "layout." + self.suffixMethod + "()\r\n")
 
-            if self.codeAfter is not None:
-                value += self.codeAfter
+        if self.condition is not None:
+            tabulation = tabulation[:-4]
 
-            return value
+        if self.codeAfter is not None:
+            lines.append(indentCode(self.codeAfter, tabulation))
 
 # ========================================================
 ## Tab class
@@ -534,34 +565,31 @@ class LayoutItem(LayoutComponent):
         self.attributes.append([siPPGItemAttribute, variant])
 
     # -----------------------------------------------------
-    ## Return the layout code as a string. Code is in Python.
+    ## Write the layout code of the item.
     # @param self
-    # @return String - The layout.
-    def getValue(self):
+    # @param lines List of String - The code is appended to this list.
+    # @param tabulation String - Indentation of the code.
+    def writeValue(self, lines, tabulation=""):
 
-        value = ""
         if self.codeBefore is not None:
-            value += self.codeBefore
-
-        tabulation = ""
+            lines.append(indentCode(self.codeBefore, tabulation))
 
+        item_tabulation = tabulation
         if self.condition is not None:
-            value += "if "+self.condition+":\r\n"
-            tabulation = "    "
+            lines.append(tabulation + "if "+self.condition+":\r\n")
+            item_tabulation += "    "
 
         self.args = self.convertToAscii(self.args)
         args = self.getAsString(self.args)
-        value += tabulation + "item = layout." + self.methodName + "(" + args + ")\r\n"
+        lines.append(item_tabulation + "item = layout." + self.methodName + "(" + args + ")\r\n")
 
         for attribute in self.attributes:
             att = self.convertToAscii(attribute)
             att = self.getAsString(att)
-            value += tabulation + "item.SetAttribute(" + att + ")\r\n"
+            lines.append(item_tabulation + "item.SetAttribute(" + att + ")\r\n")
 
         if self.codeAfter is not None:
-            value += self.codeAfter
-
-        return value
+            lines.append(indentCode(self.codeAfter, tabulation))
 
 # ========================================================
 ## Item class
@@ -712,15 +740,38 @@ class PPGLogic:
         self.methods = []
         self.value = ""
 
+        # Global code already added
+        self.globalCodeSet = set()
+
         self.refresh_method = self.propType+"_OnInit()"
 
     # -----------------------------------------------------
-    ## Add Global code to the logic. For example to import modules. Code must be in Python.
+    ## Add Global code to the logic. For example to import modules. Code must be in Python.\n
+    ## A code already added isn't added again.
     # @param self
     # @param code String.
     def addGlobalCode(self, code):
+
+        if code in self.globalCodeSet:
+            return
+
+        self.globalCodeSet.add(code)
         self.globalCode.append(code)
 
+    # -----------------------------------------------------
+    ## Add the code of another logic, as global code.\n
+    ## Each global code of the other logic is added once, so the imports shared by components are merged.
+    # @param self
+    # @param logic PPGLogic.
+    def merge(self, logic):
+
+        for code in logic.globalCode:
+            self.addGlobalCode(code)
+
+        methods = logic.getMethodsValue()
+        if methods:
+            self.addGlobalCode(methods)
+
     # -----------------------------------------------------
     ## Add a method to the logic. Code must be in Python.
     # @param self
@@ -753,16 +804,126 @@ class PPGLogic:
         self.methods.append([paramName+"_OnChanged", self.propType+"_OnInit()"])
 
     # -----------------------------------------------------
-    ## Return the logic code as a string. Code is in Python.
+    ## Return the logic code as a string. Code is in Python.\n
+    ## The code is written in one list and joined, calling it again returns the same code.
     # @param self
     # @return String - The logic.
     def getValue(self):
 
+        lines = []
         for code in self.globalCode:
-            self.value += code+"\r\n\r\n"
+            lines.append(code+"\r\n\r\n")
 
-        for method in self.methods:
-            code = method[1].replace("\n", "\n    ")
-            self.value += "def "+self.propType+"_"+method[0]+"():\r\n    "+method[1].replace("\r\n", "\r\n    ")+"\r\n\r\n"
+        lines.append(self.getMethodsValue())
+
+        self.value = "".join(lines)
 
         return self.value
+
+    # -----------------------------------------------------
+    ## Return the code of the methods as a string.
+    # @param self
+    # @return String - The methods.
+    def getMethodsValue(self):
+
+        lines = []
+        for method in self.methods:
+            lines.append("def "+self.propType+"_"+method[0]+"():\r\n    "+method[1].replace("\r\n", "\r\n    ")+"\r\n\r\n")
+
+        return "".join(lines)
+
+##########################################################
+# PSET CODE
+##########################################################
+# ========================================================
+## Set the layout and logic code of a gear_PSet, with the hash of the layout.
+# @param prop Property - The gear_PSet.
+# @param layout_code String - Layout code.
+# @param logic_code String - Logic code. None to keep the current logic.
+def setPSetCode(prop, layout_code, logic_code=None):
+
+    prop.Parameters("layout").Value = layout_code
+    if logic_code is not None:
+        prop.Parameters("logic").Value = logic_code
+
+    setLayoutHash(prop, layout_code)
+
+## Store the hash of the layout code on a gear_PSet. The parameter is created on older properties.
+# @param prop Property - The gear_PSet.
+# @param layout_code String - Layout code.
+def setLayoutHash(prop, layout_code):
+
+    param = prop.Parameters(LAYOUT_HASH_NAME)
+    if not param:
+        param = prop.AddParameter3(LAYOUT_HASH_NAME, c.siString, "", None, None, False, False)
+
+    param.Value = getCodeHash(layout_code)
+
+## Return the hash of a code.
+# @param code String
+# @return String
+def getCodeHash(code):
+
+    if isinstance(code, unicode):
+        code = code.encode("utf-8")
+
+    return hashlib.md5(code).hexdigest()
+
+## Return the hash of the layout code of a gear_PSet.\n
+## The hash is always computed from the current layout code, so an edited layout is never drawn from an older compiled code.
+# @param prop Property - The gear_PSet.
+# @return String
+def getLayoutHash(prop):
+    return getCodeHash(prop.Parameters("layout").Value)
+
+## Return the compiled layout code of a gear_PSet.\n
+## The layout code is only read and compiled the first time a hash is met.
+# @param prop Property - The gear_PSet.
+# @param key String - Hash of the layout code. Computed if None.
+# @return Code
+def getCompiledLayout(prop, key=None):
+
+    if key is None:
+        key = getLayoutHash(prop)
+
+    if key not in LAYOUTS:
+        code = prop.Parameters("layout").Value.replace("\r\n", "\n")
+        LAYOUTS[key] = compile(code+"\n", "<"+prop.FullName+" layout>", "exec")
+
+    return LAYOUTS[key]
+
+## Draw the layout code of a gear_PSet on its PPGLayout.\n
+## The code runs with the names available to the layout code of the plugin: layout, PPG, prop, Application (xsi), c, XSIFactory, XSIMath, XSIUtils and gear.
+# @param prop Property - The gear_PSet.
+# @param layout PPGLayout - The layout to draw.
+# @param PPG PPG - The PPG of the property.
+# @param key String - Hash of the layout code. Computed if None.
+def readLayout(prop, layout, PPG, key=None):
+
+    code = getCompiledLayout(prop, key)
+
+    namespace = {"layout":layout, "PPG":PPG, "prop":prop,
+                 "Application":Application, "xsi":xsi, "c":c,
+                 "XSIFactory":XSIFactory, "XSIMath":XSIMath, "XSIUtils":XSIUtils,
+                 "gear":gear}
+
+    exec code in namespace
+
+## Remove the compiled layouts from the cache.
+def clearCache():
+    LAYOUTS.clear()
+
+##########################################################
+# TOOLS
+##########################################################
+# ========================================================
+## Indent a code.
+# @param code String - The code, ending with a new line.
+# @param tabulation String - Indentation.
+# @return String - The indented code.
+def indentCode(code, tabulation):
+
+    if not tabulation:
+        return code
+
+    return tabulation + code.rstrip("\r\n").replace("\n", "\n" + tabulation) + "\r\n"
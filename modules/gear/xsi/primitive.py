@@ -40,6 +40,7 @@ import gear.xsi.xmldom as xsixmldom
 import gear.xsi.curve as cur
 import gear.xsi.parameter as par
 import gear.xsi.geometry as geo
+import gear.xsi.registry as reg
 
 ##########################################################
 #
@@ -71,6 +72,7 @@ def generateFromXml(parent, name, xml_def, color):
 def addNull(parent, name, t=XSIMath.CreateTransform(), size=1, color=[0,0,0]):
 
     null = parent.AddNull(name)
+    reg.register(null)
 
     null.Parameters("Size").Value = max(size, .01)
     null.Kinematics.Global.Transform = t
@@ -147,6 +149,7 @@ def drawAxis(parent=xsi.ActiveSceneRoot, size=1):
 def addImplicite(parent, preset, name, t=XSIMath.CreateTransform(), size=1):
 
     implicite = parent.AddPrimitive(preset, name)
+    reg.register(implicite)
 
     implicite.Parameters("length").Value = max(size, .01)
     implicite.Kinematics.Global.Transform = t
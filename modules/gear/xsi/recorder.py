@@ -0,0 +1,2434 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+## @package gear.xsi.recorder
+# @author Jeremie Passerin
+#
+# @brief recording backend for the dry run of the rig builder.
+#
+# The recorder is a small scene object model that answers the calls of the rig builder the way
+# Softimage does, without creating anything. The Recorder swaps it for xsi, XSIFactory, XSIUIToolkit
+# and XSIUtils in the gear modules, and the BuildPlan lists what the build would have created.\n
+# The same object model is the scene of the stand-in backend, see gear.xsi.standin. Polygon meshes,
+# clusters, cluster properties and envelopes keep their data for the envelope tools.\n
+# The transforms are computed with XSIMath, the constants are the ones of gear.xsi.\n
+# Attribute access is case insensitive, as with COM. Unknown attributes are parameters, created on
+# first access, and unknown methods are recorded as commands.
+
+##########################################################
+# GLOBAL
+##########################################################
+# Built-in
+import os
+import sys
+import json
+import math
+import fnmatch
+import datetime
+
+# gear
+import gear
+
+## Module globals replaced by the recorder.
+GLOBALS = ["xsi", "Application", "XSIFactory", "XSIUIToolkit", "XSIUtils", "Dispatch", "dynDispatch"]
+
+## Properties that every object has, created on first access.
+DEFAULT_PROPERTIES = ["visibility", "display", "kinematic chain", "kinematic joint", "geomapprox"]
+
+## Property names of the presets.
+PRESET_NAMES = {"display property":"display", "geomapprox":"geomapprox", "customproperty":"CustomProperty"}
+
+## Property types with custom parameters only.
+CUSTOM_PROPERTIES = ["gear_pset", "customproperty", "customparamset"]
+
+## Object types of the primitive presets.
+PRIMITIVE_TYPES = {"null":"null", "bone":"bone", "cone":"cone", "cylinder":"cylinder", "disc":"disc", "sphere":"sphere", "cube":"cube"}
+
+## Number of decimals of the values in the build plan.
+DECIMALS = 6
+
+## Names of the construction markers of a primitive stack, by marker type.
+MARKERS = [("modelingmarker", "Modeling"), ("shapemarker", "Shape Modeling"), ("animationmarker", "Animation"), ("secondaryshapemarker", "Secondary Shape Modeling")]
+
+# Canonical attribute names by class, by lower case name
+CANONICAL_NAMES = {}
+
+## Return the XSIMath of the current backend.
+# @return XSIMath
+def getMath():
+    return sys.modules["gear.xsi"].XSIMath
+
+## Return the constants of the current backend.
+# @return constants
+def getConstants():
+    return sys.modules["gear.xsi"].c
+
+## Return the canonical name of an attribute of a class, as COM does for any case.
+# @param cls Class
+# @param name String - Attribute name, in any case.
+# @return String - None if the class doesn't have the attribute.
+def getCanonicalName(cls, name):
+
+    if cls not in CANONICAL_NAMES:
+        names = {}
+        for attr in dir(cls) + list(cls.fields):
+            if attr[0].isupper():
+                names[attr.lower()] = attr
+        CANONICAL_NAMES[cls] = names
+
+    return CANONICAL_NAMES[cls].get(name.lower())
+
+## Return the items of a collection, a list, a single item or a comma separated string of names.
+# @param application Application
+# @param value Variant
+# @return List of Item
+def getItems(application, value):
+
+    if value is None:
+        return []
+    if isinstance(value, basestring):
+        items = [application.Dictionary.GetObject(name.strip(), False) for name in value.replace(";", ",").split(",") if name.strip()]
+        return [item for item in items if item is not None]
+    if isinstance(value, (list, tuple, Collection)):
+        items = []
+        for item in value:
+            items.extend(getItems(application, item))
+        return items
+
+    return [value]
+
+## Remove objects from the groups of a model and of its parent models.
+# @param model Model - Model of the objects.
+# @param objects List of X3DObject
+def removeGroupMembers(model, objects):
+
+    ids = set([id(obj) for obj in objects])
+    while model is not None:
+        for group in model._groups:
+            group.__dict__["_members"] = [item for item in group._members if id(item) not in ids]
+
+        model = model._parent is not None and model._parent.Model or None
+
+## Return the siVariantType of a value.
+# @param value Variant
+# @return Integer - siEmpty for the values that aren't numbers or strings.
+def getValueType(value):
+
+    c = getConstants()
+    if isinstance(value, bool):
+        return c.siBool
+    if isinstance(value, (int, long)):
+        return c.siInt4
+    if isinstance(value, float):
+        return c.siDouble
+    if isinstance(value, basestring):
+        return c.siString
+
+    return c.siEmpty
+
+## Return a copy of a transformation.
+# @param t SITransformation
+# @return SITransformation
+def copyTransform(t):
+
+    out = getMath().CreateTransform()
+    out.SetMatrix4(t.Matrix4)
+
+    return out
+
+## Return the points and polygons of a mesh preset, with the default size of Softimage.\n
+## Grid, Sphere and Cylinder are built on the default subdivisions, the other presets are cubes.
+# @param preset String - Preset name, as in AddGeometry().
+# @return Tuple - List of point positions and list of polygons (vertex indexes).
+def getMeshPreset(preset):
+
+    preset = preset.lower()
+
+    # Grid : 8 by 8 units in xz, 8 subdivisions
+    if preset == "grid":
+        count = 8
+        positions = [(-4.0 + 8.0 * u / count, 0.0, -4.0 + 8.0 * v / count) for v in xrange(count + 1) for u in xrange(count + 1)]
+        polygons = [(v*(count+1)+u, (v+1)*(count+1)+u, (v+1)*(count+1)+u+1, v*(count+1)+u+1) for v in xrange(count) for u in xrange(count)]
+        return positions, polygons
+
+    # Sphere and Cylinder : rings of 8 points, closed by poles or caps
+    if preset in ["sphere", "cylinder"]:
+        count = 8
+        if preset == "sphere":
+            rings = [(math.sin(math.pi * i / count) * 4, math.cos(math.pi * i / count) * 4) for i in xrange(1, count)]
+            top, bottom = 4.0, -4.0
+        else:
+            rings = [(1.0, 2.0), (1.0, -2.0)]
+            top, bottom = 2.0, -2.0
+
+        positions = [(0.0, top, 0.0)]
+        for radius, y in rings:
+            positions.extend([(radius * math.sin(2 * math.pi * j / count), y, radius * math.cos(2 * math.pi * j / count)) for j in xrange(count)])
+        positions.append((0.0, bottom, 0.0))
+
+        last = len(positions) - 1
+        polygons = [(0, 1 + j, 1 + (j + 1) % count) for j in xrange(count)]
+        for i in xrange(len(rings) - 1):
+            start = 1 + i * count
+            polygons.extend([(start + j, start + count + j, start + count + (j + 1) % count, start + (j + 1) % count) for j in xrange(count)])
+        start = 1 + (len(rings) - 1) * count
+        polygons.extend([(last, start + (j + 1) % count, start + j) for j in xrange(count)])
+
+        return positions, polygons
+
+    # Cube : 8 units
+    positions = [(x, y, z) for z in (-4.0, 4.0) for y in (-4.0, 4.0) for x in (-4.0, 4.0)]
+    polygons = [(0, 2, 3, 1), (4, 5, 7, 6), (0, 1, 5, 4), (2, 6, 7, 3), (0, 4, 6, 2), (1, 3, 7, 5)]
+
+    return positions, polygons
+
+##########################################################
+# COLLECTION
+##########################################################
+# ========================================================
+## XSICollection stand-in.
+class Collection(object):
+
+    fields = ()
+
+    ## Init Method.
+    # @param self
+    # @param items List of Item
+    # @param application Application - Used to resolve the names added to the collection.
+    def __init__(self, items=None, application=None):
+        self.items = list(items or [])
+        self.application = application
+        self.Unique = False
+
+    def __getattr__(self, name):
+
+        canonical = getCanonicalName(type(self), name)
+        if name.startswith("_") or canonical is None or canonical == name:
+            raise AttributeError(name)
+
+        return getattr(self, canonical)
+
+    def __iter__(self):
+        return iter(list(self.items))
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.Item(index)
+
+    def __call__(self, index):
+        return self.Item(index)
+
+    def Item(self, index):
+
+        if isinstance(index, basestring):
+            for item in self.items:
+                if item.Name.lower() == index.lower():
+                    return item
+            return None
+
+        return self.items[index]
+
+    def getCount(self):
+        return len(self.items)
+
+    Count = property(getCount)
+
+    def Add(self, item):
+
+        for item in getItems(self.application or APPLICATION, item):
+            if not self.Unique or item not in self.items:
+                self.items.append(item)
+
+    def AddItems(self, items):
+        self.Add(items)
+
+    def Remove(self, item):
+        if item in self.items:
+            self.items.remove(item)
+
+    def RemoveItems(self, items):
+        for item in getItems(self.application or APPLICATION, items):
+            self.Remove(item)
+
+    def RemoveAll(self):
+        self.items = []
+
+    def GetAsText(self):
+        return ",".join([item.FullName for item in self.items])
+
+    def SetAsText(self, text):
+        self.items = getItems(self.application or APPLICATION, text)
+
+    def Filter(self, type=None, families=None, path=None):
+        if type is None:
+            return Collection(self.items)
+        return Collection([item for item in self.items if item.Type == type])
+
+    ## Return the keyable parameters of the local kinematics of the items.
+    def FindObjectsByMarkingAndCapabilities(self, marking=None, capabilities=None):
+
+        params = Collection()
+        for item in self.items:
+            if not isinstance(item, X3DObject):
+                continue
+            local = item.Kinematics.Local
+            params.items.extend([param for param in local.getParameters() if param.Keyable])
+
+        return params
+
+##########################################################
+# ITEMS
+##########################################################
+# ========================================================
+## Base of the recorded objects.\n
+## Unknown attributes are parameters created on first access. Setting one sets the parameter value.
+class Item(object):
+
+    ## Attributes of the instances, added to the canonical names of the class.
+    fields = ()
+
+    ## Init Method.
+    # @param self
+    # @param application Application
+    # @param name String
+    # @param type String
+    # @param parent Item
+    def __init__(self, application, name, type, parent=None):
+
+        self.__dict__["_application"] = application
+        self.__dict__["_name"] = name
+        self.__dict__["_type"] = type
+        self.__dict__["_parent"] = parent
+        self.__dict__["_parameters"] = {}
+        self.__dict__["_parameterOrder"] = []
+
+    def __getattr__(self, name):
+
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        canonical = getCanonicalName(type(self), name)
+        if canonical and canonical != name:
+            return getattr(self, canonical)
+
+        return self.getParameter(name)
+
+    def __setattr__(self, name, value):
+
+        canonical = getCanonicalName(type(self), name)
+        if name.startswith("_") or canonical or name in self.__dict__:
+            object.__setattr__(self, canonical or name, value)
+        else:
+            self.getParameter(name).Value = value
+
+    def __str__(self):
+        return self.FullName
+
+    def __repr__(self):
+        return "<%s %s>"%(type(self).__name__, self.FullName)
+
+    # Names -----------------------------------------------
+    def getName(self):
+        return self._name
+
+    def setName(self, name):
+        self.__dict__["_name"] = name
+
+    def getFullName(self):
+
+        if self._parent is None:
+            return self._name
+
+        return self._parent.FullName + "." + self._name
+
+    Name = property(lambda self: self.getName(), lambda self, name: self.setName(name))
+    FullName = property(lambda self: self.getFullName())
+    Type = property(lambda self: self._type)
+    Parent = property(lambda self: self._parent)
+    Application = property(lambda self: self._application)
+
+    def getParent3DObject(self):
+
+        item = self
+        while item is not None and not isinstance(item, X3DObject):
+            item = item._parent
+
+        return item
+
+    Parent3DObject = property(getParent3DObject)
+    Model = property(lambda self: self.Parent3DObject and self.Parent3DObject.Model)
+    ObjectID = property(lambda self: id(self))
+
+    def IsEqualTo(self, item):
+        return item is self
+
+    def IsClassOf(self, class_id):
+        return True
+
+    def IsKindOf(self, kind):
+        return True
+
+    def IsSelected(self):
+        return self in self._application.Selection.items
+
+    ## True if the parameters of the item are all added by the build.
+    def isCustom(self):
+        return False
+
+    # Parameters ------------------------------------------
+    ## Return a parameter, created on first access.
+    # @param self
+    # @param name String - Script name of the parameter.
+    # @param create Boolean - False to return None for a missing parameter.
+    # @return Parameter
+    def getParameter(self, name, create=True):
+
+        key = name.lower()
+        if key not in self._parameters:
+            if not create:
+                return None
+            self.addParameter(Parameter(self._application, name, self))
+
+        return self._parameters[key]
+
+    ## Add a parameter.
+    # @param self
+    # @param param Parameter
+    # @return Parameter
+    def addParameter(self, param):
+
+        key = param.ScriptName.lower()
+        if key not in self._parameters:
+            self._parameterOrder.append(key)
+        self._parameters[key] = param
+
+        return param
+
+    ## Return the parameters created so far.
+    # @param self
+    # @return List of Parameter
+    def getParameters(self):
+        return [self._parameters[key] for key in self._parameterOrder]
+
+    def getParameterCollection(self):
+        return ParameterCollection(self)
+
+    Parameters = property(getParameterCollection)
+
+    def GetParameterValue(self, name):
+        return self.getParameter(name).Value
+
+    def SetParameterValue(self, name, value):
+        self.getParameter(name).Value = value
+
+## Parameters of an item, callable by name.
+class ParameterCollection(Collection):
+
+    def __init__(self, item):
+        Collection.__init__(self, item.getParameters())
+        self.item = item
+
+    def Item(self, index):
+
+        if isinstance(index, basestring):
+            return self.item.getParameter(index, not self.item.isCustom())
+
+        return self.items[index]
+
+# ========================================================
+## Parameter stand-in.\n
+## Calling a parameter records a command, so unknown methods of an item are recorded.
+class Parameter(Item):
+
+    fields = ("Value", "Keyable", "Animatable", "ReadOnly", "Capabilities", "ValueType", "Min", "Max", "SuggestedMin", "SuggestedMax", "Description")
+
+    ## Init Method.
+    # @param self
+    # @param application Application
+    # @param scriptName String
+    # @param parent Item
+    # @param value Variant
+    # @param valueType Integer - siVariantType.
+    # @param added Boolean - True for the parameters added by the build.
+    def __init__(self, application, scriptName, parent, value=0, valueType=None, added=False):
+
+        Item.__init__(self, application, scriptName, "Parameter", parent)
+
+        self.__dict__["_value"] = value
+        self.__dict__["_added"] = added
+        self.__dict__["_set"] = False
+        self.__dict__["_source"] = None
+        self.__dict__["_lock"] = None
+
+        self.Keyable = False
+        self.Animatable = True
+        self.ReadOnly = False
+        self.Capabilities = 0
+        self.ValueType = valueType is None and getValueType(value) or valueType
+        self.Min = None
+        self.Max = None
+        self.SuggestedMin = None
+        self.SuggestedMax = None
+        self.Description = ""
+
+    def __call__(self, *args):
+
+        self._application.record(self.FullName, args)
+
+        return Item(self._application, self._name, "Output")
+
+    def getValue(self):
+        return self._value
+
+    def setValue(self, value):
+        self.__dict__["_value"] = value
+        self.__dict__["_set"] = True
+
+    Value = property(lambda self: self.getValue(), lambda self, value: self.setValue(value))
+    ScriptName = property(lambda self: self._name)
+    Source = property(lambda self: self._source)
+
+    ## True if the build added or set the parameter.
+    def isRecorded(self):
+        return self._added or self._set or self._source is not None
+
+    def AddExpression(self, definition):
+
+        expression = Expression(self._application, self, str(definition))
+        self.__dict__["_source"] = expression
+
+        return expression
+
+    def AddFCurve(self, type=None, interpolation=None, extrapolation=None):
+
+        fcurve = FCurve(self._application, self)
+        self.__dict__["_source"] = fcurve
+
+        return fcurve
+
+    def Disconnect(self):
+        self.__dict__["_source"] = None
+
+    def IsAnimated(self, source=None):
+
+        if self._source is None:
+            return False
+
+        c = getConstants()
+        if source == c.siExpressionSource:
+            return isinstance(self._source, Expression)
+        if source == c.siFCurveSource:
+            return isinstance(self._source, FCurve)
+        if source == c.siConstraintSource:
+            return False
+
+        return True
+
+    def SetLock(self, level=None, owner=None):
+        self.__dict__["_lock"] = level
+
+    def UnSetLock(self, level=None, owner=None):
+        self.__dict__["_lock"] = None
+
+    def SetCapabilityFlag(self, flag, value):
+
+        if value:
+            self.Capabilities |= flag
+        else:
+            self.Capabilities &= ~flag
+
+## Parameter of a transformation, the value is read and written in the transformation of a kinematic state.
+class TransformParameter(Parameter):
+
+    ## Transformation attribute and factor by script name.
+    attributes = {"posx":"PosX", "posy":"PosY", "posz":"PosZ",
+                  "rotx":"RotX", "roty":"RotY", "rotz":"RotZ",
+                  "sclx":"SclX", "scly":"SclY", "sclz":"SclZ"}
+
+    def getValue(self):
+
+        key = self._name.lower()
+        t = self._parent.Transform
+        if key in self.attributes:
+            return getattr(t, self.attributes[key])
+
+        q = t.Rotation.Quaternion
+        return getattr(q, key[-1].upper())
+
+    def setValue(self, value):
+
+        key = self._name.lower()
+        if key not in self.attributes:
+            return
+
+        t = self._parent.Transform
+        setattr(t, self.attributes[key], value)
+        self._parent.Transform = t
+
+## Expression on a parameter.
+class Expression(Item):
+
+    def __init__(self, application, param, definition):
+
+        Item.__init__(self, application, "Expression", "Expression", param)
+        self.getParameter("Definition").Value = definition
+
+    Definition = property(lambda self: self.getParameter("Definition").Value)
+
+## FCurve key.
+class FCurveKey(object):
+
+    def __init__(self, fcurve, time, value, interpolation):
+
+        self.FCurve = fcurve
+        self.Time = float(time)
+        self.Value = float(value)
+        self.LeftTanX = None
+        self.LeftTanY = None
+        self.RightTanX = None
+        self.RightTanY = None
+        self.Interpolation = interpolation
+
+    Index = property(lambda self: self.FCurve.keys.index(self))
+
+## FCurve stand-in, the value of an fcurve parameter.
+class FCurve(Item):
+
+    fields = ("Interpolation", "Extrapolation", "SI3DStyle")
+
+    def __init__(self, application, param):
+
+        Item.__init__(self, application, "FCurve", "FCurve", param)
+        self.__dict__["keys"] = []
+
+        self.Interpolation = 3
+        self.Extrapolation = 1
+        self.SI3DStyle = False
+
+    def __str__(self):
+        return "FCurve"
+
+    Keys = property(lambda self: Collection(self.keys))
+
+    def BeginEdit(self):
+        pass
+
+    def EndEdit(self):
+        pass
+
+    def RemoveKeys(self, start=None, end=None):
+        self.__dict__["keys"] = []
+
+    def AddKey(self, time, value, interpolation=None, *args):
+
+        key = self.GetKey(time, 0)
+        if key is None:
+            key = FCurveKey(self, time, value, interpolation or self.Interpolation)
+            self.keys.append(key)
+            self.keys.sort(key=lambda k: k.Time)
+        else:
+            key.Value = float(value)
+
+        return key
+
+    def GetKey(self, time, tolerance=0):
+
+        for key in self.keys:
+            if abs(key.Time - time) <= tolerance:
+                return key
+
+        return None
+
+    def GetKeyAtIndex(self, index):
+        return self.keys[index]
+
+    ## Evaluate the fcurve. Keys without tangents get tangents from their neighbors.
+    # @param self
+    # @param time Double
+    # @return Double
+    def Eval(self, time):
+
+        keys = self.keys
+        if not keys:
+            return 0.0
+        if time <= keys[0].Time:
+            return keys[0].Value
+        if time >= keys[-1].Time:
+            return keys[-1].Value
+
+        i = 0
+        while keys[i+1].Time < time:
+            i += 1
+        k0, k1 = keys[i], keys[i+1]
+
+        if k0.Interpolation == 1:
+            return k0.Value
+        ratio = (time - k0.Time) / (k1.Time - k0.Time)
+        if k0.Interpolation == 2:
+            return k0.Value + (k1.Value - k0.Value) * ratio
+
+        # Cubic bezier segment, solved in time by bisection
+        x0, y0, x3, y3 = k0.Time, k0.Value, k1.Time, k1.Value
+        x1, y1 = self.getTangent(i, 1)
+        x2, y2 = self.getTangent(i+1, -1)
+        x1, y1, x2, y2 = x0 + x1, y0 + y1, x3 + x2, y3 + y2
+
+        low, high = 0.0, 1.0
+        for n in xrange(40):
+            u = (low + high) * .5
+            x = (1-u)**3*x0 + 3*(1-u)**2*u*x1 + 3*(1-u)*u**2*x2 + u**3*x3
+            if x < time:
+                low = u
+            else:
+                high = u
+
+        return (1-u)**3*y0 + 3*(1-u)**2*u*y1 + 3*(1-u)*u**2*y2 + u**3*y3
+
+    ## Return the tangent of a key.
+    # @param self
+    # @param index Integer - Key index.
+    # @param side Integer - 1 for the right tangent, -1 for the left one.
+    # @return Tuple of Double - X and Y.
+    def getTangent(self, index, side):
+
+        key = self.keys[index]
+        if side > 0 and key.RightTanX is not None:
+            return key.RightTanX, key.RightTanY
+        if side < 0 and key.LeftTanX is not None:
+            return key.LeftTanX, key.LeftTanY
+
+        previous = self.keys[max(index-1, 0)]
+        next = self.keys[min(index+1, len(self.keys)-1)]
+        slope = 0.0
+        if next.Time != previous.Time and 0 < index < len(self.keys)-1:
+            slope = (next.Value - previous.Value) / (next.Time - previous.Time)
+
+        neighbor = self.keys[index+side]
+        x = (neighbor.Time - key.Time) / 3.0
+
+        return x, x * slope
+
+    ## Return the keys, as fcurve.getFCurveKeys().
+    def getKeyValues(self):
+        return [[key.Time, key.Value, key.LeftTanX, key.LeftTanY, key.RightTanX, key.RightTanY, key.Interpolation] for key in self.keys]
+
+# ========================================================
+## Item with properties.
+class SceneItem(Item):
+
+    def __init__(self, application, name, type, parent=None):
+
+        Item.__init__(self, application, name, type, parent)
+        self.__dict__["_properties"] = []
+
+    def getProperty(self, name):
+
+        for prop in self._properties:
+            if prop.Name.lower() == name.lower():
+                return prop
+
+        if name.lower() in DEFAULT_PROPERTIES:
+            return self.addProperty(name.lower(), name.lower())
+
+        return None
+
+    def addProperty(self, type, name, branch=False):
+
+        prop = Property(self._application, name, type, self, branch)
+        self._properties.append(prop)
+
+        return prop
+
+    def getProperties(self):
+        return PropertyCollection(self)
+
+    Properties = property(getProperties)
+    LocalProperties = property(getProperties)
+
+    def AddProperty(self, preset, branch=False, name=None):
+
+        type = PRESET_NAMES.get(preset.lower(), preset)
+        if name is None:
+            name = type
+
+        # Builtin properties are only added once
+        if type.lower() not in CUSTOM_PROPERTIES:
+            prop = self.getProperty(name)
+            if prop is not None:
+                return prop
+
+        names = [prop.Name for prop in self._properties]
+        unique = name
+        i = 0
+        while unique in names:
+            i += 1
+            unique = name + str(i)
+
+        return self.addProperty(type, unique, branch)
+
+    def AddCustomProperty(self, name, branch=False):
+        return self.AddProperty("CustomProperty", branch, name)
+
+    def RemoveProperty(self, prop):
+        if prop in self._properties:
+            self._properties.remove(prop)
+
+    # Parameters ------------------------------------------
+    def AddParameter(self, paramDef, name=None):
+
+        param = Parameter(self._application, paramDef.ScriptName, self, paramDef.Value, paramDef.ValueType, True)
+        param.Capabilities = paramDef.Capabilities
+        param.Min = paramDef.Min
+        param.Max = paramDef.Max
+
+        return self.addParameter(param)
+
+    def AddParameter2(self, scriptName, valueType, value=None, minimum=None, maximum=None, sugMinimum=None, sugMaximum=None, classification=None, capabilities=0, name=None, description=None):
+
+        param = Parameter(self._application, scriptName, self, value, valueType, True)
+        param.Min, param.Max = minimum, maximum
+        param.SuggestedMin, param.SuggestedMax = sugMinimum, sugMaximum
+        param.Capabilities = capabilities or 0
+        param.Keyable = bool(param.Capabilities & getConstants().siKeyable)
+        param.Animatable = bool(param.Capabilities & getConstants().siAnimatable)
+        param.Description = description or ""
+
+        return self.addParameter(param)
+
+    def AddParameter3(self, scriptName, valueType, value=None, minimum=None, maximum=None, animatable=True, readonly=False):
+
+        param = Parameter(self._application, scriptName, self, value, valueType, True)
+        param.Min, param.Max = minimum, maximum
+        param.Animatable = animatable
+        param.Keyable = animatable
+        param.ReadOnly = readonly
+
+        return self.addParameter(param)
+
+    def AddFCurveParameter(self, scriptName):
+
+        param = Parameter(self._application, scriptName, self, None, None, True)
+        param.__dict__["_value"] = FCurve(self._application, param)
+
+        return self.addParameter(param)
+
+    def AddProxyParameter(self, master, scriptName=None, name=None):
+
+        param = Parameter(self._application, scriptName or master.ScriptName, self, master.Value, master.ValueType, True)
+        param.Description = master.FullName
+
+        return self.addParameter(param)
+
+    def RemoveParameter(self, param):
+
+        key = param.ScriptName.lower()
+        if key in self._parameters:
+            del self._parameters[key]
+            self._parameterOrder.remove(key)
+
+## Properties of an item, callable by name.
+class PropertyCollection(Collection):
+
+    def __init__(self, item):
+        Collection.__init__(self, item._properties)
+        self.item = item
+
+    def Item(self, index):
+
+        if isinstance(index, basestring):
+            return self.item.getProperty(index)
+
+        return self.items[index]
+
+## Property stand-in.
+class Property(SceneItem):
+
+    def __init__(self, application, name, type, parent, branch=False):
+
+        SceneItem.__init__(self, application, name, type, parent)
+        self.__dict__["_branch"] = branch
+
+        if type.lower() == "gear_pset":
+            self.addParameter(Parameter(application, "layout", self, "", getConstants().siString, True))
+            self.addParameter(Parameter(application, "logic", self, "", getConstants().siString, True))
+        elif type.lower() == "gear_mirror":
+            grid_param = self.addParameter(Parameter(application, "CnxGridHidden", self, None, None, True))
+            grid_param.__dict__["_value"] = GridData(application, grid_param)
+            self.addParameter(Parameter(application, "Count", self, 0, getConstants().siInt4, True))
+
+    Branch = property(lambda self: self._branch)
+
+    def isCustom(self):
+        return self._type.lower() in CUSTOM_PROPERTIES
+
+# ========================================================
+## Kinematics stand-in.
+class Kinematics(SceneItem):
+
+    def __init__(self, application, obj):
+
+        SceneItem.__init__(self, application, "kine", "kine", obj)
+        self.__dict__["_local"] = KinematicState(application, "local", "local", self)
+        self.__dict__["_global"] = KinematicState(application, "global", "global", self)
+        self.__dict__["_constraints"] = []
+
+    Local = property(lambda self: self._local)
+    Global = property(lambda self: self._global)
+    Constraints = property(lambda self: Collection(self._constraints))
+
+    def AddConstraint(self, preset, constraining, compensate=False):
+
+        cns = Constraint(self._application, preset, self, getItems(self._application, constraining), compensate)
+        names = [item.Name for item in self._constraints]
+        name = cns.Name
+        i = 0
+        while cns.Name in names:
+            i += 1
+            cns.Name = name + str(i)
+
+        self._constraints.append(cns)
+        self._application.constraints.append(cns)
+
+        return cns
+
+## Local or global kinematic state. The transformation is kept by the object.
+class KinematicState(SceneItem):
+
+    def getTransform(self):
+
+        if self._name == "local":
+            return self._parent._parent.getLocalTransform()
+
+        return self._parent._parent.getGlobalTransform()
+
+    def setTransform(self, t):
+
+        if self._name == "local":
+            self._parent._parent.setLocalTransform(t)
+        else:
+            self._parent._parent.setGlobalTransform(t)
+
+    Transform = property(getTransform, setTransform)
+
+    def getParameter(self, name, create=True):
+
+        key = name.lower()
+        if key not in self._parameters and (key in TransformParameter.attributes or key in ["quatw", "quatx", "quaty", "quatz"]):
+            self.addParameter(TransformParameter(self._application, key, self, 0.0))
+
+        return SceneItem.getParameter(self, name, create)
+
+    ## Return the parameters, the transformation ones first.
+    def getParameters(self):
+
+        for key in ["posx", "posy", "posz", "rotx", "roty", "rotz", "sclx", "scly", "sclz"]:
+            self.getParameter(key)
+
+        return SceneItem.getParameters(self)
+
+## Constraint stand-in.
+class Constraint(SceneItem):
+
+    def __init__(self, application, preset, kinematics, constraining, compensate):
+
+        SceneItem.__init__(self, application, preset.lower() + "cns", preset, kinematics)
+        self.__dict__["_constraining"] = constraining
+        self.__dict__["_compensate"] = compensate
+
+    Constraining = property(lambda self: Collection(self._constraining))
+    Constrained = property(lambda self: self.Parent3DObject)
+
+# ========================================================
+## Operator stand-in.
+class Operator(SceneItem):
+
+    def __init__(self, application, type):
+
+        SceneItem.__init__(self, application, type, type)
+        self.__dict__["_outputs"] = []
+        self.__dict__["_inputs"] = []
+        self.__dict__["_connected"] = False
+
+    def getFullName(self):
+
+        if self._outputs:
+            return "%s.%s"%(self._outputs[0], self._name)
+
+        return self._name
+
+    def AddOutputPort(self, target, name=""):
+        self._outputs.extend(getItems(self._application, target) or [target])
+
+    def AddInputPort(self, target, name=""):
+        self._inputs.extend(getItems(self._application, target) or [target])
+
+    def AddIOPort(self, target, name=""):
+        self.AddOutputPort(target, name)
+        self.AddInputPort(target, name)
+
+    def Connect(self, *args):
+
+        if not self._connected:
+            self.__dict__["_connected"] = True
+            self._application.operators.append(self)
+
+    def getInputPorts(self):
+        return Collection([Port(self._application, self, target) for target in self._inputs])
+
+    def getOutputPorts(self):
+        return Collection([Port(self._application, self, target) for target in self._outputs])
+
+    InputPorts = property(getInputPorts)
+    OutputPorts = property(getOutputPorts)
+
+## Port of an operator, connected to its target.
+class Port(Item):
+
+    def __init__(self, application, op, target):
+
+        Item.__init__(self, application, "Port", "Port", op)
+        self.__dict__["_target"] = target
+
+    Target2 = property(lambda self: self._target)
+    IsConnected = property(lambda self: self._target is not None)
+
+## Parameter definition, from XSIFactory.CreateParamDef().
+class ParamDef(object):
+
+    def __init__(self, scriptName, valueType, classification=None, capabilities=0, name="", description="", value=None, minimum=None, maximum=None, *args):
+
+        self.ScriptName = scriptName
+        self.ValueType = valueType
+        self.Capabilities = capabilities or 0
+        self.Value = value
+        self.Min = minimum
+        self.Max = maximum
+
+# ========================================================
+## X3DObject stand-in. The local transformation is kept, the global one is computed from the parents.
+class X3DObject(SceneItem):
+
+    def __init__(self, application, name, type, parent=None):
+
+        SceneItem.__init__(self, application, name, type, parent)
+        self.__dict__["_children"] = []
+        self.__dict__["_kinematics"] = Kinematics(application, self)
+        self.__dict__["_primitive"] = Primitive(application, type, self)
+        self.__dict__["_local"] = getMath().CreateTransform()
+        self.__dict__["_stamp"] = 0
+        self.__dict__["_cache"] = None
+
+    def getFullName(self):
+
+        model = self.Model
+        if model is None or model is self or model.isRoot():
+            return self._name
+
+        return model.FullName + "." + self._name
+
+    def setName(self, name):
+        self.Model.setObjectName(self, name)
+
+    def isRoot(self):
+        return self._parent is None
+
+    ## Return the model keeping the names of the children of the object.
+    def getNamespace(self):
+        return self.Model
+
+    def getModel(self):
+
+        parent = self._parent
+        while parent is not None and not isinstance(parent, Model):
+            parent = parent._parent
+
+        return parent
+
+    Model = property(lambda self: self.getModel())
+    Parent3DObject = property(lambda self: self._parent)
+    Kinematics = property(lambda self: self._kinematics)
+    ActivePrimitive = property(lambda self: self._primitive)
+    Children = property(lambda self: Collection(self._children))
+    Owners = property(lambda self: Collection([self.Model]))
+
+    # Transformations -------------------------------------
+    def getLocalTransform(self):
+        return copyTransform(self._local)
+
+    def setLocalTransform(self, t):
+
+        self.__dict__["_local"] = copyTransform(t)
+        self._application.revision += 1
+        self.__dict__["_stamp"] = self._application.revision
+
+    ## Return the global transformation and its revision.\n
+    ## The transformation is cached until the local transformation of the object or one of its parents changes.
+    # @param self
+    # @return Tuple - Revision and SITransformation.
+    def getGlobalCache(self):
+
+        if self._parent is None or self._parent.isRoot():
+            key = (self._stamp, None)
+        else:
+            parent_revision, parent_global = self._parent.getGlobalCache()
+            key = (self._stamp, parent_revision)
+
+        if self._cache is None or self._cache[0] != key:
+            if key[1] is None:
+                t = self._local
+            else:
+                t = getMath().CreateTransform()
+                t.Mul(self._local, parent_global)
+            self._application.revision += 1
+            self.__dict__["_cache"] = (key, self._application.revision, t)
+
+        return self._cache[1], self._cache[2]
+
+    def getGlobalTransform(self):
+        return copyTransform(self.getGlobalCache()[1])
+
+    def setGlobalTransform(self, t):
+
+        if self._parent is None or self._parent.isRoot():
+            self.setLocalTransform(t)
+            return
+
+        inverse = getMath().CreateTransform()
+        inverse.Invert(self._parent.getGlobalCache()[1])
+
+        local = getMath().CreateTransform()
+        local.Mul(t, inverse)
+        self.setLocalTransform(local)
+
+    # Hierarchy -------------------------------------------
+    ## Add a new child object.
+    # @param self
+    # @param obj X3DObject
+    # @param name String - Name of the object, made unique in the model.
+    # @return X3DObject
+    def addObject(self, obj, name):
+
+        self._children.append(obj)
+        self.getNamespace().setObjectName(obj, name or obj._type)
+
+        return obj
+
+    def AddChild(self, objects, compensate=True):
+
+        for obj in getItems(self._application, objects):
+            t = obj.getGlobalTransform()
+            if obj._parent is not None:
+                obj._parent._children.remove(obj)
+            obj.__dict__["_parent"] = self
+            self._children.append(obj)
+            obj.setGlobalTransform(t)
+
+    def RemoveChild(self, obj):
+        self._application.ActiveSceneRoot.AddChild(obj)
+
+    def getDescendants(self):
+
+        objects = []
+        stack = list(reversed(self._children))
+        while stack:
+            obj = stack.pop()
+            objects.append(obj)
+            stack.extend(reversed(obj._children))
+
+        return objects
+
+    def FindChildren(self, name="", type="", families=None, recursive=True):
+
+        objects = recursive and self.getDescendants() or list(self._children)
+        if name:
+            pattern = name.lower()
+            objects = [obj for obj in objects if fnmatch.fnmatchcase(obj._name.lower(), pattern)]
+        if type:
+            objects = [obj for obj in objects if obj._type == type]
+
+        return Collection(objects)
+
+    def FindChildren2(self, name="", type="", families=None, recursive=True):
+        return self.FindChildren(name, type, families, recursive)
+
+    def FindChild(self, name="", type="", families=None, recursive=True):
+
+        if name and recursive and "*" not in name and "?" not in name:
+            obj = self.getNamespace().getObject(name)
+            if obj is not None and self in obj.getAncestors() and (not type or obj._type == type):
+                return obj
+            return None
+
+        objects = self.FindChildren(name, type, families, recursive)
+        if objects.Count:
+            return objects(0)
+
+        return None
+
+    def FindChild2(self, name="", type="", families=None, recursive=True):
+        return self.FindChild(name, type, families, recursive)
+
+    def getAncestors(self):
+
+        ancestors = []
+        parent = self._parent
+        while parent is not None:
+            ancestors.append(parent)
+            parent = parent._parent
+
+        return ancestors
+
+    # Creation --------------------------------------------
+    def AddNull(self, name=""):
+        return self.addObject(X3DObject(self._application, "null", "null", self), name)
+
+    def AddPrimitive(self, preset, name=""):
+
+        type = PRIMITIVE_TYPES.get(preset.lower(), preset.lower())
+        return self.addObject(X3DObject(self._application, type, type, self), name)
+
+    def AddGeometry(self, preset, geometryType="MeshSurface", name=""):
+
+        positions, polygons = getMeshPreset(preset)
+        return self.AddPolygonMesh(positions, polygons, name)
+
+    def AddPolygonMesh(self, vertices=None, polygons=None, name=""):
+
+        mesh = self.addObject(X3DObject(self._application, "polymsh", "polymsh", self), name)
+        mesh.ActivePrimitive.Geometry.Set(vertices or [], polygons or [])
+
+        return mesh
+
+    # Deformers -------------------------------------------
+    ## Apply an envelope, or add the deformers to the envelope of the object.
+    # @param self
+    # @param deformers Collection or List of X3DObject
+    # @return EnvelopeOp
+    def ApplyEnvelope(self, deformers, *args):
+
+        primitive = self.ActivePrimitive
+        op = primitive.getOperator("envelopop")
+        if op is None:
+            op = primitive.addOperator(EnvelopeOp(self._application, primitive))
+
+        op.addDeformers(getItems(self._application, deformers))
+
+        return op
+
+    def AddModel(self, objects=None, name=""):
+
+        model = self.addObject(Model(self._application, "Model", self), name)
+        if objects is not None:
+            model.AddChild(objects)
+
+        return model
+
+    def AddNurbsCurve(self, points, knots=None, closed=False, degree=3, parameterization=None, format=None, name=""):
+
+        curve = self.addObject(X3DObject(self._application, "crvlist", "crvlist", self), name)
+        curve.ActivePrimitive.Geometry.addCurve(points, knots, closed, degree)
+
+        return curve
+
+    def AddNurbsCurveList2(self, count, points, ncp=None, knots=None, nkn=None, closed=None, degree=None, parameterization=None, format=None, name=""):
+
+        curve = self.addObject(X3DObject(self._application, "crvlist", "crvlist", self), name)
+        geometry = curve.ActivePrimitive.Geometry
+
+        offset = 0
+        for i in xrange(count):
+            geometry.addCurve(points[offset*4:(offset+ncp[i])*4], None, closed[i], degree[i])
+            offset += ncp[i]
+
+        return curve
+
+    def Add2DChain(self, start, end, normal=None, mode=None, name=""):
+
+        t = getMath().CreateTransform()
+        t.SetTranslation(start)
+
+        root = self.addObject(ChainRoot(self._application, "root", "root", self), name or "root")
+        root.setGlobalTransform(t)
+        root.addBone(start, end, normal)
+
+        return root
+
+## Model stand-in. The model keeps the names of its objects, which are unique.
+class Model(X3DObject):
+
+    def __init__(self, application, name, parent=None):
+
+        X3DObject.__init__(self, application, name, "#model", parent)
+        self.__dict__["_objects"] = {}
+        self.__dict__["_groups"] = []
+
+    def getFullName(self):
+        return self._name
+
+    def getModel(self):
+
+        if self._parent is None:
+            return self
+
+        return X3DObject.getModel(self)
+
+    ModelKind = property(lambda self: 0)
+
+    def isRoot(self):
+        return self._parent is None
+
+    def getNamespace(self):
+        return self
+
+    def getObject(self, name):
+        return self._objects.get(name.lower())
+
+    ## Set the name of an object of the model, with a number suffix if the name is used.
+    # @param self
+    # @param obj X3DObject
+    # @param name String
+    def setObjectName(self, obj, name):
+
+        if obj._name.lower() in self._objects and self._objects[obj._name.lower()] is obj:
+            del self._objects[obj._name.lower()]
+
+        unique = name
+        i = 0
+        while unique.lower() in self._objects:
+            i += 1
+            unique = name + str(i)
+
+        obj.__dict__["_name"] = unique
+        self._objects[unique.lower()] = obj
+
+    def removeObject(self, obj):
+
+        if self._objects.get(obj._name.lower()) is obj:
+            del self._objects[obj._name.lower()]
+
+    # Groups ----------------------------------------------
+    def getGroups(self):
+        return GroupCollection(self)
+
+    Groups = property(getGroups)
+
+    def AddGroup(self, members=None, name="Group", branch=False):
+
+        group = Group(self._application, name, self)
+        self._groups.append(group)
+        if members is not None:
+            group.AddMember(members, branch)
+
+        return group
+
+    def Sources(self, name=None):
+        return None
+
+## Groups of a model, callable by name.
+class GroupCollection(Collection):
+
+    def __init__(self, model):
+        Collection.__init__(self, model._groups)
+
+## Group stand-in.
+class Group(SceneItem):
+
+    def __init__(self, application, name, model):
+
+        SceneItem.__init__(self, application, name, "#Group", model)
+        self.__dict__["_members"] = []
+
+    Members = property(lambda self: Collection(self._members))
+
+    def AddMember(self, members, branch=False):
+
+        for item in getItems(self._application, members):
+            if item not in self._members:
+                self._members.append(item)
+
+    def RemoveMember(self, members):
+
+        for item in getItems(self._application, members):
+            if item in self._members:
+                self._members.remove(item)
+
+    def IsMember(self, item, branch=False):
+        return item in self._members
+
+## Chain root, with its bones and effector.
+class ChainRoot(X3DObject):
+
+    def __init__(self, application, name, type, parent=None):
+
+        X3DObject.__init__(self, application, name, type, parent)
+        self.__dict__["_bones"] = []
+        self.__dict__["_effector"] = None
+
+    Bones = property(lambda self: Collection(self._bones))
+    Effector = property(lambda self: self._effector)
+
+    ## Add a bone between two positions, oriented in the chain plane, and move the effector at its end.
+    # @param self
+    # @param start SIVector3
+    # @param end SIVector3
+    # @param normal SIVector3 - Normal of the chain plane. None to keep the normal of the previous bone.
+    def addBone(self, start, end, normal=None):
+
+        xsimath = getMath()
+
+        if normal is None:
+            normal = xsimath.CreateVector3()
+            normal.MulByRotation(xsimath.CreateVector3(0, 0, 1), self._bones[-1].getGlobalTransform().Rotation)
+
+        x = xsimath.CreateVector3()
+        x.Sub(end, start)
+        length = x.Length()
+        x.NormalizeInPlace()
+
+        y = xsimath.CreateVector3()
+        y.Cross(normal, x)
+        y.NormalizeInPlace()
+
+        z = xsimath.CreateVector3()
+        z.Cross(x, y)
+
+        r = xsimath.CreateRotation()
+        r.SetFromXYZAxes(x, y, z)
+
+        t = xsimath.CreateTransform()
+        t.SetTranslation(start)
+        t.SetRotation(r)
+
+        parent = self._bones and self._bones[-1] or self
+        bone = parent.addObject(X3DObject(self._application, "bone", "bone", parent), "bone")
+        bone.setGlobalTransform(t)
+        bone.getParameter("length").Value = length
+        self._bones.append(bone)
+
+        if self._effector is None:
+            self.__dict__["_effector"] = self.addObject(X3DObject(self._application, "eff", "eff", self), "eff")
+        t.SetTranslation(end)
+        self._effector.setGlobalTransform(t)
+
+        return bone
+
+    def AddBone(self, position, type=None, name=""):
+
+        start = self._effector.getGlobalTransform().Translation
+        bone = self.addBone(start, position)
+        if name:
+            bone.Name = name
+
+        return bone
+
+# ========================================================
+## Primitive of an object.
+class Primitive(SceneItem):
+
+    def __init__(self, application, type, obj):
+
+        SceneItem.__init__(self, application, type, type, obj)
+        self.__dict__["_geometry"] = None
+        self.__dict__["_operators"] = []
+
+    def getGeometry(self, time=None):
+
+        if self._geometry is None:
+            self.__dict__["_geometry"] = Geometry(self._application, self)
+
+        return self._geometry
+
+    Geometry = property(getGeometry)
+
+    def GetGeometry2(self, time=None, mode=None):
+        return self.getGeometry()
+
+    # Stack -----------------------------------------------
+    ## Return the first operator of a type in the stack.
+    # @param self
+    # @param type String
+    # @return Operator - None if there is none.
+    def getOperator(self, type):
+
+        for op in self._operators:
+            if op.Type == type:
+                return op
+
+        return None
+
+    ## Connect an operator at the top of the stack.
+    # @param self
+    # @param op Operator
+    # @return Operator
+    def addOperator(self, op):
+
+        op.AddOutputPort(self)
+        op.Connect()
+        self._operators.append(op)
+
+        return op
+
+    def removeOperator(self, op):
+
+        if op in self._operators:
+            self._operators.remove(op)
+        if op in self._application.operators:
+            self._application.operators.remove(op)
+
+    ## The markers and operators of the stack. The deformers are in the animation region.
+    def getNestedObjects(self):
+
+        nested = [Item(self._application, name, type, self) for type, name in MARKERS[:3]]
+        nested.extend(self._operators)
+        nested.append(Item(self._application, MARKERS[3][1], MARKERS[3][0], self))
+
+        return Collection(nested)
+
+    NestedObjects = property(getNestedObjects)
+
+## Geometry of a primitive. Curves keep their control points.
+class Geometry(SceneItem):
+
+    def __init__(self, application, primitive):
+
+        SceneItem.__init__(self, application, "geometry", "geometry", primitive)
+        self.__dict__["_positions"] = []
+        self.__dict__["_polygons"] = []
+        self.__dict__["_curves"] = []
+        self.__dict__["_clusters"] = []
+
+    def getFullName(self):
+        return self._parent.FullName
+
+    ## Add a curve to the geometry.
+    # @param self
+    # @param points List of Double - x, y, z and w values of the control points.
+    # @param knots List of Double - None for the default knots.
+    # @param closed Boolean
+    # @param degree Integer
+    def addCurve(self, points, knots, closed, degree):
+
+        positions = [tuple([float(v) for v in points[i:i+3]]) for i in xrange(0, len(points), 4)]
+        curve = NurbsCurve(self._application, self, len(self._positions), positions, knots, closed, degree)
+        self._positions.extend(positions)
+        self._curves.append(curve)
+
+    def getPoints(self):
+        return Points(self)
+
+    Points = property(getPoints)
+    ControlPoints = property(getPoints)
+    Polygons = property(lambda self: ArrayItem(self._polygons))
+    Samples = property(lambda self: ArrayItem(range(sum([len(polygon) for polygon in self._polygons]))))
+    Curves = property(lambda self: Collection(self._curves))
+    Clusters = property(lambda self: Collection(self._clusters))
+
+    ## Return the positions and the polygons of a polygon mesh.
+    # @param self
+    # @return Tuple - Positions by axis and polygon data (vertex count followed by the vertex indexes of each polygon).
+    def Get2(self):
+
+        polygon_data = []
+        for polygon in self._polygons:
+            polygon_data.append(len(polygon))
+            polygon_data.extend(polygon)
+
+        return self.Points.PositionArray, tuple(polygon_data)
+
+    ## Set the points and polygons of a polygon mesh. The complete clusters are resized.
+    # @param self
+    # @param vertices List - Positions by axis, by point, or as a flat list.
+    # @param polygons List - List of vertex indexes by polygon, or polygon data as returned by Get2().
+    def Set(self, vertices, polygons):
+
+        vertices = list(vertices)
+        if len(vertices) == 3 and isinstance(vertices[0], (list, tuple)):
+            positions = zip(*vertices)
+        elif vertices and isinstance(vertices[0], (list, tuple)):
+            positions = [tuple(p) for p in vertices]
+        else:
+            positions = [tuple(vertices[i:i+3]) for i in xrange(0, len(vertices), 3)]
+
+        polygons = list(polygons)
+        if polygons and not isinstance(polygons[0], (list, tuple)):
+            data = polygons
+            polygons = []
+            i = 0
+            while i < len(data):
+                polygons.append(tuple(data[i+1:i+1+data[i]]))
+                i += data[i] + 1
+
+        self.__dict__["_positions"] = [tuple([float(v) for v in p]) for p in positions]
+        self.__dict__["_polygons"] = [tuple(p) for p in polygons]
+
+        for cluster in self._clusters:
+            if cluster.IsAlwaysComplete():
+                cluster.setElements(range(len(positions)))
+
+    def AddCluster(self, type, name="", indices=None):
+
+        complete = indices is None
+        if complete:
+            indices = range(len(self._positions))
+
+        cluster = Cluster(self._application, name or "Cluster", type, self, list(indices), complete)
+        self._clusters.append(cluster)
+
+        return cluster
+
+    def removeCluster(self, cluster):
+        if cluster in self._clusters:
+            self._clusters.remove(cluster)
+
+## Points of a geometry.
+class Points(object):
+
+    def __init__(self, geometry):
+        self.geometry = geometry
+
+    def __len__(self):
+        return len(self.geometry._positions)
+
+    def __iter__(self):
+        return iter([Point(self.geometry, i) for i in xrange(len(self))])
+
+    def __call__(self, index):
+        return Point(self.geometry, index)
+
+    Count = property(__len__)
+
+    def getPositionArray(self):
+        positions = self.geometry._positions
+        return tuple([tuple([p[i] for p in positions]) for i in xrange(3)])
+
+    def setPositionArray(self, array):
+        self.geometry.__dict__["_positions"] = zip(*array[:3])
+
+    PositionArray = property(getPositionArray, setPositionArray)
+    Array = property(lambda self: self.getPositionArray() + (tuple([1.0] * len(self)),))
+
+## Point of a geometry.
+class Point(object):
+
+    def __init__(self, geometry, index):
+        self.geometry = geometry
+        self.Index = index
+
+    Position = property(lambda self: getMath().CreateVector3(*self.geometry._positions[self.Index]))
+
+## Nurbs curve of a curve list.
+class NurbsCurve(Item):
+
+    def __init__(self, application, geometry, offset, positions, knots, closed, degree):
+
+        Item.__init__(self, application, "curve", "NurbsCurve", geometry)
+        self.__dict__["_positions"] = positions
+        self.__dict__["_closed"] = closed
+        self.__dict__["_degree"] = degree
+
+        # Uniform knots, as Softimage : ncp + degree - 1 knots for open curves, ncp + 2 * degree - 1 for closed ones
+        if knots is None:
+            if closed:
+                knots = range(1 - degree, len(positions) + degree)
+            else:
+                spans = len(positions) - degree
+                knots = [0] * (degree - 1) + range(spans + 1) + [spans] * (degree - 1)
+        self.__dict__["_knots"] = [float(k) for k in knots]
+
+    Index = property(lambda self: self._parent._curves.index(self))
+    Degree = property(lambda self: self._degree)
+    Closed = property(lambda self: self._closed)
+    Knots = property(lambda self: ArrayItem(self._knots))
+    ControlPoints = property(lambda self: ControlPoints(self._positions))
+
+    ## Return the position at a knot value, with de Boor's algorithm. Closed curves are evaluated as their control polygon.
+    # @param self
+    # @param u Double - Knot value.
+    # @return Tuple of Double
+    def getPosition(self, u):
+
+        degree = self._degree
+        points = self._positions
+        if degree == 1 or self._closed or len(points) <= degree:
+            return self.getPolygonPosition(u)
+
+        # Softimage knot vectors don't repeat the first and last knots
+        knots = [self._knots[0]] + self._knots + [self._knots[-1]]
+        span = degree
+        while span < len(points) - 1 and knots[span+1] <= u:
+            span += 1
+
+        d = [list(points[span - degree + i]) for i in xrange(degree + 1)]
+        for r in xrange(1, degree + 1):
+            for j in xrange(degree, r - 1, -1):
+                i = span - degree + j
+                denominator = knots[i + degree - r + 1] - knots[i]
+                alpha = denominator and (u - knots[i]) / denominator or 0.0
+                d[j] = [(1 - alpha) * a + alpha * b for a, b in zip(d[j-1], d[j])]
+
+        return tuple(d[degree])
+
+    ## Return the position on the control polygon, at a knot value of a linear curve.
+    def getPolygonPosition(self, u):
+
+        points = list(self._positions)
+        if self._closed:
+            points.append(points[0])
+
+        u = max(0.0, min(float(u), len(points) - 1.0))
+        i = min(int(u), len(points) - 2)
+        ratio = u - i
+
+        return tuple([a + (b - a) * ratio for a, b in zip(points[i], points[i+1])])
+
+    ## Return the length of the curve, from samples of each span.
+    # @param self
+    # @return Double
+    def getLength(self, samples=16):
+
+        start, end = self._knots[0], self._knots[-1]
+        if self._degree == 1 or self._closed:
+            start, end = 0, len(self._positions) - (not self._closed and 1 or 0)
+
+        count = max(1, int((end - start) * samples))
+        positions = [self.getPosition(start + (end - start) * i / float(count)) for i in xrange(count + 1)]
+
+        length = 0.0
+        for a, b in zip(positions[:-1], positions[1:]):
+            length += sum([(x - y) ** 2 for x, y in zip(a, b)]) ** .5
+
+        return length
+
+    Length = property(getLength)
+
+## Object with an Array, as NurbsCurve.Knots.
+class ArrayItem(object):
+
+    def __init__(self, array):
+        self.Array = tuple(array)
+        self.Count = len(array)
+
+## Control points of a nurbs curve.
+class ControlPoints(ArrayItem):
+
+    def __init__(self, positions):
+        ArrayItem.__init__(self, [tuple([p[i] for p in positions]) for i in xrange(3)] + [tuple([1.0] * len(positions))])
+        self.Count = len(positions)
+        self.positions = positions
+
+    def __iter__(self):
+        return iter([ArrayItem(p) for p in self.positions])
+
+## Elements of a cluster, with their indexes in the cluster.
+class ClusterElements(ArrayItem):
+
+    def FindIndex(self, index):
+
+        if index in self.Array:
+            return self.Array.index(index)
+
+        return -1
+
+## Cluster stand-in.
+class Cluster(SceneItem):
+
+    def __init__(self, application, name, type, geometry, indices, complete=False):
+
+        SceneItem.__init__(self, application, name, type, geometry)
+        self.__dict__["_elements"] = indices
+        self.__dict__["_complete"] = complete
+
+    def getFullName(self):
+        return "%s.cls.%s"%(self._parent.FullName, self._name)
+
+    Elements = property(lambda self: ClusterElements(self._elements))
+
+    def IsAlwaysComplete(self):
+        return self._complete
+
+    ## Set the elements. The values of the cluster properties are kept by element.
+    def setElements(self, indices):
+
+        for prop in self._properties:
+            prop.setElementCount(len(indices))
+
+        self.__dict__["_elements"] = list(indices)
+
+    def addProperty(self, type, name, branch=False):
+
+        prop = ClusterProperty(self._application, name, type, self)
+        self._properties.append(prop)
+
+        return prop
+
+## Cluster property stand-in, with a tuple of values by element.
+class ClusterProperty(Property):
+
+    def __init__(self, application, name, type, cluster, value_count=1):
+
+        Property.__init__(self, application, name, type, cluster)
+        self.__dict__["_values"] = [[0.0] * len(cluster._elements) for i in xrange(value_count)]
+
+    Elements = property(lambda self: ClusterPropertyElements(self))
+
+    ## Set the number of values of each element. The new values are 0.
+    def setValueCount(self, count):
+
+        element_count = len(self._parent._elements)
+        del self._values[count:]
+        while len(self._values) < count:
+            self._values.append([0.0] * element_count)
+
+    def setElementCount(self, count):
+
+        for values in self._values:
+            values[:] = (values + [0.0] * count)[:count]
+
+    ## Set the values from a tuple by value index, or from a flat list, element major.
+    def setArray(self, array):
+
+        array = list(array)
+        value_count = len(self._values)
+        if array and isinstance(array[0], (list, tuple)):
+            self.__dict__["_values"] = [[float(v) for v in values] for values in array]
+        else:
+            self.__dict__["_values"] = [[float(v) for v in array[i::value_count]] for i in xrange(value_count)]
+
+## Elements of a cluster property, Array is a tuple of values by value index.
+class ClusterPropertyElements(object):
+
+    def __init__(self, prop):
+        self.prop = prop
+
+    def getArray(self):
+        return tuple([tuple(values) for values in self.prop._values])
+
+    def setArray(self, array):
+        self.prop.setArray(array)
+
+    Array = property(getArray, setArray)
+    Count = property(lambda self: len(self.prop._parent._elements))
+
+## Envelope operator stand-in.\n
+## The weights are kept in the envweights property of a complete cluster, a value by deformer.
+class EnvelopeOp(Operator):
+
+    def __init__(self, application, primitive):
+
+        Operator.__init__(self, application, "envelopop")
+        self.__dict__["_parent"] = primitive
+        self.__dict__["_deformers"] = []
+
+        cluster = primitive.Geometry.AddCluster("pnt", "EnvelopWeightCls")
+        self.__dict__["_weights"] = cluster.AddProperty("envweights", False, "Envelope_Weights")
+        self._weights.setValueCount(0)
+        self.AddInputPort(self._weights)
+
+    Deformers = property(lambda self: Collection(self._deformers, self._application))
+    Weights = property(lambda self: self._weights.Elements)
+
+    ## Add deformers. The first deformers get the points closest to them, the others get no weight.
+    # @param self
+    # @param deformers List of X3DObject
+    def addDeformers(self, deformers):
+
+        deformers = [obj for obj in deformers if obj not in self._deformers]
+        if not deformers:
+            return
+
+        first = not self._deformers
+        self._deformers.extend(deformers)
+        self._inputs.extend(deformers)
+        self._weights.setValueCount(len(self._deformers))
+
+        if first:
+            self.setClosestWeights()
+
+    ## Give each point all its weight on the closest deformer.
+    def setClosestWeights(self):
+
+        xsimath = getMath()
+        t = self._parent._parent.getGlobalTransform()
+        centers = [obj.getGlobalTransform().Translation for obj in self._deformers]
+
+        values = self._weights._values
+        for point_index, position in enumerate(self._parent.Geometry._positions):
+            v = xsimath.CreateVector3(*position)
+            v.MulByTransformationInPlace(t)
+
+            distances = []
+            for center in centers:
+                d = xsimath.CreateVector3()
+                d.Sub(v, center)
+                distances.append(d.Length())
+
+            values[distances.index(min(distances))][point_index] = 100.0
+
+    def PortAt(self, index, group=0, instance=0):
+
+        if index == 4:
+            return Port(self._application, self, self._weights)
+
+        return Port(self._application, self, None)
+
+    ## Remove the operator, its cluster and its weights.
+    def remove(self):
+
+        cluster = self._weights._parent
+        cluster._parent.removeCluster(cluster)
+        self._parent.removeOperator(self)
+
+## GridData stand-in, the rows are stored as lists.
+class GridData(Item):
+
+    def __init__(self, application, parent=None):
+
+        Item.__init__(self, application, "GridData", "GridData", parent)
+        self.__dict__["_rows"] = []
+        self.__dict__["_rowLabels"] = []
+        self.__dict__["_columnLabels"] = []
+        self.__dict__["_columnCount"] = 3
+
+    def getRowCount(self):
+        return len(self._rows)
+
+    def setRowCount(self, count):
+
+        del self._rows[count:]
+        del self._rowLabels[count:]
+        while len(self._rows) < count:
+            self._rows.append([None] * self._columnCount)
+            self._rowLabels.append("")
+
+    def setColumnCount(self, count):
+
+        self.__dict__["_columnCount"] = count
+        for row in self._rows:
+            row[:] = (row + [None] * count)[:count]
+
+    RowCount = property(getRowCount, setRowCount)
+    ColumnCount = property(lambda self: self._columnCount, setColumnCount)
+
+    ## Values by column, as the Data of a GridData.
+    def getData(self):
+
+        if not self._rows:
+            return ()
+
+        return tuple([tuple([row[i] for row in self._rows]) for i in xrange(self._columnCount)])
+
+    Data = property(getData)
+
+    def BeginEdit(self):
+        pass
+
+    def EndEdit(self):
+        pass
+
+    def GetRowValues(self, index):
+        return tuple(self._rows[index])
+
+    def SetRowValues(self, index, values):
+        self._rows[index][:] = (list(values) + [None] * self._columnCount)[:self._columnCount]
+
+    def GetCell(self, column, row):
+        return self._rows[row][column]
+
+    def SetCell(self, column, row, value):
+        self._rows[row][column] = value
+
+    def GetRowLabel(self, index):
+        return self._rowLabels[index]
+
+    def SetRowLabel(self, index, label):
+        self._rowLabels[index] = label
+
+    def SetColumnLabel(self, index, label):
+
+        while len(self._columnLabels) <= index:
+            self._columnLabels.append("")
+        self._columnLabels[index] = label
+
+    def getRows(self):
+        return [list(row) for row in self._rows]
+
+##########################################################
+# APPLICATION
+##########################################################
+# ========================================================
+## Dictionary stand-in, to get the items by full name.
+class Dictionary(object):
+
+    def __init__(self, application):
+        self.application = application
+
+    ## Return an item from its full name.
+    # @param self
+    # @param name String - Full name of an object, or of one of its properties or parameters.
+    # @param throw Boolean - True to raise an error for a missing item.
+    # @return Item
+    def GetObject(self, name, throw=True):
+
+        item = self.getObject(name)
+        if item is None and throw:
+            raise Exception("Can't find : " + name)
+
+        return item
+
+    def getObject(self, name):
+
+        root = self.application.ActiveSceneRoot
+        if name == root.Name:
+            return root
+
+        parts = name.split(".")
+        item = root.getObject(parts.pop(0))
+        if item is not None and isinstance(item, Model) and parts and item.getObject(parts[0]) is not None:
+            item = item.getObject(parts.pop(0))
+
+        while item is not None and parts:
+            part = parts.pop(0)
+            if isinstance(item, X3DObject) and part == "kine":
+                item = item.Kinematics
+            elif isinstance(item, Kinematics) and part in ["local", "global"]:
+                item = getattr(item, part.capitalize())
+            elif isinstance(item, SceneItem) and item.getProperty(part) is not None:
+                item = item.getProperty(part)
+            else:
+                item = item.getParameter(part, False)
+
+        return item
+
+## Application stand-in, the root of a recorded scene.\n
+## Creations are kept in the scene items. The operators, constraints and commands are kept in their order.
+class Application(Item):
+
+    def __init__(self):
+
+        Item.__init__(self, self, "Application", "Application")
+
+        self.__dict__["revision"] = 0
+        self.__dict__["operators"] = []
+        self.__dict__["constraints"] = []
+        self.__dict__["commands"] = []
+        self.__dict__["preferences"] = {}
+
+        self.__dict__["_root"] = Model(self, "Scene_Root")
+        self.__dict__["_selection"] = Collection(application=self)
+        self.__dict__["_dictionary"] = Dictionary(self)
+
+    ActiveSceneRoot = property(lambda self: self._root)
+    ActiveProject2 = property(lambda self: Project(self))
+    ActiveProject = ActiveProject2
+    Selection = property(lambda self: self._selection)
+    Dictionary = property(lambda self: self._dictionary)
+    Preferences = property(lambda self: Preferences(self))
+
+    ## Record a command.
+    # @param self
+    # @param name String
+    # @param args List of Variant
+    def record(self, name, args):
+        self.commands.append((name, args))
+
+    def __getattr__(self, name):
+
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        canonical = getCanonicalName(type(self), name)
+        if canonical and canonical != name:
+            return getattr(self, canonical)
+
+        return lambda *args: self.recordCommand(name, args)
+
+    ## Record an unknown command.
+    # @param self
+    # @param name String
+    # @param args List of Variant
+    # @return Collection - A generic output.
+    def recordCommand(self, name, args):
+
+        self.record(name, args)
+
+        return Collection([Item(self, name, "Output")], self)
+
+    def LogMessage(self, message, severity=gear.sev_info):
+        gear.log(message, severity)
+
+    def Version(self):
+        return "recorder"
+
+    def Refresh(self, *args):
+        pass
+
+    def SetUserPref(self, name, value):
+        self.preferences[name] = value
+
+    def GetUserPref(self, name):
+        return self.preferences.get(name, 0)
+
+    def InspectObj(self, *args):
+        return False
+
+    def SelectObj(self, objects=None, *args):
+        self._selection.items = getItems(self, objects)
+
+    def DeselectAll(self):
+        self._selection.items = []
+
+    def ApplyFlexEnv(self, connections, *args):
+
+        parts = connections.split(";")
+        return Collection([obj.ApplyEnvelope(parts[1]) for obj in getItems(self, parts[0])], self)
+
+    def RemoveFlexEnv(self, objects):
+
+        for obj in getItems(self, objects):
+            op = obj.ActivePrimitive.getOperator("envelopop")
+            if op is not None:
+                op.remove()
+
+    ## Delete objects, properties and groups. The deleted objects and their descendants are removed from the groups.
+    # @param self
+    # @param objects Objects to delete.
+    def DeleteObj(self, objects):
+
+        for item in getItems(self, objects):
+            if isinstance(item, X3DObject) and item._parent is not None:
+                deleted = [item] + item.getDescendants()
+                for obj in deleted:
+                    obj.Model.removeObject(obj)
+                item._parent._children.remove(item)
+                removeGroupMembers(item.Model, deleted)
+            elif isinstance(item, Property) and item in item._parent._properties:
+                item._parent._properties.remove(item)
+            elif isinstance(item, Group) and item in item._parent._groups:
+                item._parent._groups.remove(item)
+
+    def ApplyOp(self, type, connections="", *args):
+
+        op = Operator(self, type)
+        parts = isinstance(connections, basestring) and connections.split(";") or [connections]
+        op.AddOutputPort(parts[0])
+        for part in parts[1:]:
+            op.AddInputPort(part)
+        op.Connect()
+
+        return Collection([op], self)
+
+    def ApplyOperator(self, type, connections="", *args):
+
+        op = Operator(self, type)
+        op.AddOutputPort(connections)
+        op.Connect()
+
+        return op
+
+    def SetValue(self, target, value, *args):
+
+        for param in getItems(self, target):
+            param.Value = value
+
+    def GetValue(self, target, *args):
+
+        items = getItems(self, target)
+        if items and isinstance(items[0], Parameter):
+            return items[0].Value
+
+        return items and items[0] or None
+
+## Project stand-in, in the current directory.
+class Project(Item):
+
+    def __init__(self, application):
+        Item.__init__(self, application, "Project", "Project")
+
+    OriginPath = property(lambda self: os.getcwd())
+
+## Preferences stand-in.
+class Preferences(Item):
+
+    def __init__(self, application):
+        Item.__init__(self, application, "Preferences", "Preferences")
+
+    def Categories(self, name):
+        return Item(self._application, name, "Category", self)
+
+## XSIFactory stand-in.
+class Factory(object):
+
+    def __init__(self, application):
+        self.application = application
+
+    def CreateObject(self, progid):
+
+        if progid == "XSI.Collection":
+            return Collection(application=self.application)
+
+        return Operator(self.application, progid)
+
+    def CreateScriptedOp(self, name, code="", language=""):
+        return Operator(self.application, name)
+
+    def CreateParamDef(self, scriptName, valueType, *args):
+        return ParamDef(scriptName, valueType, *args)
+
+    def CreateParamDef2(self, scriptName, valueType, value=None, minimum=None, maximum=None):
+        return ParamDef(scriptName, valueType, None, 0, "", "", value, minimum, maximum)
+
+    def CreateActiveXObject(self, progid):
+        return Item(self.application, progid, progid)
+
+    def CreateGridData(self):
+        return GridData(self.application)
+
+## Return an object, as win32com Dispatch() does for the recorded items.
+# @param obj Item
+# @return Item
+def dispatch(obj, *args):
+    return obj
+
+# The application of the active recording, to resolve the names of collections created outside of the scene
+APPLICATION = None
+
+##########################################################
+# RECORDER
+##########################################################
+# ========================================================
+## Record a build in a new scene.\n
+## start() swaps the recorder objects for the xsi objects in all the loaded gear modules, stop() puts
+## the xsi objects back.
+class Recorder(object):
+
+    ## Init Method.
+    # @param self
+    def __init__(self):
+
+        self.application = Application()
+        self.factory = Factory(self.application)
+        self.uitoolkit = Item(self.application, "UIToolkit", "UIToolkit")
+        self.utils = Item(self.application, "Utils", "Utils")
+
+        self.patches = []
+
+    ## Swap the recorder objects for the xsi objects.
+    # @param self
+    def start(self):
+
+        global APPLICATION
+
+        import gear.xsi as xsi_module
+
+        replacements = {"xsi":self.application,
+                        "Application":self.application,
+                        "XSIFactory":self.factory,
+                        "XSIUIToolkit":self.uitoolkit,
+                        "XSIUtils":self.utils,
+                        "Dispatch":dispatch,
+                        "dynDispatch":dispatch}
+
+        originals = {}
+        for name in GLOBALS:
+            originals[name] = getattr(xsi_module, name)
+
+        for module in sys.modules.values():
+            if module is None or not module.__name__.startswith("gear"):
+                continue
+
+            for name in GLOBALS:
+                if module.__dict__.get(name) is originals[name]:
+                    self.patches.append((module, name, originals[name]))
+                    module.__dict__[name] = replacements[name]
+
+        APPLICATION = self.application
+
+    ## Put the xsi objects back.
+    # @param self
+    def stop(self):
+
+        global APPLICATION
+
+        for module, name, original in self.patches:
+            module.__dict__[name] = original
+
+        self.patches = []
+        APPLICATION = None
+
+    ## Return the build plan of the recorded scene.
+    # @param self
+    # @param model Model - The model to list. None for the whole scene.
+    # @return BuildPlan
+    def getPlan(self, model=None):
+        return BuildPlan(self.application, model)
+
+##########################################################
+# BUILD PLAN
+##########################################################
+## Return a value of the recorded scene as json data.
+# @param value Variant
+# @return Variant
+def getValueData(value):
+
+    if value is None or isinstance(value, (bool, basestring)):
+        return value
+    if isinstance(value, (int, long)):
+        return value
+    if isinstance(value, float):
+        return round(value, DECIMALS)
+    if isinstance(value, FCurve):
+        return [[getValueData(v) for v in key] for key in value.getKeyValues()]
+    if isinstance(value, GridData):
+        return [[getValueData(v) for v in row] for row in value.getRows()]
+    if isinstance(value, Item):
+        return value.FullName
+    if isinstance(value, (list, tuple, Collection)):
+        return [getValueData(v) for v in value]
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return str(value)
+    if hasattr(value, "Get2"):
+        return getValueData(value.Get2())
+    if hasattr(value, "Matrix4"):
+        return getValueData(value.Matrix4.Get2())
+
+    return str(value)
+
+# ========================================================
+## What a recorded build created : objects, properties, parameters, operators, constraints, expressions and groups.\n
+## The plan is read from the final state of the scene. Deleted objects aren't listed.
+class BuildPlan(object):
+
+    ## Init Method.
+    # @param self
+    # @param application Application - The recorded scene.
+    # @param model Model - The model to list. None for the whole scene.
+    def __init__(self, application, model=None):
+
+        self.objects = []
+        self.properties = []
+        self.parameters = []
+        self.operators = []
+        self.constraints = []
+        self.expressions = []
+        self.groups = []
+        self.commands = []
+
+        if model is None:
+            model = application.ActiveSceneRoot
+
+        objects = [model] + model.getDescendants()
+        in_model = set(objects)
+
+        for obj in objects:
+            self.objects.append({"name":obj.FullName,
+                                 "type":obj.Type,
+                                 "parent":obj.Parent is not None and obj.Parent.FullName or None,
+                                 "transform":getValueData(obj.getGlobalTransform().Matrix4.Get2())})
+
+            self.addParameters(obj)
+            self.addParameters(obj.ActivePrimitive)
+            self.addParameters(obj.Kinematics.Local)
+            for prop in obj._properties:
+                self.properties.append({"name":prop.FullName, "type":prop.Type, "branch":prop.Branch})
+                self.addParameters(prop)
+
+            if isinstance(obj, Model):
+                for group in obj._groups:
+                    self.groups.append({"name":group.FullName, "members":[item.FullName for item in group._members]})
+                    self.addParameters(group)
+                    for prop in group._properties:
+                        self.properties.append({"name":prop.FullName, "type":prop.Type, "branch":prop.Branch})
+                        self.addParameters(prop)
+
+        for cns in application.constraints:
+            if cns.Parent3DObject in in_model:
+                self.constraints.append({"name":cns.FullName,
+                                         "type":cns.Type,
+                                         "constraining":[item.FullName for item in cns._constraining],
+                                         "compensate":bool(cns._compensate)})
+                self.addParameters(cns)
+
+        for op in application.operators:
+            if op._outputs and isinstance(op._outputs[0], Item) and op._outputs[0].Parent3DObject not in in_model:
+                continue
+
+            self.operators.append({"name":op.FullName,
+                                   "type":op.Type,
+                                   "outputs":getValueData(op._outputs),
+                                   "inputs":getValueData(op._inputs)})
+            self.addParameters(op)
+
+        for name, args in application.commands:
+            self.commands.append({"name":name, "args":getValueData(args)})
+
+    ## Add the parameters of an item set or added by the build.
+    # @param self
+    # @param item Item
+    def addParameters(self, item):
+
+        for param in item.getParameters():
+            if not param.isRecorded():
+                continue
+
+            self.parameters.append({"name":param.FullName, "value":getValueData(param.Value)})
+
+            if isinstance(param.Source, Expression):
+                self.expressions.append({"parameter":param.FullName, "definition":param.Source.Definition})
+
+    ## Return the number of entries of each list.
+    # @param self
+    # @return Dictionary
+    def getCounts(self):
+
+        counts = {}
+        for name, entries in self.getData().items():
+            counts[name] = len(entries)
+
+        return counts
+
+    ## Return the plan as json data.
+    # @param self
+    # @return Dictionary
+    def getData(self):
+
+        return {"objects":self.objects,
+                "properties":self.properties,
+                "parameters":self.parameters,
+                "operators":self.operators,
+                "constraints":self.constraints,
+                "expressions":self.expressions,
+                "groups":self.groups,
+                "commands":self.commands}
+
+    ## Write the plan to a json file, sorted and indented for diffing.
+    # @param self
+    # @param path String - Path of the file.
+    def write(self, path):
+
+        f = open(path, "w")
+        try:
+            json.dump(self.getData(), f, indent=1, sort_keys=True)
+        finally:
+            f.close()
@@ -0,0 +1,221 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+## @package gear.xsi.registry
+# @author Jeremie Passerin
+#
+# @brief name to object index of a model, instead of repeated FindChild() calls.
+#
+# Rig and guide objects are named component_localName, the component name being the first two
+# parts of the name (ie. 'arm_L0_fk0_ctl' is 'fk0_ctl' of component 'arm_L0').
+
+##########################################################
+# GLOBAL
+##########################################################
+
+## Registries by model full name. A registry is made again when the model with this name is a new object.
+REGISTRIES = {}
+
+## Registry of the model being built, if any. register() adds the new objects to it.
+ACTIVE = None
+
+# Component and local names by full name, cleared above SPLIT_NAMES_SIZE names
+SPLIT_NAMES = {}
+SPLIT_NAMES_SIZE = 10000
+
+##########################################################
+# REGISTRY
+##########################################################
+# ========================================================
+## Index of the objects of a model by name and by component.
+class ObjectRegistry(object):
+
+    ## Init Method.
+    # @param self
+    # @param model Model - The indexed model.
+    # @param scan Boolean - True to index all the objects already under the model.
+    def __init__(self, model, scan=True):
+
+        self.model = model
+        ## ObjectID of the indexed model.
+        self.modelID = model.ObjectID
+
+        ## Objects by full name.
+        self.objects = {}
+        ## Dictionary of objects by local name, by component name.
+        self.components = {}
+        ## Number of objects created while the registry was active.
+        self.created = 0
+
+        if scan:
+            self.scan()
+
+    ## Index all the objects under the model, with one FindChildren() call.
+    # @param self
+    def scan(self):
+
+        self.objects = {}
+        self.components = {}
+        for obj in self.model.FindChildren():
+            self.add(obj)
+
+    ## Add an object to the index.
+    # @param self
+    # @param obj X3DObject - The object to add.
+    # @param name String - Name of the object. None to read it from the object.
+    def add(self, obj, name=None):
+
+        if name is None:
+            name = obj.Name
+
+        self.objects[name] = obj
+
+        comp_name, local_name = splitName(name)
+        if comp_name not in self.components:
+            self.components[comp_name] = {}
+        self.components[comp_name][local_name] = obj
+
+    ## Remove an object from the index.
+    # @param self
+    # @param name String - Name of the object.
+    def remove(self, name):
+
+        if name not in self.objects:
+            return
+
+        del self.objects[name]
+
+        comp_name, local_name = splitName(name)
+        if comp_name in self.components and local_name in self.components[comp_name]:
+            del self.components[comp_name][local_name]
+
+    ## Return an object by name.\n
+    ## Objects missing from the index are searched in the model and added to the index when found.
+    # @param self
+    # @param name String - Name of the object.
+    # @param check Boolean - True to check that the indexed object still exists with this name, if the scene could have changed since the index was built.
+    # @return X3DObject - None if there is no object with this name.
+    def get(self, name, check=False):
+
+        obj = self.objects.get(name)
+        if obj is not None and check:
+            try:
+                if obj.Name != name:
+                    obj = None
+            except:
+                obj = None
+
+            if obj is None:
+                self.remove(name)
+
+        if obj is None:
+            obj = self.model.FindChild(name)
+            if not obj:
+                return None
+
+            self.add(obj, name)
+
+        return obj
+
+    ## Return an object by component and local name.
+    # @param self
+    # @param comp_name String - Name of the component (ie. 'arm_L0').
+    # @param local_name String - Name of the object in the component (ie. 'fk0_ctl').
+    # @param check Boolean - True to check that the indexed object still exists.
+    # @return X3DObject - None if there is no such object.
+    def getFromComponent(self, comp_name, local_name, check=False):
+        return self.get(comp_name + "_" + local_name, check)
+
+    ## Return the indexed objects of a component.
+    # @param self
+    # @param comp_name String - Name of the component.
+    # @return Dictionary - Objects by local name.
+    def getComponentObjects(self, comp_name):
+        return dict(self.components.get(comp_name, {}))
+
+# ========================================================
+## Return the registry of a model.\n
+## The registry is made again when the model isn't the one it was made for, as a model deleted and built again with the same name.
+# @param model Model
+# @param rebuild Boolean - True to index the model again.
+# @return ObjectRegistry
+def getRegistry(model, rebuild=False):
+
+    key = model.FullName
+    if key not in REGISTRIES or REGISTRIES[key].modelID != model.ObjectID:
+        REGISTRIES[key] = ObjectRegistry(model)
+    elif rebuild:
+        REGISTRIES[key].model = model
+        REGISTRIES[key].scan()
+
+    return REGISTRIES[key]
+
+## Create an empty registry for a new model, and set it as the active registry.
+# @param model Model
+# @return ObjectRegistry
+def startRegistry(model):
+
+    global ACTIVE
+    ACTIVE = ObjectRegistry(model, False)
+    REGISTRIES[model.FullName] = ACTIVE
+
+    return ACTIVE
+
+## Set an existing registry as the active registry, to add the objects of a rebuild.
+# @param registry ObjectRegistry
+# @return ObjectRegistry
+def resumeRegistry(registry):
+
+    global ACTIVE
+    ACTIVE = registry
+
+    return ACTIVE
+
+## Stop adding the new objects to the active registry.
+def stopRegistry():
+
+    global ACTIVE
+    ACTIVE = None
+
+## Add a new object to the active registry, if any.
+# @param obj X3DObject - The new object.
+# @param name String - Name of the object. None to read it from the object.
+def register(obj, name=None):
+
+    if ACTIVE is not None:
+        ACTIVE.add(obj, name)
+        ACTIVE.created += 1
+
+## Split a full name in component name and local name.
+# @param name String - Full name (ie. 'arm_L0_fk0_ctl').
+# @return Tuple of String - Component name and local name (ie. 'arm_L0', 'fk0_ctl').
+def splitName(name):
+
+    if name not in SPLIT_NAMES:
+        if len(SPLIT_NAMES) >= SPLIT_NAMES_SIZE:
+            SPLIT_NAMES.clear()
+
+        parts = name.split("_")
+        SPLIT_NAMES[name] = ("_".join(parts[:2]), "_".join(parts[2:]))
+
+    return SPLIT_NAMES[name]
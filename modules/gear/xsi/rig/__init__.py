@@ -35,6 +35,8 @@ import datetime
 import getpass
 
 import gear
+import gear.profiler as prf
+import gear.snapshot as snp
 from gear.xsi import xsi, c, dynDispatch, XSIFactory, XSIMath
 from gear.xsi.rig.guide import RigGuide
 
@@ -49,6 +51,12 @@ import gear.xsi.io as io
 import gear.xsi.geometry as geo
 import gear.xsi.envelope as env
 import gear.xsi.animation as ani
+import gear.xsi.log as log
+import gear.xsi.registry as reg
+import gear.xsi.recorder as rec
+
+# Last rig built from each guide model, by guide model full name
+RIGS = {}
 
 ##########################################################
 # RIG
@@ -74,10 +82,34 @@ class Rig(object):
 
         self.plog = uit.ProgressLog(True, False)
 
+        self.model = None
+        self.modelName = None
+        self.registry = None
+
+        ## Hashes of the guide of the last build, to find the components to rebuild.
+        self.optionsHash = None
+        self.hashes = {}
+
+        ## DependencyGraph of the components of the last build.
+        self.graph = None
+
+        ## BuildProfiler of the current build, None when the build isn't profiled.
+        self.profiler = None
+
+        ## Number of component steps between two refreshes. 0 to only refresh at the end of each step.
+        self.refreshStep = 1
+        self.stepCount = 0
+
     # =====================================================
     ## Build the rig from selected guides.
     # @param self
-    def buildFromSelection(self):
+    # @param profile Boolean - True to profile the build and log the report.
+    # @param profile_path String - Path of the Chrome trace file to write. None to only log the report.
+    # @param batch Boolean - True to build without refresh and logs. See build().
+    # @param refresh_step Integer - Component steps between refreshes in batch mode.
+    # @param use_snapshot Boolean - True to load the components unchanged since the last build of the model from its snapshot.
+    # @param incremental Boolean - True to only rebuild the changed components in the last rig built from this guide. See rebuild().
+    def buildFromSelection(self, profile=False, profile_path=None, batch=False, refresh_step=0, use_snapshot=False, incremental=False):
 
         # Cet the option first otherwise the change wight might do won't be taken
         sel = xsi.Selection(0)
@@ -95,27 +127,74 @@ class Rig(object):
             return False
 
         # Check guide is valid
-        self.guide.setFromSelection()
+        self.guide.setFromSelection(use_snapshot)
         if not self.guide.valid:
             return
 
+        # Rebuild
+        if incremental and guide_model.FullName in RIGS:
+            model = RIGS[guide_model.FullName].rebuild(self.guide)
+            if model:
+                return model
+
         # Build
-        self.build()
+        model = self.build(profile, profile_path, batch, refresh_step)
+        RIGS[guide_model.FullName] = self
+
+        return model
 
     ## Build the rig from xml definition file.
     # @param self
     # @param path String - Path to an xml definition.
-    def buildFromFile(self, path=None):
+    # @param profile Boolean - True to profile the build and log the report.
+    # @param profile_path String - Path of the Chrome trace file to write. None to only log the report.
+    # @param batch Boolean - True to build without refresh and logs. See build().
+    # @param refresh_step Integer - Component steps between refreshes in batch mode.
+    def buildFromFile(self, path=None, profile=False, profile_path=None, batch=False, refresh_step=0):
 
         self.guide.setFromFile(path)
         if not self.guide.valid:
             return
 
-        self.build()
+        return self.build(profile, profile_path, batch, refresh_step)
+
+    ## Build the rig from a guide snapshot, without reading the guide in the scene.
+    # @param self
+    # @param snapshot GuideSnapshot or String - The snapshot or the path of a snapshot file.
+    # @param profile Boolean - True to profile the build and log the report.
+    # @param profile_path String - Path of the Chrome trace file to write. None to only log the report.
+    # @param batch Boolean - True to build without refresh and logs. See build().
+    # @param refresh_step Integer - Component steps between refreshes in batch mode.
+    def buildFromSnapshot(self, snapshot, profile=False, profile_path=None, batch=False, refresh_step=0):
+
+        if isinstance(snapshot, basestring):
+            snapshot = snp.readSnapshot(snapshot)
+            if not snapshot:
+                return
+
+        self.guide.setFromSnapshot(snapshot)
+        if not self.guide.valid:
+            return
+
+        return self.build(profile, profile_path, batch, refresh_step)
 
     # =====================================================
+    ## Build the rig from the guide.\n
+    ## In batch mode, the command and message logs are turned off during the build and the scene is
+    ## only refreshed at the end of each step, or every refresh_step component steps. The logs are
+    ## restored even if the build fails.
     # @param self
-    def build(self):
+    # @param profile Boolean - True to profile the build and log the report.
+    # @param profile_path String - Path of the Chrome trace file to write. None to only log the report.
+    # @param batch Boolean - True to build without refresh and logs.
+    # @param refresh_step Integer - Component steps between refreshes in batch mode. 0 to only refresh at the end of each step.
+    # @param dry_run Boolean - True to build against the recorder instead of Softimage. See dryRun().
+    # @param plan_path String - Path of the json build plan to write in a dry run. None to only return the plan.
+    # @return Model - The rig model. BuildPlan in a dry run.
+    def build(self, profile=False, profile_path=None, batch=False, refresh_step=0, dry_run=False, plan_path=None):
+
+        if dry_run:
+            return self.dryRun(plan_path)
 
         self.options = self.guide.values
         self.guides = self.guide.components
@@ -127,15 +206,293 @@ class Rig(object):
         xsi.SetUserPref("SI3D_NODETRANSFORM_CHILD_COMPENSATE", False)
         xsi.SetUserPref("SI3D_CONSTRAINT_COMPENSATION_MODE", False)
 
-        self.initialHierarchy()
-        self.processComponents()
-        self.finalize()
+        profiler = None
+        if profile or profile_path:
+            profiler = prf.BuildProfiler(self.countObjects)
+            profiler.start()
+        self.profiler = profiler
+
+        if batch:
+            self.refreshStep = refresh_step
+            log_values = log.suspendLog()
+        else:
+            self.refreshStep = 1
+
+        self.stepCount = 0
+
+        self.optionsHash = self.guide.getOptionsHash()
+        self.hashes = self.guide.getHashes()
+
+        try:
+            self.callStep("rig", "Hierarchy", self.initialHierarchy)
+            self.processComponents()
+            self.callStep("rig", "Finalize", self.finalize)
+        finally:
+            reg.stopRegistry()
+            # The profiler only records this build, a later rebuild isn't profiled
+            self.profiler = None
+            if profiler:
+                profiler.stop()
+            if batch:
+                log.restoreLog(log_values)
+                xsi.Refresh()
 
         gear.log("= SN RIG DONE ======================== [ " + self.plog.getTime() + " ] ======")
         self.plog.hideBar()
 
+        if profiler:
+            profiler.logTable()
+            if profile_path:
+                profiler.writeTrace(profile_path)
+                gear.log("Build profile written : " + profile_path)
+
         return self.model
 
+    ## Build the rig against the recorder and return what the build would create.\n
+    ## Every component goes through all its steps, nothing is created in the scene. The registries of
+    ## the scene are left as they were.
+    # @param self
+    # @param path String - Path of the json build plan to write. None to only return the plan.
+    # @return BuildPlan
+    def dryRun(self, path=None):
+
+        # The component modules must be loaded before the recorder replaces the xsi objects
+        for guide in self.guide.components.values():
+            __import__("gear.xsi.rig.component."+guide.type, globals(), locals(), ["*"], -1)
+
+        registries = dict(reg.REGISTRIES)
+        recorder = rec.Recorder()
+        recorder.start()
+        try:
+            self.build()
+        finally:
+            recorder.stop()
+            reg.REGISTRIES.clear()
+            reg.REGISTRIES.update(registries)
+
+        plan = recorder.getPlan(self.model)
+
+        counts = plan.getCounts()
+        gear.log("Dry run : " + ", ".join(["%s %s"%(counts[name], name) for name in sorted(counts.keys())]))
+
+        if path:
+            plan.write(path)
+            gear.log("Build plan written : " + path)
+
+        return plan
+
+    ## Rebuild the components whose guide changed since the last build, in the existing rig model.\n
+    ## The component hashes are compared with the ones of the last build. The changed, new and removed components
+    ## and their dependents are deleted, then the new ones go through all the steps and connect to the unchanged
+    ## components in step 03. The ui hosts they used get their layout and logic back from the unchanged components.
+    # @param self
+    # @param guide RigGuide - The new guide.
+    # @return Model - The rig model. False if the rig needs a full build (options changed or model deleted).
+    def rebuild(self, guide):
+
+        if self.model is None or not xsi.Dictionary.GetObject(self.modelName, False):
+            return False
+
+        if guide.getOptionsHash() != self.optionsHash:
+            gear.log("The rig options changed, the rig needs a full build", gear.sev_warning)
+            return False
+
+        hashes = guide.getHashes()
+        changed = [name for name in guide.componentsIndex if self.hashes.get(name) != hashes[name]]
+        removed = [name for name in self.componentsIndex if name not in guide.components]
+        affected = self.getDependents(guide, changed, removed)
+
+        if not affected:
+            gear.log("The rig is up to date")
+            return self.model
+
+        gear.log("= SN RIG REBUILD =============================================")
+        gear.log("Rebuilding : " + ", ".join(affected))
+        self.plog.start("Sn Rig Sytem started")
+
+        self.guide = guide
+        self.options = guide.values
+        self.guides = guide.components
+        self.refreshStep = 1
+        self.stepCount = 0
+
+        try:
+            reg.resumeRegistry(self.registry)
+            self.callStep("rig", "Delete", self.deleteComponents, affected)
+            rebuilt = self.callStep("rig", "Init", self.initComponents, [name for name in affected if name in guide.components])
+            for compName in rebuilt:
+                self.callStep(compName, "Precompute", self.components[compName].precompute, hashes[compName])
+
+            for i, name in enumerate(MainComponent.steps):
+                for compName in rebuilt:
+                    component = self.components[compName]
+                    self.plog.log(name, component.fullName + " ("+component.type+")", True)
+                    self.callStep(component.fullName, name, component.stepMethods[i])
+                    self.refresh()
+
+                # Stop at the same step as the full build
+                if self.options["step"] >= 0 and i >= self.options["step"]:
+                    break
+
+            self.callStep("rig", "Finalize", self.finalizeRebuild, rebuilt)
+        finally:
+            reg.stopRegistry()
+
+        self.hashes = hashes
+
+        gear.log("= SN RIG DONE ======================== [ " + self.plog.getTime() + " ] ======")
+        self.plog.hideBar()
+
+        return self.model
+
+    ## Return the components to rebuild for some changed and removed components.\n
+    ## These are the changed components, the removed ones and their dependents in the dependency graphs of the new and of the last guide.
+    # @param self
+    # @param guide RigGuide - The new guide.
+    # @param changed List of String - Full names of the changed and new components.
+    # @param removed List of String - Full names of the removed components.
+    # @return List of String - Full names of the components, in build order, the removed ones last.
+    def getDependents(self, guide, changed, removed):
+
+        names = list(changed)
+        if removed:
+            names.extend([name for name in self.guide.getDependencyGraph().getDependents(removed) if name in guide.components])
+
+        graph = guide.getDependencyGraph()
+        dependents = graph.getDependents(names)
+        order = graph.getOrder() or guide.componentsIndex
+
+        return [name for name in order if name in dependents] + removed
+
+    ## Delete the objects and the ui parameters of some components.\n
+    ## The ui hosts they used are reset and get the layout of their other components back.
+    # @param self
+    # @param names List of String - Full names of the components.
+    def deleteComponents(self, names):
+
+        deleted = [self.components[name] for name in names if name in self.components]
+        uihosts = {}
+        for name in self.componentsIndex:
+            uihosts[name] = getattr(self.components[name], "uihost", None)
+
+        # Ui hosts kept by the rebuild
+        hosts = [self.ui]
+        for name in self.componentsIndex:
+            component = self.components[name]
+            if name not in names and component.ui is not None:
+                hosts.append(component.ui)
+
+        for host in hosts:
+            if not [component for component in deleted if uihosts[component.fullName] is host]:
+                continue
+
+            for component in deleted:
+                if uihosts[component.fullName] is host:
+                    for prop in [host.anim_prop, host.setup_prop]:
+                        for param in [param for param in prop.Parameters if param.ScriptName.startswith(component.fullName + "_")]:
+                            prop.RemoveParameter(param)
+
+            host.resetLayoutAndLogic()
+            if host is self.ui:
+                self.addMainTabs()
+
+            for name in self.componentsIndex:
+                component = self.components[name]
+                if name not in names and uihosts[name] is host:
+                    component.setUI()
+
+        # Objects
+        objects = XSIFactory.CreateObject("XSI.Collection")
+        for component in deleted:
+            for obj in self.model.FindChildren(component.fullName + "_*"):
+                self.registry.remove(obj.Name)
+                objects.Add(obj)
+
+            del self.components[component.fullName]
+            self.componentsIndex.remove(component.fullName)
+
+        if objects.Count:
+            xsi.DeleteObj(objects)
+
+    ## Create the components of some guides.
+    # @param self
+    # @param names List of String - Full names of the component guides.
+    # @return List of String - Full names of the new components.
+    def initComponents(self, names):
+
+        rebuilt = []
+        for name in names:
+            guide = self.guides[name]
+
+            module_name = "gear.xsi.rig.component."+guide.type
+            module = __import__(module_name, globals(), locals(), ["*"], -1)
+            Component = getattr(module , "Component")
+
+            component = Component(self, guide)
+            self.components[component.fullName] = component
+            self.componentsIndex.append(component.fullName)
+            rebuilt.append(component.fullName)
+
+        return rebuilt
+
+    ## Add the rebuilt components to the rig groups, the mirror template and the rest pose, and update the build date.
+    # @param self
+    # @param names List of String - Full names of the rebuilt components.
+    def finalizeRebuild(self, names):
+
+        self.plog.log("Filling layout and logic")
+        self.ui.fillLayoutAndLogic()
+        for name in self.componentsIndex:
+            if self.components[name].ui is not None:
+                self.components[name].ui.fillLayoutAndLogic()
+
+        self.plog.log("Creating groups")
+        for name in names:
+            for group_name, objects in self.components[name].groups.items():
+                collection = XSIFactory.CreateObject("XSI.Collection")
+                collection.AddItems(objects)
+                if group_name in self.groups:
+                    self.groups[group_name].AddMember(collection)
+                else:
+                    self.groups[group_name] = self.model.AddGroup(collection, group_name + "_grp")
+                    self.setGroupOptions(group_name)
+
+        if self.options["mode"] == 0:
+            self.addMirroringRules(names)
+
+        self.storeRestPose()
+
+        # The date is the signature of the rig for the synoptic
+        pDate = self.model.Properties("info").Parameters("date")
+        pDate.SetCapabilityFlag(c.siReadOnly, False)
+        pDate.Value = str(datetime.datetime.now())
+        pDate.SetCapabilityFlag(c.siReadOnly, True)
+
+    ## Call a build step, through the profiler if the build is profiled.
+    # @param self
+    # @param name String - Name of the component or of the build phase.
+    # @param step String - Name of the step.
+    # @param method Function - The step method.
+    # @param args Arguments of the method.
+    # @return The value returned by the method.
+    def callStep(self, name, step, method, *args):
+
+        if self.profiler:
+            return self.profiler.call(name, step, method, *args)
+
+        return method(*args)
+
+    ## Return the number of objects created by the build, as counted by the registry of the rig.\n
+    ## Only the objects created with the primitive, curve and component tools are registered.
+    # @param self
+    # @return Integer
+    def countObjects(self):
+
+        if self.registry is None:
+            return 0
+
+        return self.registry.created
+
     # =====================================================
     ## Build the initial hierarchy of the rig
     # Create the rig model, the main properties, and a couple of base organisation nulls
@@ -148,6 +505,8 @@ class Rig(object):
         # --------------------------------------------------
         # Model
         self.model = xsi.ActiveSceneRoot.AddModel(None, self.options["rigName"])
+        self.modelName = self.model.FullName
+        self.registry = reg.startRegistry(self.model)
         self.model.Properties("visibility").Parameters("viewvis").Value = False
 
         # --------------------------------------------------
@@ -188,27 +547,18 @@ class Rig(object):
         item = group.addString(pComments.ScriptName, "", True, 120)
         item.setAttribute(c.siUINoLabel, True)
 
-        self.info_prop.Parameters("layout").Value = self.info_layout.getValue()
+        ppg.setPSetCode(self.info_prop, self.info_layout.getValue())
 
         # --------------------------------------------------
         # UI SETUP AND ANIM
         self.ui = UIHost(self.global_ctl)
 
-        # Setup_Ctrl
-        self.setup_mainTab = self.ui.setup_layout.addTab("Main")
-
         # Anim_Ctrl
-        self.anim_mainTab = self.ui.anim_layout.addTab("Main")
         self.pRigScale    = self.ui.anim_prop.AddParameter2("rigScale", c.siDouble, 1, 0.001, None, .001, 3, c.siClassifUnknown, c.siAnimatable|c.siKeyable)
         self.pOGLLevel    = self.ui.anim_prop.AddParameter3("oglLevel", c.siInt4, 0, 0, 2, False, False)
         self.pResolutions = self.ui.anim_prop.AddParameter3("resolutions", c.siInt4, 0, 0, None, False, False)
 
-        group = self.anim_mainTab.addGroup("Animate")
-        group.addItem(self.pRigScale.ScriptName, "Global Scale")
-
-        group = self.anim_mainTab.addGroup("Performance")
-        #group.addEnumControl(self.pResolutions.ScriptName, ["default", 0], "Resolutions", c.siControlCombo)
-        group.addItem(self.pOGLLevel.ScriptName, "OGL Level")
+        self.addMainTabs()
 
         # scale expression
         for s in "xyz":
@@ -220,6 +570,23 @@ class Rig(object):
             self.shd_org = self.model.AddNull("shd_org")
             self.addToGroup(self.shd_org, "hidden")
 
+    ## Add the main tabs of the rig to the layouts of the global ui host.
+    # @param self
+    def addMainTabs(self):
+
+        # Setup_Ctrl
+        self.setup_mainTab = self.ui.setup_layout.addTab("Main")
+
+        # Anim_Ctrl
+        self.anim_mainTab = self.ui.anim_layout.addTab("Main")
+
+        group = self.anim_mainTab.addGroup("Animate")
+        group.addItem(self.pRigScale.ScriptName, "Global Scale")
+
+        group = self.anim_mainTab.addGroup("Performance")
+        #group.addEnumControl(self.pResolutions.ScriptName, ["default", 0], "Resolutions", c.siControlCombo)
+        group.addItem(self.pOGLLevel.ScriptName, "OGL Level")
+
     # =====================================================
     def processComponents(self):
 
@@ -227,19 +594,31 @@ class Rig(object):
 
         self.plog.reset(len(self.guides), 1)
 
+        # Build order
+        self.graph = self.guide.getDependencyGraph()
+        order = self.graph.getOrder()
+        if order is None:
+            gear.log("Component dependency cycle : %s. The components are built in the guide order."%self.graph.getCycleAsString(self.graph.getCycle()), gear.sev_warning)
+            order = self.guide.componentsIndex
+
         # Init
-        for guide in self.guides.values():
+        for name in order:
+            guide = self.guides[name]
             self.plog.log("Init", guide.fullName + " ("+guide.type+")", True)
 
             module_name = "gear.xsi.rig.component."+guide.type
             module = __import__(module_name, globals(), locals(), ["*"], -1)
             Component = getattr(module , "Component")
 
-            component = Component(self, guide)
+            component = self.callStep(guide.fullName, "Init", Component, self, guide)
             if component.fullName not in self.componentsIndex:
                 self.components[component.fullName] = component
                 self.componentsIndex.append(component.fullName)
 
+        # Precompute the guide math, before any component object is created
+        for compName in self.componentsIndex:
+            self.callStep(compName, "Precompute", self.components[compName].precompute, self.hashes.get(compName))
+
         # Creation steps
         self.steps = MainComponent.steps
 
@@ -249,12 +628,51 @@ class Rig(object):
             for count, compName in enumerate(self.componentsIndex):
                 component = self.components[compName]
                 self.plog.log(name, component.fullName + " ("+component.type+")", True)
-                component.stepMethods[i]()
+                self.callStep(component.fullName, name, component.stepMethods[i])
+                self.refresh()
+
+            if not self.refreshStep:
                 xsi.Refresh()
 
             if self.options["step"] >= 0 and i >= self.options["step"]:
                 break
 
+    ## Count a component step and refresh the scene every refreshStep steps.
+    # @param self
+    def refresh(self):
+
+        self.stepCount += 1
+        if self.refreshStep and not self.stepCount % self.refreshStep:
+            xsi.Refresh()
+
+    ## Set the visibility and selectability of a new group, according to the options of the rig.\n
+    ## Called by the build and by the rebuild for the groups it creates.
+    # @param self
+    # @param name String - Name of the group, without the _grp suffix.
+    def setGroupOptions(self, name):
+
+        group = self.groups[name]
+
+        # Hidden
+        if name == "hidden" and self.options["setHidden"]:
+            group.Parameters("viewvis").Value = 0
+            group.Parameters("rendvis").Value = 0
+
+        # Unselectable
+        elif name == "unselectable" and self.options["setUnselectable"]:
+            group.Parameters("selectability").Value = 0
+
+        # Deformers
+        elif name == "deformers" and self.options["setDeformers"]:
+            group.Parameters("viewvis").Value = 0
+            group.Parameters("rendvis").Value = 0
+
+        # Geometries
+        elif name == "geometries" and self.options["setGeometries"]:
+            group.Parameters("selectability").Value = 0
+            prop = group.AddProperty("GeomApprox")
+            par.addExpression(prop.Parameters("gapproxmosl"), self.pOGLLevel)
+
     # =====================================================
     ## Build the initial hierarchy of the rig
     # @param self
@@ -278,25 +696,8 @@ class Rig(object):
             collection.AddItems(objects)
             self.groups[name] = self.model.AddGroup(collection, name + "_grp")
 
-        # Hidden
-        if self.options["setHidden"]:
-            self.groups["hidden"].Parameters("viewvis").Value = 0
-            self.groups["hidden"].Parameters("rendvis").Value = 0
-
-        # Unselectable
-        if self.options["setUnselectable"]:
-            self.groups["unselectable"].Parameters("selectability").Value = 0
-
-        # Deformers
-        if self.options["setDeformers"]:
-            self.groups["deformers"].Parameters("viewvis").Value = 0
-            self.groups["deformers"].Parameters("rendvis").Value = 0
-
-        # Geometries
-        if self.options["setGeometries"]:
-            self.groups["geometries"].Parameters("selectability").Value = 0
-            prop = self.groups["geometries"].AddProperty("GeomApprox")
-            par.addExpression(prop.Parameters("gapproxmosl"), self.pOGLLevel)
+        for name in ["hidden", "unselectable", "deformers", "geometries"]:
+            self.setGroupOptions(name)
 
         # Skin --------------------------------------------
         if self.options["addGeometry"]:
@@ -336,22 +737,10 @@ class Rig(object):
 
         # Mirror Animation Template -----------------------
         if self.options["mode"] == 0:
-            cnx_prop = ani.createMirrorCnxTemplate(self.model)
-            for count, compName in enumerate(self.componentsIndex):
-                component = self.components[compName]
-                inversed_params = component.inv_params.GetAsText().split(",")
-                for ctl in component.controlers:
-                    ani.addMirroringRule(ctl, cnx_prop, inversed_params, True)
+            self.addMirroringRules(self.componentsIndex)
 
         # Reset Pose --------------------------------------
-        self.plog.log("Creating rest pose")
-        controlers = XSIFactory.CreateObject("XSI.Collection")
-        for group in self.model.Groups:
-            if group.Name.startswith("controlers"):
-                controlers.AddItems(group.Members)
-
-        keyableParams = controlers.FindObjectsByMarkingAndCapabilities(None, c.siKeyable)
-        xsi.StoreAction(self.model, keyableParams, 1, "reset", False)
+        self.storeRestPose()
 
         # Isolate and popup -------------------------------
         if self.options["isolateResult"]:
@@ -362,6 +751,35 @@ class Rig(object):
         if self.options["popUpControls"]:
             xsi.InspectObj(self.ui.anim_prop)
             
+    ## Add the controlers of some components to the mirror animation template.
+    # @param self
+    # @param names List of String - Full names of the components.
+    def addMirroringRules(self, names):
+
+        cnx_prop = ani.createMirrorCnxTemplate(self.model)
+        for compName in names:
+            component = self.components[compName]
+            inversed_params = component.inv_params.GetAsText().split(",")
+            for ctl in component.controlers:
+                ani.addMirroringRule(ctl, cnx_prop, inversed_params, True)
+
+    ## Store the rest pose of the controlers, replacing the previous one.
+    # @param self
+    def storeRestPose(self):
+
+        self.plog.log("Creating rest pose")
+        controlers = XSIFactory.CreateObject("XSI.Collection")
+        for group in self.model.Groups:
+            if group.Name.startswith("controlers"):
+                controlers.AddItems(group.Members)
+
+        source = self.model.Sources("reset")
+        if source:
+            xsi.DeleteObj(source)
+
+        keyableParams = controlers.FindObjectsByMarkingAndCapabilities(None, c.siKeyable)
+        xsi.StoreAction(self.model, keyableParams, 1, "reset", False)
+
     # =====================================================
     ## Add the object in a collection for later group creation.
     # @param self
@@ -391,10 +809,9 @@ class Rig(object):
         if guideName is None:
             return self.global_ctl
 
-        comp_name = "_".join(guideName.split("_")[:2])
-        child_name = "_".join(guideName.split("_")[2:])
+        comp_name, child_name = reg.splitName(guideName)
 
-        if comp_name not in self.components.keys():
+        if comp_name not in self.components:
             return self.global_ctl
 
         return self.components[comp_name].getRelation(child_name)
@@ -404,10 +821,9 @@ class Rig(object):
         if guideName is None:
             return None
 
-        comp_name = "_".join(guideName.split("_")[:2])
-        child_name = "_".join(guideName.split("_")[2:])
+        comp_name, child_name = reg.splitName(guideName)
 
-        if comp_name not in self.components.keys():
+        if comp_name not in self.components:
             return None
 
         return self.components[comp_name]
@@ -417,10 +833,9 @@ class Rig(object):
         if guideName is None:
             return self.ui
 
-        comp_name = "_".join(guideName.split("_")[:2])
-        child_name = "_".join(guideName.split("_")[2:])
+        comp_name, child_name = reg.splitName(guideName)
 
-        if comp_name not in self.components.keys():
+        if comp_name not in self.components:
             return self.ui
 
         if self.components[comp_name].ui is None:
@@ -442,6 +857,12 @@ class UIHost(object):
         self.anim_prop.PPGLayout.SetAttribute(c.siUIShowChildren, False)
         self.setup_prop.PPGLayout.SetAttribute(c.siUIShowChildren, False)
 
+        self.resetLayoutAndLogic()
+
+    ## Start new layouts and logics for the properties.
+    # @param self
+    def resetLayoutAndLogic(self):
+
         self.anim_layout = ppg.PPGLayout()
         self.anim_logic = ppg.PPGLogic()
         self.setup_layout = ppg.PPGLayout()
@@ -449,8 +870,6 @@ class UIHost(object):
 
     def fillLayoutAndLogic(self):
 
-        self.anim_prop.Parameters("layout").Value = self.anim_layout.getValue()
-        self.anim_prop.Parameters("logic").Value = self.anim_logic.getValue()
+        ppg.setPSetCode(self.anim_prop, self.anim_layout.getValue(), self.anim_logic.getValue())
 
-        self.setup_prop.Parameters("layout").Value = self.setup_layout.getValue()
-        self.setup_prop.Parameters("logic").Value = self.setup_logic.getValue()
+        ppg.setPSetCode(self.setup_prop, self.setup_layout.getValue(), self.setup_logic.getValue())
@@ -41,6 +41,14 @@ import gear.xsi.vector as vec
 import gear.xsi.parameter as par
 import gear.xsi.fcurve as fcu
 import gear.xsi.icon as ico
+import gear.xsi.registry as reg
+
+# Number of plans kept in cache
+PLANS_SIZE = 64
+
+# Precomputed plans by component full name, with their type and guide hash
+PLANS = {}
+PLANS_KEYS = []
 
 ##########################################################
 # BUILDER
@@ -119,10 +127,50 @@ class MainComponent(object):
 
         self.relatives = {}
 
+        ## Data precomputed from the guide. See precompute().
+        self.plan = {}
+
         # --------------------------------------------------
         # Step
         self.stepMethods = [eval("self.step_0%s"%i) for i in range(len(self.steps))]
 
+    # =====================================================
+    # PRECOMPUTE
+    # =====================================================
+    ## Return the data of the component that only depends on the guide, as plain values.\n
+    # REIMPLEMENT. This method should be reimplemented in the components with guide math to precompute.\n
+    # It runs before any object is created, so it mustn't access the scene.
+    # @param self
+    # @return Dictionary - The plan of the component.
+    def getPlan(self):
+        return {}
+
+    ## Set the plan of the component. The plan is reused while the type and the guide hash of the component don't change.\n
+    # An edited guide replaces the plan stored for the component, and the oldest plans are removed above PLANS_SIZE.
+    # @param self
+    # @param key String - Hash of the guide, as ComponentGuide.getHash(). None to compute the plan without cache.
+    def precompute(self, key=None):
+
+        if key is None:
+            self.plan = self.getPlan()
+            return
+
+        signature = (self.type, key)
+        if self.fullName in PLANS and PLANS[self.fullName][0] == signature:
+            self.plan = PLANS[self.fullName][1]
+            return
+
+        self.plan = self.getPlan()
+
+        if self.fullName in PLANS:
+            PLANS_KEYS.remove(self.fullName)
+
+        PLANS[self.fullName] = (signature, self.plan)
+        PLANS_KEYS.append(self.fullName)
+
+        while len(PLANS_KEYS) > PLANS_SIZE:
+            del PLANS[PLANS_KEYS.pop(0)]
+
     # =====================================================
     # BUILDING STEP
     # =====================================================
@@ -263,6 +311,7 @@ class MainComponent(object):
             prim = self.rig.guide.controlers[self.getName(name)]
 
         ctl = ico.primOrIcon(prim, parent, self.getName(name), t, color, icon, kwargs=kwargs)
+        reg.register(ctl)
         self.addToCtlGroup(ctl)
         return ctl
 
@@ -326,8 +375,8 @@ class MainComponent(object):
                 group.items.extend(tab.items)
 
         # Logic
-        self.uihost.anim_logic.addGlobalCode(self.anim_logic.getValue())
-        self.uihost.setup_logic.addGlobalCode(self.setup_logic.getValue())
+        self.uihost.anim_logic.merge(self.anim_logic)
+        self.uihost.setup_logic.merge(self.setup_logic)
 
     ## Add a parameter to the animation property.\n
     # Note that animatable and keyable are True per default.
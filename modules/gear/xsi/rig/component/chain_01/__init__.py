@@ -48,6 +48,22 @@ import gear.xsi.applyop as aop
 ## The main component class.
 class Component(MainComponent):
 
+    # =====================================================
+    # PRECOMPUTE
+    # =====================================================
+    ## Return the transforms and lengths of the fk chain.
+    # @param self
+    # @return Dictionary - The plan of the component.
+    def getPlan(self):
+
+        normal = self.guide.blades["blade"].z
+
+        plan = {}
+        plan["fk"] = [t.Matrix4.Get2() for t in tra.getChainTransform(self.guide.apos, normal, self.negate)]
+        plan["dist"] = [vec.getDistance(self.guide.apos[i], self.guide.apos[i+1]) for i in range(len(self.guide.apos)-1)]
+
+        return plan
+
     # =====================================================
     # OBJECTS
     # =====================================================
@@ -66,8 +82,9 @@ class Component(MainComponent):
         if self.isFk:
             self.fk_ctl = []
             parent = self.root
-            for i, t in enumerate(tra.getChainTransform(self.guide.apos, self.normal, self.negate)):
-                dist = vec.getDistance(self.guide.apos[i], self.guide.apos[i+1])
+            for i, values in enumerate(self.plan["fk"]):
+                t = tra.getTransformFromMatrixValues(values)
+                dist = self.plan["dist"][i]
                 fk_ctl = self.addCtl(parent, "fk%s_ctl"%i, t, self.color_fk, "cube", w=dist, h=self.size*.25, d=self.size*.25, po=XSIMath.CreateVector3(dist*.5*self.n_factor,0,0))
                 xsi.SetNeutralPose(fk_ctl, c.siTrn)
                 par.setKeyableParameters(fk_ctl)
@@ -48,6 +48,22 @@ import gear.xsi.applyop as aop
 ## The main component class.
 class Component(MainComponent):
 
+    # =====================================================
+    # PRECOMPUTE
+    # =====================================================
+    ## Return the transforms and lengths of the fk chain.
+    # @param self
+    # @return Dictionary - The plan of the component.
+    def getPlan(self):
+
+        normal = self.guide.blades["blade"].z
+
+        plan = {}
+        plan["fk"] = [t.Matrix4.Get2() for t in tra.getChainTransform(self.guide.apos, normal, self.negate)]
+        plan["dist"] = [vec.getDistance(self.guide.apos[i], self.guide.apos[i+1]) for i in range(len(self.guide.apos)-1)]
+
+        return plan
+
     # =====================================================
     # OBJECTS
     # =====================================================
@@ -84,10 +100,11 @@ class Component(MainComponent):
         fk_ctl_parent = self.root
         fk_ref_parent = self.root
         dir_ref_parent = self.root
-        for i, t in enumerate(tra.getChainTransform(self.guide.apos, self.normal, self.negate)):
+        for i, values in enumerate(self.plan["fk"]):
+            t = tra.getTransformFromMatrixValues(values)
 
             # ctl
-            dist = vec.getDistance(self.guide.apos[i], self.guide.apos[i+1])
+            dist = self.plan["dist"][i]
             fk_ctl = self.addCtl(fk_ctl_parent, "fk%s_ctl"%i, t, self.color_fk, "cube", w=dist, h=self.size*.25, d=self.size*.25, po=XSIMath.CreateVector3(dist*.5*self.n_factor,0,0))
             xsi.SetNeutralPose(fk_ctl)
             par.setKeyableParameters(fk_ctl)
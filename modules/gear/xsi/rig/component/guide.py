@@ -36,6 +36,7 @@ import gear
 
 import gear.xsi.xmldom as xsixmldom
 import gear.string as string
+import gear.snapshot as snp
 
 from gear.xsi import xsi, c
 
@@ -49,6 +50,8 @@ import gear.xsi.transform as tra
 import gear.xsi.parameter as par
 import gear.xsi.vector as vec
 import gear.xsi.curve as cur
+import gear.xsi.registry as reg
+import gear.xsi.fcurve as fcv
 
 ##########################################################
 # COMPONENT GUIDE
@@ -243,13 +246,14 @@ class ComponentGuide(MainGuide):
 
         # ---------------------------------------------------
         # Then get the objects
+        registry = reg.getRegistry(self.model)
         for name in self.save_transform:
             if "#" in name:
                 i = 0
                 while not self.minmax[name].max > 0 or i < self.minmax[name].max:
                     localName = string.replaceSharpWithPadding(name, i)
 
-                    obj = self.model.FindChild(self.getName(localName))
+                    obj = registry.get(self.getName(localName), True)
                     if not obj:
                         break
 
@@ -266,7 +270,7 @@ class ComponentGuide(MainGuide):
                     continue
 
             else:
-                obj = self.model.FindChild(self.getName(name))
+                obj = registry.get(self.getName(name), True)
                 if not obj:
                     gear.log("Object missing : %s"%name, gear.sev_warning)
                     self.valid = False
@@ -278,7 +282,7 @@ class ComponentGuide(MainGuide):
                 self.apos.append(obj.Kinematics.Global.Transform.Translation)
 
         for name in self.save_primitive:
-            obj = self.model.FindChild(self.getName(name))
+            obj = registry.get(self.getName(name), True)
             if not obj:
                 gear.log("Object missing : %s"%name, gear.sev_warning)
                 self.valid = False
@@ -287,7 +291,7 @@ class ComponentGuide(MainGuide):
             self.prim[name] = pri.getPrimitive(obj)
 
         for name in self.save_blade:
-            obj = self.model.FindChild(self.getName(name))
+            obj = registry.get(self.getName(name), True)
             if not obj:
                 gear.log("Object missing : %s"%name, gear.sev_warning)
                 self.valid = False
@@ -387,6 +391,7 @@ class ComponentGuide(MainGuide):
         xml_comp.append(xml_settings)
 
         # Objects
+        registry = reg.getRegistry(self.model)
         xml_objects = etree.SubElement(xml_comp, "objects")
         for name in self.objectNames:
             if "#" in name:
@@ -404,7 +409,7 @@ class ComponentGuide(MainGuide):
                                              Geometry_addScaling=True,
                                              Geometry_stack=False)
 
-                    obj = self.model.FindChild(self.getName(localName))
+                    obj = registry.get(self.getName(localName), True)
                     if not obj:
                         break
                     xml_def = xsixmldom.getObject(obj).xml
@@ -429,7 +434,7 @@ class ComponentGuide(MainGuide):
                                          Geometry_addScaling=True,
                                          Geometry_stack=False)
 
-                obj = self.model.FindChild(self.getName(name))
+                obj = registry.get(self.getName(name), True)
                 if not obj:
                     gear.log("Object missing : %s"%name, gear.sev_warning)
                     continue
@@ -439,6 +444,58 @@ class ComponentGuide(MainGuide):
 
         return xml_comp
 
+    ## Return a signature of the guide in the scene, to find the components changed since a snapshot.\n
+    ## It hashes the settings values, the global transforms of the component objects and the points of the saved primitives.
+    # @param self
+    # @param root X3DObject - Root of the component guide.
+    # @return String
+    def getSignature(self, root):
+
+        data = [root.Name, root.size.Value]
+        for param in root.Properties("settings").Parameters:
+            value = param.Value
+            if str(value) == "FCurve":
+                value = fcv.getFCurveKeys(value)
+            data.append(value)
+
+        objects = reg.getRegistry(root.Model).getComponentObjects(root.Name[:-len("_root")])
+        for localName in sorted(objects.keys()):
+            obj = objects[localName]
+            data.append((localName, obj.Kinematics.Global.Transform.Matrix4.Get2()))
+            if localName in self.save_primitive:
+                data.append(obj.ActivePrimitive.Geometry.Points.PositionArray)
+
+        return snp.getHash(repr(data))
+
+    ## Return a hash of the settings, transforms, primitives and parenting of the guide.\n
+    ## Unlike getSignature(), it doesn't read the scene, so it works the same for a guide loaded from a file.
+    # @param self
+    # @return String
+    def getHash(self):
+
+        data = [self.fullName, self.type, self.root_size]
+        for scriptName in sorted(self.values.keys()):
+            value = self.values[scriptName]
+            if isinstance(value, par.FCurveParamDef):
+                value = value.keys
+            data.append((scriptName, value))
+
+        for name in sorted(self.tra.keys()):
+            data.append((name, self.tra[name].Matrix4.Get2()))
+
+        # Primitives of a guide loaded from xml have no object to export
+        for name in sorted(self.prim.keys()):
+            prim = self.prim[name]
+            if prim.obj is None:
+                data.append((name, etree.tostring(prim.xml)))
+            else:
+                data.append((name, etree.tostring(prim.getAsXml())))
+
+        if self.parentComponent is not None:
+            data.append(self.parentComponent.fullName+"."+self.parentLocalName)
+
+        return snp.getHash(repr(data))
+
     # ====================================================
     # DRAW
 
@@ -546,8 +603,9 @@ class ComponentGuide(MainGuide):
 
         # Find next index available
 #        self.values["comp_index"] = 0
+        registry = reg.getRegistry(self.model)
         while True:
-            obj = self.model.FindChild(self.getName("root"))
+            obj = registry.get(self.getName("root"), True)
             if not obj or (self.root and obj.IsEqualTo(self.root)):
                 break
 
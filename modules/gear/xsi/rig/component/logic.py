@@ -36,6 +36,7 @@ import gear.xsi.uitoolkit as uit
 import gear.xsi.fcurve as fcu
 import gear.xsi.animation as ani
 import gear.xsi.transform as tra
+import gear.xsi.registry as reg
 
 ##########################################################
 # GUIDE LOGIC
@@ -139,13 +140,13 @@ def setParamsValueFromFCurve(prop, fcv_name, divisions, param_name, minimum=None
 def plotSpringToControler(comp_name, prop):
 
     # Get objects
-    model = prop.Model
+    registry = reg.getRegistry(prop.Model)
     refs = []
     ctls = []
     i = 0
     while True:
-        ctl = model.FindChild(comp_name+"_fk%s_ctl"%i)
-        ref = model.FindChild(comp_name+"_%s_ref"%i)
+        ctl = registry.getFromComponent(comp_name, "fk%s_ctl"%i, True)
+        ref = registry.getFromComponent(comp_name, "%s_ref"%i, True)
 
         if not ctl or not ref:
             break
@@ -189,8 +190,7 @@ def plotSpringToControler(comp_name, prop):
 # ========================================================
 def switchRef(prop, ctl_name, param_name, item_count):
 
-    model = prop.Model
-    ctl = model.FindChild(ctl_name)
+    ctl = reg.getRegistry(prop.Model).get(ctl_name, True)
     if not ctl:
         gear.log("Can't Find : "+ ctl_name, gear.sev_error)
         return
@@ -213,14 +213,15 @@ class IKFKSwitcher(object):
         self.setup_prop = uihost.Properties("setup_prop")
         self.name = name
 
-        self.fk0 = self.model.FindChild(self.name + "_fk0_ctl")
-        self.fk1 = self.model.FindChild(self.name + "_fk1_ctl")
-        self.fk2 = self.model.FindChild(self.name + "_fk2_ctl")
-        self.ik = self.model.FindChild(self.name + "_ik_ctl")
-        self.upv = self.model.FindChild(self.name + "_upv_ctl")
-        self.jnt0 = self.model.FindChild(self.name + "_0_jnt")
-        self.jnt1 = self.model.FindChild(self.name + "_1_jnt")
-        self.chn = self.model.FindChild(self.name + "_root")
+        registry = reg.getRegistry(self.model)
+        self.fk0 = registry.getFromComponent(self.name, "fk0_ctl", True)
+        self.fk1 = registry.getFromComponent(self.name, "fk1_ctl", True)
+        self.fk2 = registry.getFromComponent(self.name, "fk2_ctl", True)
+        self.ik = registry.getFromComponent(self.name, "ik_ctl", True)
+        self.upv = registry.getFromComponent(self.name, "upv_ctl", True)
+        self.jnt0 = registry.getFromComponent(self.name, "0_jnt", True)
+        self.jnt1 = registry.getFromComponent(self.name, "1_jnt", True)
+        self.chn = registry.getFromComponent(self.name, "root", True)
         #self.eff = self.jnt0.Effector
 
         self.blend = self.anim_prop.Parameters(self.name + "_blend")
@@ -30,7 +30,7 @@
 ##########################################################
 import os
 
-from gear.xsi import xsi, c, dynDispatch, XSIFactory
+from gear.xsi import xsi, c, dynDispatch, XSIFactory, XSIMath
 
 from gear.xsi.rig.component import MainComponent
 
@@ -49,6 +49,20 @@ import gear.xsi.fcurve as fcu
 ## The main component class.
 class Component(MainComponent):
 
+    # =====================================================
+    # PRECOMPUTE
+    # =====================================================
+    ## Return the transform of the ik controlers and the positions of the tangents.
+    # @param self
+    # @return Dictionary - The plan of the component.
+    def getPlan(self):
+
+        plan = {}
+        plan["ik"] = tra.getTransformLookingAt(self.guide.apos[0], self.guide.apos[1], self.guide.blades["blade"].z, "yx", self.negate).Matrix4.Get2()
+        plan["tan"] = [vec.linearlyInterpolate(self.guide.apos[0], self.guide.apos[1], blend).Get2() for blend in [.33, .66]]
+
+        return plan
+
     # =====================================================
     # OBJECTS
     # =====================================================
@@ -57,7 +71,7 @@ class Component(MainComponent):
     def addObjects(self):
 
         # Ik Controlers ------------------------------------
-        t = tra.getTransformLookingAt(self.guide.apos[0], self.guide.apos[1], self.guide.blades["blade"].z, "yx", self.negate)
+        t = tra.getTransformFromMatrixValues(self.plan["ik"])
         self.ik0_ctl = self.addCtl(self.root, "ik0_ctl", t, self.color_ik, "compas", w=self.size)
         par.setKeyableParameters(self.ik0_ctl)
         xsi.SetNeutralPose(self.ik0_ctl)
@@ -70,13 +84,13 @@ class Component(MainComponent):
         par.addLocalParamToCollection(self.inv_params, self.ik1_ctl, ["posx", "roty", "rotz"])
 
         # Tangent controlers -------------------------------
-        t.SetTranslation(vec.linearlyInterpolate(self.guide.apos[0], self.guide.apos[1], .33))
+        t.SetTranslation(XSIMath.CreateVector3(*self.plan["tan"][0]))
         self.tan0_ctl = self.addCtl(self.ik0_ctl, "tan0_ctl", t, self.color_ik, "sphere", w=self.size*.2)
         par.setKeyableParameters(self.tan0_ctl, self.t_params)
         xsi.SetNeutralPose(self.tan0_ctl, c.siTrn)
         par.addLocalParamToCollection(self.inv_params, self.ik1_ctl, ["posx"])
 
-        t.SetTranslation(vec.linearlyInterpolate(self.guide.apos[0], self.guide.apos[1], .66))
+        t.SetTranslation(XSIMath.CreateVector3(*self.plan["tan"][1]))
         self.tan1_ctl = self.addCtl(self.ik1_ctl, "tan1_ctl", t, self.color_ik, "sphere", w=self.size*.2)
         par.setKeyableParameters(self.tan1_ctl, self.t_params)
         xsi.SetNeutralPose(self.tan1_ctl, c.siTrn)
@@ -49,6 +49,31 @@ import gear.xsi.curve as cur
 ## The main component class.
 class Component(MainComponent):
 
+    # =====================================================
+    # PRECOMPUTE
+    # =====================================================
+    ## Return the normal, the lengths, the fk transforms and the upvector position of the chain.
+    # @param self
+    # @return Dictionary - The plan of the component.
+    def getPlan(self):
+
+        normal = self.getNormalFromPos(self.guide.apos)
+
+        plan = {}
+        plan["normal"] = normal.Get2()
+        plan["length"] = [vec.getDistance(self.guide.apos[i], self.guide.apos[i+1]) for i in range(3)]
+        plan["fk"] = [tra.getTransformLookingAt(self.guide.apos[i], self.guide.apos[i+1], normal, "xz", self.negate).Matrix4.Get2() for i in range(3)]
+
+        v = XSIMath.CreateVector3()
+        v.Sub(self.guide.apos[2], self.guide.apos[0])
+        v.Cross(normal, v)
+        v.NormalizeInPlace()
+        v.ScaleInPlace(self.size*.5)
+        v.AddInPlace(self.guide.apos[1])
+        plan["upv"] = v.Get2()
+
+        return plan
+
     # =====================================================
     # OBJECTS
     # =====================================================
@@ -56,14 +81,12 @@ class Component(MainComponent):
     # @param self
     def addObjects(self):
 
-        self.normal = self.getNormalFromPos(self.guide.apos)
+        self.normal = XSIMath.CreateVector3(*self.plan["normal"])
 
-        self.length0 = vec.getDistance(self.guide.apos[0], self.guide.apos[1])
-        self.length1 = vec.getDistance(self.guide.apos[1], self.guide.apos[2])
-        self.length2 = vec.getDistance(self.guide.apos[2], self.guide.apos[3])
+        self.length0, self.length1, self.length2 = self.plan["length"]
 
         # FK Controlers ------------------------------------
-        t = tra.getTransformLookingAt(self.guide.apos[0], self.guide.apos[1], self.normal, "xz", self.negate)
+        t = tra.getTransformFromMatrixValues(self.plan["fk"][0])
         self.fk0_ctl = self.addCtl(self.root, "fk0_ctl", t, self.color_fk, "cube", h=self.size*.1, w=1, d=self.size*.1, po=XSIMath.CreateVector3(.5*self.n_factor,0,0))
         self.fk0_ctl.Parameters("SclX").Value = self.length0
         tra.setRefPose(self.fk0_ctl, [-90,0,0], self.negate)
@@ -71,14 +94,14 @@ class Component(MainComponent):
         par.setKeyableParameters(self.fk0_ctl)
         par.addLocalParamToCollection(self.inv_params, self.fk0_ctl, ["posx", "posy", "posz"])
 
-        t = tra.getTransformLookingAt(self.guide.apos[1], self.guide.apos[2], self.normal, "xz", self.negate)
+        t = tra.getTransformFromMatrixValues(self.plan["fk"][1])
         self.fk1_ctl = self.addCtl(self.fk0_ctl, "fk1_ctl", t, self.color_fk, "cube", h=self.size*.1, w=1, d=self.size*.1, po=XSIMath.CreateVector3(.5*self.n_factor,0,0))
         self.fk1_ctl.Parameters("SclX").Value = self.length1/self.length0
         xsi.SetNeutralPose(self.fk1_ctl, c.siST)
         par.setKeyableParameters(self.fk1_ctl)
         par.addLocalParamToCollection(self.inv_params, self.fk1_ctl, ["posx", "posy", "posz"])
 
-        t = tra.getTransformLookingAt(self.guide.apos[2], self.guide.apos[3], self.normal, "xz", self.negate)
+        t = tra.getTransformFromMatrixValues(self.plan["fk"][2])
         self.fk2_ctl = self.addCtl(self.fk1_ctl, "fk2_ctl", t, self.color_fk, "cube", h=self.size*.1, w=self.length2, d=self.size*.1, po=XSIMath.CreateVector3(self.length2*.5*self.n_factor,0,0))
         xsi.SetNeutralPose(self.fk2_ctl, c.siST)
         par.setKeyableParameters(self.fk2_ctl)
@@ -92,18 +115,13 @@ class Component(MainComponent):
         par.setKeyableParameters(self.ikcns_ctl)
         par.addLocalParamToCollection(self.inv_params, self.ikcns_ctl, ["posx", "rotx", "rotz"])
 
-        t = tra.getTransformLookingAt(self.guide.apos[2], self.guide.apos[3], self.normal, "xz", self.negate)
+        t = tra.getTransformFromMatrixValues(self.plan["fk"][2])
         self.ik_ctl = self.addCtl(self.ikcns_ctl, "ik_ctl", t, self.color_ik, "cube", h=self.size*.12, w=self.length2, d=self.size*.12, po=XSIMath.CreateVector3(self.length2*.5*self.n_factor,0,0))
         tra.setRefPose(self.ik_ctl, [-90,0,0], self.negate)
         par.setKeyableParameters(self.ik_ctl)
         par.addLocalParamToCollection(self.inv_params, self.ik_ctl, ["posx"])
 
-        v = XSIMath.CreateVector3()
-        v.Sub(self.guide.apos[2], self.guide.apos[0])
-        v.Cross(self.normal, v)
-        v.NormalizeInPlace()
-        v.ScaleInPlace(self.size * .5)
-        v.AddInPlace(self.guide.apos[1])
+        v = XSIMath.CreateVector3(*self.plan["upv"])
         self.upv_cns = pri.addNullFromPos(self.root, self.getName("upv_cns"), v, self.size*.02)
         self.addToGroup(self.upv_cns, "hidden")
 
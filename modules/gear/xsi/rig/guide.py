@@ -37,6 +37,8 @@ import xml.etree.cElementTree as etree
 # gear
 import gear
 import gear.xmldom as xmldom
+import gear.snapshot as snp
+import gear.graph as grp
 from gear.xsi import xsi, c, XSIFactory, XSIMath
 
 from gear.xsi.rig.component import MainComponent
@@ -48,11 +50,15 @@ import gear.xsi.ppg as ppg
 import gear.xsi.xmldom as xsixmldom
 import gear.xsi.vector as vec
 import gear.xsi.primitive as pri
+import gear.xsi.registry as reg
 
 COMPONENT_PATH = os.path.join(os.path.dirname(__file__), "component")
 TEMPLATE_PATH = os.path.join(COMPONENT_PATH, "templates")
 VERSION = 1.0
 
+# Last snapshot of each guide model, by model full name
+SNAPSHOTS = {}
+
 ##########################################################
 # GUIDE
 ##########################################################
@@ -113,8 +119,7 @@ class MainGuide(object):
             paramDef = self.paramDefs[scriptName]
             paramDef.create(prop)
 
-        prop.Parameters("layout").Value = self.layout.getValue()
-        prop.Parameters("logic").Value = self.logic.getValue()
+        ppg.setPSetCode(prop, self.layout.getValue(), self.logic.getValue())
 
         return prop
 
@@ -293,6 +298,7 @@ class RigGuide(MainGuide):
         self.components = {} ## Dictionary of component
         self.componentsIndex = [] ## List of component name sorted by order creation (hierarchy order)
         self.parents = [] ## List of the parent of each component, in same order as self.components
+        self.snapshot = None ## GuideSnapshot of the last guide loaded from a model with a snapshot.
 
         self.addParameters()
         self.addLayout()
@@ -539,7 +545,8 @@ class RigGuide(MainGuide):
 
     ## set the guide hierarchy from selection.
     # @param self
-    def setFromSelection(self):
+    # @param use_snapshot Boolean - True to load the unchanged components of a selected model from its last snapshot.
+    def setFromSelection(self, use_snapshot=False):
 
         if not xsi.Selection.Count:
             gear.log("Select one or more guide root or a guide model", gear.sev_error)
@@ -548,7 +555,7 @@ class RigGuide(MainGuide):
 
         for item in xsi.Selection:
             branch = item.IsSelected(True) or item.Type == "#model"
-            self.setFromHierarchy(item, branch)
+            self.setFromHierarchy(item, branch, use_snapshot)
 
         return True
 
@@ -556,7 +563,8 @@ class RigGuide(MainGuide):
     # @param self
     # @param root X3DObject - The root of the hierarchy to parse.
     # @param branch Boolean - True to parse children components
-    def setFromHierarchy(self, root, branch=True):
+    # @param use_snapshot Boolean - True to load the unchanged components from the last snapshot of the model. Only used when root is the model.
+    def setFromHierarchy(self, root, branch=True, use_snapshot=False):
 
         if not root.IsClassOf(c.siX3DObjectID):
             root = root.Parent3DObject
@@ -587,7 +595,8 @@ class RigGuide(MainGuide):
         # ---------------------------------------------------
         # Get the controlers
         self.plog.log(None, "Get controlers")
-        self.controlers_org = self.model.FindChild("controlers_org")
+        registry = reg.getRegistry(self.model, True)
+        self.controlers_org = registry.get("controlers_org")
         if self.controlers_org:
             for child in self.controlers_org.Children:
                 if child.Type in ["null", "crvlist"]:
@@ -598,19 +607,17 @@ class RigGuide(MainGuide):
         # ---------------------------------------------------
         # Components
         self.plog.log(None, "Get components")
-        self.findComponentRecursive(root, branch)
+        if use_snapshot and root.IsEqualTo(self.model):
+            self.findComponentsFromSnapshot(registry, SNAPSHOTS.get(self.model.FullName))
+        else:
+            self.findComponentRecursive(root, branch)
 
         # Parenting
         self.plog.log(None, "Get parenting")
-        for name  in self.componentsIndex:
-            compChild = self.components[name]
-            for name in self.componentsIndex:
-                compParent = self.components[name]
-                for name, element in compParent.getObjects(self.model).items():
-                    if element is not None and element.IsEqualTo(compChild.root.Parent):
-                        compChild.parentComponent = compParent
-                        compChild.parentLocalName = name
-                        break
+        self.setParenting(registry)
+
+        if use_snapshot and self.snapshot is not None:
+            self.updateSnapshot()
 
         # More option values
         self.addOptionsValues()
@@ -622,6 +629,40 @@ class RigGuide(MainGuide):
         gear.log("Guide loaded from hierarchy in [ " + self.plog.getTime() + " ]")
         self.plog.hideBar()
 
+    ## Set the parent component and parent local name of each component from the hierarchy.\n
+    ## The component objects are mapped by name in one pass, then each root parent is looked up.
+    # @param self
+    # @param registry ObjectRegistry - Index of the guide model.
+    def setParenting(self, registry):
+
+        owners = {}
+        for name in registry.objects.keys():
+            comp_name, local_name = reg.splitName(name)
+            if comp_name in self.components:
+                owners[name] = (self.components[comp_name], local_name)
+
+        for name in self.componentsIndex:
+            compChild = self.components[name]
+            parent_name = compChild.root.Parent.Name
+            if parent_name in owners:
+                compChild.parentComponent, compChild.parentLocalName = owners[parent_name]
+
+    ## Return the names of the objects under an object, in the order findComponentRecursive() visits them.
+    # @param self
+    # @param obj X3DObject - The root of the hierarchy.
+    # @param names List of String - The names already found. Used by the recursion.
+    # @return List of String
+    def getHierarchyOrder(self, obj, names=None):
+
+        if names is None:
+            names = []
+
+        for child in obj.Children:
+            names.append(child.Name)
+            self.getHierarchyOrder(child, names)
+
+        return names
+
     def findComponentRecursive(self, obj, branch=True):
 
         settings = obj.Properties("settings")
@@ -642,6 +683,96 @@ class RigGuide(MainGuide):
             for child in obj.Children:
                 self.findComponentRecursive(child)
 
+    ## Find the components of the model with the registry, and load the unchanged ones from a snapshot.\n
+    ## A component is unchanged when its signature is the one stored in the snapshot. The others are read from the hierarchy.
+    # @param self
+    # @param registry ObjectRegistry - Index of the guide model.
+    # @param snapshot GuideSnapshot - Last snapshot of the model. None to read all the components.
+    def findComponentsFromSnapshot(self, registry, snapshot=None):
+
+        if snapshot is None:
+            snapshot = snp.GuideSnapshot()
+
+        comp_names = []
+        for name in registry.objects.keys():
+            comp_name, local_name = reg.splitName(name)
+            if local_name == "root":
+                comp_names.append(comp_name)
+
+        # Keep the order of the snapshot, it was read from the hierarchy.
+        # If a component isn't in the snapshot, the hierarchy is walked again to get the order of findComponentRecursive()
+        names = snapshot.getNames()
+        if not set(comp_names).issubset(names):
+            names = [reg.splitName(name)[0] for name in self.getHierarchyOrder(self.model) if reg.splitName(name)[1] == "root"]
+
+        order = {}
+        for i, name in enumerate(names):
+            order[name] = i
+
+        roots = [(order.get(comp_name, len(order)), comp_name) for comp_name in comp_names]
+        roots.sort()
+
+        self.snapshot = snp.GuideSnapshot(self.model.Name)
+        dirty = 0
+        for i, comp_name in roots:
+
+            root = registry.get(comp_name + "_root", True)
+            settings = root.Properties("settings")
+            if not settings:
+                continue
+
+            comp_type = settings.Parameters("comp_type").Value
+            comp_guide = self.getComponentGuide(comp_type)
+            if not comp_guide:
+                continue
+
+            signature = comp_guide.getSignature(root)
+            if snapshot.isClean(comp_name, signature):
+                entry = snapshot.getComponent(comp_name)
+                comp_guide.setFromXml(etree.fromstring(entry["xml"]))
+                comp_guide.root = root
+                comp_guide.model = self.model
+                self.snapshot.addComponent(comp_name, comp_type, signature, entry["xml"])
+            else:
+                comp_guide.setFromHierarchy(root)
+                self.snapshot.addComponent(comp_guide.fullName, comp_type, signature, etree.tostring(comp_guide.getAsXml()))
+                dirty += 1
+
+            self.plog.log(None, comp_guide.fullName+" ("+comp_type+")")
+            if not comp_guide.valid:
+                self.valid = False
+
+            self.componentsIndex.append(comp_guide.fullName)
+            self.components[comp_guide.fullName] = comp_guide
+
+        gear.log("%s of %s components read from the hierarchy"%(dirty, len(self.componentsIndex)))
+
+    ## Store the options, the controlers and the parenting in the snapshot, and keep it as the last snapshot of the model.
+    # @param self
+    def updateSnapshot(self):
+
+        self.snapshot.options = etree.tostring(self.getParametersAsXml("options"))
+
+        xml_controlers = etree.Element("controlers")
+        for name, ctl in self.controlers.items():
+            xml_controlers.append(ctl.getAsXml())
+        self.snapshot.controlers = etree.tostring(xml_controlers)
+
+        for name in self.componentsIndex:
+            comp_guide = self.components[name]
+            if comp_guide.parentComponent is not None:
+                self.snapshot.setParent(name, comp_guide.parentComponent.fullName+"."+comp_guide.parentLocalName)
+
+        SNAPSHOTS[self.model.FullName] = self.snapshot
+
+    ## set the guide from a snapshot. The scene isn't used.
+    # @param self
+    # @param snapshot GuideSnapshot
+    def setFromSnapshot(self, snapshot):
+
+        self.snapshot = snapshot
+        self.setFromXmlChildren(snapshot.getXmlChildren())
+
     # @param self
     # @param path String - Path to an xml definition.
     def setFromFile(self, path):
@@ -651,14 +782,14 @@ class RigGuide(MainGuide):
             self.valid = False
             return False
 
-        tree = etree.parse(path)
-        xml_guide = tree.getroot()
+        xml_guide = xmldom.getRoot(path)
         if xml_guide is None or xml_guide.tag != "guide":
             gear.log("Error opening File", gear.sev_error)
             self.valid = False
             return False
 
-        self.setFromXml(xml_guide)
+        # The file is streamed, only one component definition is in memory at a time
+        self.setFromXmlChildren(xmldom.iterChildren(path))
 
         return True
 
@@ -666,43 +797,55 @@ class RigGuide(MainGuide):
     # @param self
     # @param xml_doc xml_node - Xml definition of the guide.
     def setFromXml(self, xml_guide):
+        self.setFromXmlChildren(xml_guide.getchildren())
 
-        # Options
-        xml_options = xml_guide.find("options")
-        if not xml_options:
-            self.valid = False
-        else:
-            self.setParamDefValuesFromXml(xml_options)
+    ## set the guide hierarchy from the children of a xml guide definition.\n
+    ## Children are expected in the exported order : options, controlers, then components.
+    # @param self
+    # @param xml_children Iterable of xml_node - Options, controlers and components definitions.
+    def setFromXmlChildren(self, xml_children):
+
+        bOptions = False
+        parents = []
+        for xml_child in xml_children:
+
+            # Options
+            if xml_child.tag == "options":
+                if xml_child:
+                    bOptions = True
+                    self.setParamDefValuesFromXml(xml_child)
+
+            # Controlers
+            elif xml_child.tag == "controlers":
+                for xml_obj in xml_child.findall("x3dobject"):
+                    name = xml_obj.get("name")
+                    type = xml_obj.get("type")
+                    if type in ["null", "crvlist"]:
+                        self.controlers[name] = pri.getPrimitive(xml_obj)
+                    else:
+                        gear.log("Invalid controler type : " + name + " - " + type, gear.sev_warning)
 
-        # Controlers
-        xml_controlers = xml_guide.find("controlers")
-        if xml_controlers:
-            for xml_obj in xml_controlers.findall("x3dobject"):
-                name = xml_obj.get("name")
-                type = xml_obj.get("type")
-                if type in ["null", "crvlist"]:
-                    self.controlers[name] = pri.getPrimitive(xml_obj)
-                else:
-                    gear.log("Invalid controler type : " + name + " - " + type, gear.sev_warning)
+            # Component Guide
+            elif xml_child.tag == "component":
+                comp_name = xml_child.get("name")
+                comp_type = xml_child.get("type")
+                parents.append((comp_name, xml_child.get("parent")))
 
-        # Component Guide
-        for xml_comp in xml_guide.findall("component"):
-            comp_name = xml_comp.get("name")
-            comp_type = xml_comp.get("type")
-            comp_guide = self.getComponentGuide(comp_type)
+                comp_guide = self.getComponentGuide(comp_type)
 
-            if not comp_guide:
-                continue
+                if not comp_guide:
+                    continue
 
-            comp_guide.setFromXml(xml_comp)
+                comp_guide.setFromXml(xml_child)
 
-            self.componentsIndex.append(comp_name)
-            self.components[comp_name] = comp_guide
+                self.componentsIndex.append(comp_name)
+                self.components[comp_name] = comp_guide
+
+        if not bOptions:
+            self.valid = False
 
         # Parenting
-        for xml_comp in xml_guide.findall("component"):
-            name = xml_comp.get("name")
-            parent = xml_comp.get("parent")
+        for name, parent in parents:
 
             if parent is None:
                 continue
@@ -744,6 +887,58 @@ class RigGuide(MainGuide):
 
         self.values["size"] = max(maximum * .05, .1)
 
+    ## Return a hash of the rig options.
+    # @param self
+    # @return String
+    def getOptionsHash(self):
+        return snp.getHash(repr([(name, self.values[name]) for name in sorted(self.values.keys())]))
+
+    ## Return the hash of each component guide. See ComponentGuide.getHash().
+    # @param self
+    # @return Dictionary of String - Hashes by component full name.
+    def getHashes(self):
+
+        hashes = {}
+        for name, comp_guide in self.components.items():
+            hashes[name] = comp_guide.getHash()
+
+        return hashes
+
+    ## Return the dependency graph of the components.\n
+    ## A component depends on its parent component, on its ui host and on the components of its head, ik and upv references.
+    ## The ui host is a weak dependency, it is only followed to find the components to rebuild.
+    # @param self
+    # @return DependencyGraph
+    def getDependencyGraph(self):
+
+        graph = grp.DependencyGraph()
+        for name in self.componentsIndex:
+            graph.add(name)
+
+        for name in self.componentsIndex:
+            comp_guide = self.components[name]
+
+            if comp_guide.parentComponent is not None:
+                graph.addDependency(name, comp_guide.parentComponent.fullName, "parent")
+
+            # The ui host is only used once all the components are created, the rebuild still follows it
+            references = [("uiHost", comp_guide.values["uiHost"], True)]
+            for scriptName in ["headrefarray", "ikrefarray", "upvrefarray"]:
+                if comp_guide.values.get(scriptName):
+                    references.extend([(scriptName, ref, False) for ref in comp_guide.values[scriptName].split(",")])
+
+            for kind, ref, weak in references:
+                if not ref:
+                    continue
+
+                comp_name = reg.splitName(ref)[0]
+                if comp_name in self.components:
+                    graph.addDependency(name, comp_name, kind, weak)
+                elif comp_name != "global_C0":
+                    gear.log("%s : Unknown %s reference '%s', the global control is used"%(name, kind, ref), gear.sev_warning)
+
+        return graph
+
     # =====================================================
     # XML IMPORT EXPORT
 
@@ -896,13 +1091,14 @@ class RigGuide(MainGuide):
             self.controlers_grp.AddMember(obj)
 
         # Components
+        registry = reg.getRegistry(self.model)
         for name in self.componentsIndex:
             comp_guide = self.components[name]
 
             if comp_guide.parentComponent is None:
                 parent = self.model
             else:
-                parent = self.model.FindChild(comp_guide.parentComponent.getName(comp_guide.parentLocalName))
+                parent = registry.get(comp_guide.parentComponent.getName(comp_guide.parentLocalName), True)
                 if not parent:
                     gear.log("Unable to find parent (%s.%s) for guide %s"%(comp_guide.parentComponent .getFullName, comp_guide.parentLocalName, comp_guide.getFullName ))
                     parent = self.model
@@ -951,19 +1147,20 @@ class RigGuide(MainGuide):
             self.draw()
         else:
 
+            registry = reg.getRegistry(self.model)
             for name in self.componentsIndex:
                 comp_guide = self.components[name]
 
                 if comp_guide.parentComponent is None:
                     if symmetrize:
-                        parent = self.model.FindChild(uti.convertRLName(comp_guide.root.Name))
+                        parent = registry.get(uti.convertRLName(comp_guide.root.Name), True)
                         if parent is None:
                             parent = comp_guide.root.Parent
                     else:
                         parent = comp_guide.root.Parent
 
                 else:
-                    parent = self.model.FindChild(comp_guide.parentComponent.getName(comp_guide.parentLocalName))
+                    parent = registry.get(comp_guide.parentComponent.getName(comp_guide.parentLocalName), True)
                     if not parent:
                         gear.log("Unable to find parent (%s.%s) for guide %s"%(comp_guide.parentComponent.getFullName, comp_guide.parentLocalName, comp_guide.getFullName ))
                         parent = self.model
@@ -0,0 +1,847 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+## @package gear.xsi.standin
+# @author Jeremie Passerin
+#
+# @brief pure python stand-in for the Softimage objects. Doesn't require Softimage.
+#
+# The stand-in backend gives XSIMath, the constants and a recorded scene (see gear.xsi.recorder) to
+# the gear modules, so the rig builder, the envelope tools and the xml round trips run on any python.\n
+# It's selected at import time, see gear.xsi.
+
+##########################################################
+# GLOBAL
+##########################################################
+# Built-in
+import os
+import math
+import tempfile
+
+# gear
+import gear
+
+# The scene object model is the one of the recorder
+from gear.xsi.recorder import Item, Application, Factory, dispatch
+
+##########################################################
+# MATH
+##########################################################
+## Return the product of two 4x4 matrices, as lists of 16 values.
+# @param a List of Double
+# @param b List of Double
+# @return List of Double
+def mulMatrix4Values(a, b):
+
+    values = [0.0] * 16
+    for i in xrange(4):
+        a0, a1, a2, a3 = a[i*4:i*4+4]
+        for j in xrange(4):
+            values[i*4+j] = a0*b[j] + a1*b[4+j] + a2*b[8+j] + a3*b[12+j]
+
+    return values
+
+## Return the inverse of a 4x4 matrix, as lists of 16 values.
+# @param m List of Double
+# @return List of Double - None if the matrix is singular.
+def invertMatrix4Values(m):
+
+    rows = [list(m[i*4:i*4+4]) + [float(i == j) for j in xrange(4)] for i in xrange(4)]
+
+    for col in xrange(4):
+        pivot = max(xrange(col, 4), key=lambda r: abs(rows[r][col]))
+        if abs(rows[pivot][col]) < 1e-12:
+            return None
+
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+
+        p = rows[col][col]
+        rows[col] = [v / p for v in rows[col]]
+        for r in xrange(4):
+            if r != col and rows[r][col]:
+                f = rows[r][col]
+                rows[r] = [v - f * w for v, w in zip(rows[r], rows[col])]
+
+    return [rows[i][4+j] for i in xrange(4) for j in xrange(4)]
+
+## Return the product of two 3x3 matrices, as lists of 9 values.
+# @param a List of Double
+# @param b List of Double
+# @return List of Double
+def mulMatrix3Values(a, b):
+    return [a[i*3]*b[j] + a[i*3+1]*b[3+j] + a[i*3+2]*b[6+j] for i in xrange(3) for j in xrange(3)]
+
+## Return the rotation matrix of some XYZ euler angles, as a list of 9 values.
+# @param x Double - Angle in radians.
+# @param y Double - Angle in radians.
+# @param z Double - Angle in radians.
+# @return List of Double
+def getMatrix3ValuesFromXYZAngles(x, y, z):
+
+    cx, sx = math.cos(x), math.sin(x)
+    cy, sy = math.cos(y), math.sin(y)
+    cz, sz = math.cos(z), math.sin(z)
+
+    # Rx * Ry * Rz, for row vectors
+    return [cy*cz,              cy*sz,              -sy,
+            sx*sy*cz - cx*sz,   sx*sy*sz + cx*cz,   sx*cy,
+            cx*sy*cz + sx*sz,   cx*sy*sz - sx*cz,   cx*cy]
+
+## Return the XYZ euler angles of a rotation matrix.
+# @param m List of Double - 9 values.
+# @return Tuple of Double - Angles in radians.
+def getXYZAnglesFromMatrix3Values(m):
+
+    sy = max(-1.0, min(1.0, -m[2]))
+    y = math.asin(sy)
+    if abs(sy) < .999999:
+        x = math.atan2(m[5], m[8])
+        z = math.atan2(m[1], m[0])
+    else:
+        x = math.atan2(-m[7], m[4])
+        z = 0.0
+
+    return x, y, z
+
+## Return the rotation matrix of a unit quaternion, as a list of 9 values.
+# @param w Double
+# @param x Double
+# @param y Double
+# @param z Double
+# @return List of Double
+def getMatrix3ValuesFromQuaternion(w, x, y, z):
+
+    return [1-2*(y*y+z*z),  2*(x*y+w*z),    2*(x*z-w*y),
+            2*(x*y-w*z),    1-2*(x*x+z*z),  2*(y*z+w*x),
+            2*(x*z+w*y),    2*(y*z-w*x),    1-2*(x*x+y*y)]
+
+## Return the unit quaternion of a rotation matrix.
+# @param m List of Double - 9 values.
+# @return Tuple of Double - w, x, y, z.
+def getQuaternionFromMatrix3Values(m):
+
+    trace = m[0] + m[4] + m[8]
+    if trace > 0:
+        s = math.sqrt(trace + 1.0) * 2
+        return .25 * s, (m[5] - m[7]) / s, (m[6] - m[2]) / s, (m[1] - m[3]) / s
+    elif m[0] > m[4] and m[0] > m[8]:
+        s = math.sqrt(1.0 + m[0] - m[4] - m[8]) * 2
+        return (m[5] - m[7]) / s, .25 * s, (m[3] + m[1]) / s, (m[6] + m[2]) / s
+    elif m[4] > m[8]:
+        s = math.sqrt(1.0 + m[4] - m[0] - m[8]) * 2
+        return (m[6] - m[2]) / s, (m[3] + m[1]) / s, .25 * s, (m[7] + m[5]) / s
+    else:
+        s = math.sqrt(1.0 + m[8] - m[0] - m[4]) * 2
+        return (m[1] - m[3]) / s, (m[6] + m[2]) / s, (m[7] + m[5]) / s, .25 * s
+
+# =========================================================
+## SIVector3 stand-in.
+class Vector3(object):
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.X = float(x)
+        self.Y = float(y)
+        self.Z = float(z)
+
+    def __repr__(self):
+        return "Vector3(%s, %s, %s)"%(self.X, self.Y, self.Z)
+
+    def Set(self, x, y, z):
+        self.X, self.Y, self.Z = float(x), float(y), float(z)
+        return self
+
+    def Get2(self):
+        return (self.X, self.Y, self.Z)
+
+    def Copy(self, v):
+        return self.Set(v.X, v.Y, v.Z)
+
+    def SetNull(self):
+        return self.Set(0, 0, 0)
+
+    def Add(self, a, b):
+        return self.Set(a.X+b.X, a.Y+b.Y, a.Z+b.Z)
+
+    def AddInPlace(self, v):
+        return self.Add(self, v)
+
+    def Sub(self, a, b):
+        return self.Set(a.X-b.X, a.Y-b.Y, a.Z-b.Z)
+
+    def SubInPlace(self, v):
+        return self.Sub(self, v)
+
+    def Scale(self, s, v):
+        return self.Set(v.X*s, v.Y*s, v.Z*s)
+
+    def ScaleInPlace(self, s):
+        return self.Scale(s, self)
+
+    def Negate(self, v):
+        return self.Set(-v.X, -v.Y, -v.Z)
+
+    def NegateInPlace(self):
+        return self.Negate(self)
+
+    def Absolute(self, v):
+        return self.Set(abs(v.X), abs(v.Y), abs(v.Z))
+
+    def AbsoluteInPlace(self):
+        return self.Absolute(self)
+
+    def Length(self):
+        return math.sqrt(self.X*self.X + self.Y*self.Y + self.Z*self.Z)
+
+    def LengthSquared(self):
+        return self.X*self.X + self.Y*self.Y + self.Z*self.Z
+
+    def Normalize(self, v):
+        length = v.Length()
+        if length < 1e-12:
+            return self.Set(v.X, v.Y, v.Z)
+        return self.Set(v.X/length, v.Y/length, v.Z/length)
+
+    def NormalizeInPlace(self):
+        return self.Normalize(self)
+
+    def Dot(self, v):
+        return self.X*v.X + self.Y*v.Y + self.Z*v.Z
+
+    def Cross(self, a, b):
+        return self.Set(a.Y*b.Z - a.Z*b.Y, a.Z*b.X - a.X*b.Z, a.X*b.Y - a.Y*b.X)
+
+    def CrossInPlace(self, v):
+        return self.Cross(self, v)
+
+    def Angle(self, v):
+        lengths = self.Length() * v.Length()
+        if lengths < 1e-12:
+            return 0.0
+        return math.acos(max(-1.0, min(1.0, self.Dot(v) / lengths)))
+
+    def LinearlyInterpolate(self, a, b, alpha):
+        return self.Set(a.X + (b.X-a.X)*alpha, a.Y + (b.Y-a.Y)*alpha, a.Z + (b.Z-a.Z)*alpha)
+
+    def Equals(self, v):
+        return self.Get2() == v.Get2()
+
+    def EpsilonEquals(self, v, epsilon):
+        return abs(self.X-v.X) <= epsilon and abs(self.Y-v.Y) <= epsilon and abs(self.Z-v.Z) <= epsilon
+
+    def MulByMatrix3(self, v, m):
+        a = m.values
+        return self.Set(v.X*a[0] + v.Y*a[3] + v.Z*a[6],
+                        v.X*a[1] + v.Y*a[4] + v.Z*a[7],
+                        v.X*a[2] + v.Y*a[5] + v.Z*a[8])
+
+    def MulByMatrix3InPlace(self, m):
+        return self.MulByMatrix3(self, m)
+
+    def MulByMatrix4(self, v, m):
+        a = m.values
+        return self.Set(v.X*a[0] + v.Y*a[4] + v.Z*a[8] + a[12],
+                        v.X*a[1] + v.Y*a[5] + v.Z*a[9] + a[13],
+                        v.X*a[2] + v.Y*a[6] + v.Z*a[10] + a[14])
+
+    def MulByMatrix4InPlace(self, m):
+        return self.MulByMatrix4(self, m)
+
+    def MulByRotation(self, v, r):
+        return self.MulByMatrix3(v, r.matrix)
+
+    def MulByRotationInPlace(self, r):
+        return self.MulByRotation(self, r)
+
+    def MulByTransformation(self, v, t):
+        return self.MulByMatrix4(v, t.Matrix4)
+
+    def MulByTransformationInPlace(self, t):
+        return self.MulByTransformation(self, t)
+
+## SIMatrix3 stand-in. Row major, for row vectors.
+class Matrix3(object):
+
+    def __init__(self, *values):
+        self.values = values and [float(v) for v in values] or [1.0,0.0,0.0, 0.0,1.0,0.0, 0.0,0.0,1.0]
+
+    def Set(self, *values):
+        self.values = [float(v) for v in values]
+        return self
+
+    def Get2(self):
+        return tuple(self.values)
+
+    def Value(self, row, col):
+        return self.values[row*3+col]
+
+    def SetValue(self, row, col, value):
+        self.values[row*3+col] = float(value)
+
+    def SetIdentity(self):
+        self.values = [1.0,0.0,0.0, 0.0,1.0,0.0, 0.0,0.0,1.0]
+        return self
+
+    def Copy(self, m):
+        self.values = list(m.values)
+        return self
+
+    def Mul(self, a, b):
+        self.values = mulMatrix3Values(a.values, b.values)
+        return self
+
+    def MulInPlace(self, m):
+        return self.Mul(self, m)
+
+    def Transpose(self, m):
+        a = m.values
+        self.values = [a[0], a[3], a[6], a[1], a[4], a[7], a[2], a[5], a[8]]
+        return self
+
+    def TransposeInPlace(self):
+        return self.Transpose(self)
+
+    def Invert(self, m):
+        a = m.values
+        det = a[0]*(a[4]*a[8]-a[5]*a[7]) - a[1]*(a[3]*a[8]-a[5]*a[6]) + a[2]*(a[3]*a[7]-a[4]*a[6])
+        if abs(det) < 1e-12:
+            return False
+        self.values = [(a[4]*a[8]-a[5]*a[7])/det, (a[2]*a[7]-a[1]*a[8])/det, (a[1]*a[5]-a[2]*a[4])/det,
+                       (a[5]*a[6]-a[3]*a[8])/det, (a[0]*a[8]-a[2]*a[6])/det, (a[2]*a[3]-a[0]*a[5])/det,
+                       (a[3]*a[7]-a[4]*a[6])/det, (a[1]*a[6]-a[0]*a[7])/det, (a[0]*a[4]-a[1]*a[3])/det]
+        return True
+
+    def InvertInPlace(self):
+        return self.Invert(self)
+
+## SIMatrix4 stand-in. Row major, for row vectors, the translation in the last row.
+class Matrix4(object):
+
+    def __init__(self, *values):
+        self.values = values and [float(v) for v in values] or [1.0,0.0,0.0,0.0, 0.0,1.0,0.0,0.0, 0.0,0.0,1.0,0.0, 0.0,0.0,0.0,1.0]
+
+    def Set(self, *values):
+        self.values = [float(v) for v in values]
+        return self
+
+    def Get2(self):
+        return tuple(self.values)
+
+    def Value(self, row, col):
+        return self.values[row*4+col]
+
+    def SetValue(self, row, col, value):
+        self.values[row*4+col] = float(value)
+
+    def SetIdentity(self):
+        self.values = [1.0,0.0,0.0,0.0, 0.0,1.0,0.0,0.0, 0.0,0.0,1.0,0.0, 0.0,0.0,0.0,1.0]
+        return self
+
+    def Copy(self, m):
+        self.values = list(m.values)
+        return self
+
+    def Mul(self, a, b):
+        self.values = mulMatrix4Values(a.values, b.values)
+        return self
+
+    def MulInPlace(self, m):
+        return self.Mul(self, m)
+
+    def Transpose(self, m):
+        a = m.values
+        self.values = [a[j*4+i] for i in xrange(4) for j in xrange(4)]
+        return self
+
+    def TransposeInPlace(self):
+        return self.Transpose(self)
+
+    def Invert(self, m):
+        values = invertMatrix4Values(m.values)
+        if values is None:
+            return False
+        self.values = values
+        return True
+
+    def InvertInPlace(self):
+        return self.Invert(self)
+
+## SIQuaternion stand-in.
+class Quaternion(object):
+
+    def __init__(self, w=1.0, x=0.0, y=0.0, z=0.0):
+        self.Set(w, x, y, z)
+
+    def Set(self, w, x, y, z):
+        self.W, self.X, self.Y, self.Z = float(w), float(x), float(y), float(z)
+        return self
+
+    def Get2(self):
+        return (self.W, self.X, self.Y, self.Z)
+
+    def Copy(self, q):
+        return self.Set(q.W, q.X, q.Y, q.Z)
+
+    def SetIdentity(self):
+        return self.Set(1, 0, 0, 0)
+
+    def Mul(self, a, b):
+        return self.Set(a.W*b.W - a.X*b.X - a.Y*b.Y - a.Z*b.Z,
+                        a.W*b.X + a.X*b.W + a.Y*b.Z - a.Z*b.Y,
+                        a.W*b.Y - a.X*b.Z + a.Y*b.W + a.Z*b.X,
+                        a.W*b.Z + a.X*b.Y - a.Y*b.X + a.Z*b.W)
+
+    def MulInPlace(self, q):
+        return self.Mul(self, q)
+
+    def Conjugate(self, q):
+        return self.Set(q.W, -q.X, -q.Y, -q.Z)
+
+    def ConjugateInPlace(self):
+        return self.Conjugate(self)
+
+    def Normalize(self, q):
+        length = math.sqrt(q.W*q.W + q.X*q.X + q.Y*q.Y + q.Z*q.Z) or 1.0
+        return self.Set(q.W/length, q.X/length, q.Y/length, q.Z/length)
+
+    def NormalizeInPlace(self):
+        return self.Normalize(self)
+
+## SIRotation stand-in. The rotation is kept as a 3x3 matrix.
+class Rotation(object):
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.matrix = Matrix3(*getMatrix3ValuesFromXYZAngles(x, y, z))
+
+    def Copy(self, r):
+        self.matrix = Matrix3(*r.matrix.values)
+        return self
+
+    def SetIdentity(self):
+        self.matrix.SetIdentity()
+        return self
+
+    def SetFromXYZAngles(self, v):
+        return self.SetFromXYZAnglesValues(v.X, v.Y, v.Z)
+
+    def SetFromXYZAnglesValues(self, x, y, z):
+        self.matrix.Set(*getMatrix3ValuesFromXYZAngles(x, y, z))
+        return self
+
+    def GetXYZAngles(self, v):
+        return v.Set(*getXYZAnglesFromMatrix3Values(self.matrix.values))
+
+    def GetXYZAnglesValues(self):
+        return getXYZAnglesFromMatrix3Values(self.matrix.values)
+
+    def SetFromXYZAxes(self, x, y, z):
+        self.matrix.Set(x.X, x.Y, x.Z, y.X, y.Y, y.Z, z.X, z.Y, z.Z)
+        return self
+
+    def SetFromAxisAngle(self, axis, angle):
+        a = Vector3().Normalize(axis)
+        s = math.sin(angle * .5)
+        return self.SetFromQuaternion(Quaternion(math.cos(angle * .5), a.X*s, a.Y*s, a.Z*s))
+
+    def GetAxisAngle(self, axis):
+        q = self.Quaternion
+        angle = 2 * math.acos(max(-1.0, min(1.0, q.W)))
+        axis.Set(q.X, q.Y, q.Z)
+        axis.NormalizeInPlace()
+        return angle
+
+    def SetFromQuaternion(self, q):
+        q = Quaternion().Normalize(q)
+        self.matrix.Set(*getMatrix3ValuesFromQuaternion(q.W, q.X, q.Y, q.Z))
+        return self
+
+    def GetQuaternion(self, q):
+        return q.Set(*getQuaternionFromMatrix3Values(self.matrix.values))
+
+    def SetFromMatrix3(self, m):
+        self.matrix.Copy(m)
+        return self
+
+    def GetMatrix3(self, m):
+        return m.Copy(self.matrix)
+
+    def Mul(self, a, b):
+        self.matrix = Matrix3().Mul(a.matrix, b.matrix)
+        return self
+
+    def MulInPlace(self, r):
+        return self.Mul(self, r)
+
+    def Invert(self, r):
+        self.matrix = Matrix3().Transpose(r.matrix)
+        return self
+
+    def InvertInPlace(self):
+        return self.Invert(self)
+
+    def getXYZAngles(self):
+        return Vector3(*getXYZAnglesFromMatrix3Values(self.matrix.values))
+
+    def getQuaternion(self):
+        return self.GetQuaternion(Quaternion())
+
+    def getAngle(self, index):
+        return getXYZAnglesFromMatrix3Values(self.matrix.values)[index]
+
+    XYZAngles = property(getXYZAngles)
+    Quaternion = property(getQuaternion)
+    RotX = property(lambda self: self.getAngle(0))
+    RotY = property(lambda self: self.getAngle(1))
+    RotZ = property(lambda self: self.getAngle(2))
+
+## SITransformation stand-in. Scaling, rotation and translation, without shearing.
+class Transformation(object):
+
+    def __init__(self):
+        self.scaling = [1.0, 1.0, 1.0]
+        self.rotation = Rotation()
+        self.translation = [0.0, 0.0, 0.0]
+
+    def Copy(self, t):
+        self.scaling = list(t.scaling)
+        self.rotation = Rotation().Copy(t.rotation)
+        self.translation = list(t.translation)
+        return self
+
+    def SetIdentity(self):
+        self.__init__()
+        return self
+
+    # Translation -----------------------------------------
+    def SetTranslation(self, v):
+        self.translation = [v.X, v.Y, v.Z]
+
+    def SetTranslationFromValues(self, x, y, z):
+        self.translation = [float(x), float(y), float(z)]
+
+    def GetTranslation(self, v):
+        return v.Set(*self.translation)
+
+    def AddLocalTranslation(self, v):
+        self.translation = [self.translation[0]+v.X, self.translation[1]+v.Y, self.translation[2]+v.Z]
+
+    # Rotation --------------------------------------------
+    def SetRotation(self, r):
+        self.rotation = Rotation().Copy(r)
+
+    def GetRotation(self, r):
+        return r.Copy(self.rotation)
+
+    def SetRotationFromXYZAngles(self, v):
+        self.rotation.SetFromXYZAngles(v)
+
+    def SetRotationFromXYZAnglesValues(self, x, y, z):
+        self.rotation.SetFromXYZAnglesValues(x, y, z)
+
+    def GetRotationXYZAngles(self, v):
+        return self.rotation.GetXYZAngles(v)
+
+    def SetRotationFromQuaternion(self, q):
+        self.rotation.SetFromQuaternion(q)
+
+    def GetRotationQuaternion(self, q):
+        return self.rotation.GetQuaternion(q)
+
+    # Scaling ---------------------------------------------
+    def SetScaling(self, v):
+        self.scaling = [v.X, v.Y, v.Z]
+
+    def SetScalingFromValues(self, x, y, z):
+        self.scaling = [float(x), float(y), float(z)]
+
+    def GetScaling(self, v):
+        return v.Set(*self.scaling)
+
+    # Matrix ----------------------------------------------
+    def GetMatrix4(self, m):
+
+        r = self.rotation.matrix.values
+        values = []
+        for i in xrange(3):
+            s = self.scaling[i]
+            values.extend([r[i*3]*s, r[i*3+1]*s, r[i*3+2]*s, 0.0])
+        values.extend(self.translation + [1.0])
+
+        return m.Set(*values)
+
+    def SetMatrix4(self, m):
+
+        a = m.values
+        rows = [a[0:3], a[4:7], a[8:11]]
+        scaling = [math.sqrt(x*x + y*y + z*z) for x, y, z in rows]
+
+        # A negative determinant is kept as a negative scaling in X
+        det = a[0]*(a[5]*a[10]-a[6]*a[9]) - a[1]*(a[4]*a[10]-a[6]*a[8]) + a[2]*(a[4]*a[9]-a[5]*a[8])
+        if det < 0:
+            scaling[0] = -scaling[0]
+
+        values = []
+        for row, s in zip(rows, scaling):
+            s = s or 1.0
+            values.extend([row[0]/s, row[1]/s, row[2]/s])
+
+        self.scaling = scaling
+        self.rotation = Rotation().SetFromMatrix3(Matrix3(*values))
+        self.translation = list(a[12:15])
+
+    def Mul(self, a, b):
+        self.SetMatrix4(Matrix4().Mul(a.Matrix4, b.Matrix4))
+        return self
+
+    def MulInPlace(self, t):
+        return self.Mul(self, t)
+
+    def Invert(self, t):
+        m = t.Matrix4
+        m.InvertInPlace()
+        self.SetMatrix4(m)
+        return self
+
+    def InvertInPlace(self):
+        return self.Invert(self)
+
+    def Equals(self, t):
+        return self.Matrix4.Get2() == t.Matrix4.Get2()
+
+    def EpsilonEquals(self, t, epsilon):
+        return max([abs(a-b) for a, b in zip(self.Matrix4.values, t.Matrix4.values)]) <= epsilon
+
+    # Properties ------------------------------------------
+    def getMatrix4(self):
+        return self.GetMatrix4(Matrix4())
+
+    def getAngle(self, index):
+        return math.degrees(self.rotation.getAngle(index))
+
+    def setAngle(self, index, value):
+        angles = list(self.rotation.GetXYZAnglesValues())
+        angles[index] = math.radians(value)
+        self.rotation.SetFromXYZAnglesValues(*angles)
+
+    def setIndex(self, attr, index, value):
+        values = list(getattr(self, attr))
+        values[index] = float(value)
+        setattr(self, attr, values)
+
+    Translation = property(lambda self: Vector3(*self.translation), SetTranslation)
+    Rotation = property(lambda self: Rotation().Copy(self.rotation), SetRotation)
+    Scaling = property(lambda self: Vector3(*self.scaling), SetScaling)
+    Matrix4 = property(getMatrix4, SetMatrix4)
+
+    PosX = property(lambda self: self.translation[0], lambda self, value: self.setIndex("translation", 0, value))
+    PosY = property(lambda self: self.translation[1], lambda self, value: self.setIndex("translation", 1, value))
+    PosZ = property(lambda self: self.translation[2], lambda self, value: self.setIndex("translation", 2, value))
+    RotX = property(lambda self: self.getAngle(0), lambda self, value: self.setAngle(0, value))
+    RotY = property(lambda self: self.getAngle(1), lambda self, value: self.setAngle(1, value))
+    RotZ = property(lambda self: self.getAngle(2), lambda self, value: self.setAngle(2, value))
+    SclX = property(lambda self: self.scaling[0], lambda self, value: self.setIndex("scaling", 0, value))
+    SclY = property(lambda self: self.scaling[1], lambda self, value: self.setIndex("scaling", 1, value))
+    SclZ = property(lambda self: self.scaling[2], lambda self, value: self.setIndex("scaling", 2, value))
+
+## XSIMath stand-in.
+class Math(object):
+
+    PI = math.pi
+
+    def CreateVector3(self, x=0.0, y=0.0, z=0.0):
+        return Vector3(x, y, z)
+
+    def CreateRotation(self, x=0.0, y=0.0, z=0.0):
+        return Rotation(x, y, z)
+
+    def CreateQuaternion(self, w=1.0, x=0.0, y=0.0, z=0.0):
+        return Quaternion(w, x, y, z)
+
+    def CreateMatrix3(self, *values):
+        return Matrix3(*values)
+
+    def CreateMatrix4(self, *values):
+        return Matrix4(*values)
+
+    def CreateTransform(self):
+        return Transformation()
+
+    def DegreesToRadians(self, value):
+        return math.radians(value)
+
+    def RadiansToDegrees(self, value):
+        return math.degrees(value)
+
+    def MapObjectPositionToWorldSpace(self, t, v):
+        return Vector3().MulByMatrix4(v, t.Matrix4)
+
+    def MapWorldPositionToObjectSpace(self, t, v):
+        m = t.Matrix4
+        m.InvertInPlace()
+        return Vector3().MulByMatrix4(v, m)
+
+    def MapObjectPoseToWorldSpace(self, object_pose, pose):
+        return Transformation().Mul(pose, object_pose)
+
+    def MapWorldPoseToObjectSpace(self, object_pose, pose):
+        return Transformation().Mul(pose, Transformation().Invert(object_pose))
+
+##########################################################
+# CONSTANTS
+##########################################################
+## Values of the Softimage constants the gear modules compare or combine.
+CONSTANTS = {# siVariantType
+             "siEmpty":0, "siInt2":2, "siInt4":3, "siFloat":4, "siDouble":5, "siString":8, "siBool":11, "siUByte":17,
+             # siCapabilities
+             "siAnimatable":1, "siReadOnly":2, "siPersistable":4, "siNotInspectable":8, "siSilent":16,
+             "siNotPresetPersistable":128, "siTexturable":256, "siKeyable":2048, "siNonKeyableVisible":4096,
+             # siSeverity
+             "siFatal":1, "siError":2, "siWarning":4, "siInfo":8, "siVerbose":16, "siComment":32,
+             # siFCurveInterpolation, siFCurveExtrapolation, siFCurveKeyInterpolation
+             "siConstantInterpolation":1, "siLinearInterpolation":2, "siCubicInterpolation":3,
+             "siConstantExtrapolation":1, "siLinearExtrapolation":2, "siPeriodicExtrapolation":3,
+             "siConstantKeyInterpolation":1, "siLinearKeyInterpolation":2, "siCubicKeyInterpolation":3,
+             # siFCurveSource
+             "siAnySource":0, "siFCurveSource":1, "siExpressionSource":2, "siConstraintSource":3,
+             # siMsgButtons, siMsgIcons, siMsgReturnValue
+             "siMsgOkOnly":0, "siMsgOkCancel":1, "siMsgYesNoCancel":3, "siMsgYesNo":4,
+             "siMsgCritical":16, "siMsgQuestion":32, "siMsgExclamation":48, "siMsgInformation":64,
+             "siMsgOk":1, "siMsgCancel":2, "siMsgYes":6, "siMsgNo":7,
+             # siType
+             "siModelType":"#model", "siNullPrimType":"null", "siPolyMeshType":"polymsh", "siCrvListPrimType":"crvlist",
+             # Inspection
+             "siModal":0, "siModeless":1, "siFollow":2, "siLock":3, "siRecycle":4}
+
+## Softimage constants stand-in.\n
+## The constants not listed in CONSTANTS get a unique value.
+class Constants(object):
+
+    def __init__(self):
+        self.__dict__.update(CONSTANTS)
+
+    def __getattr__(self, name):
+
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        value = 1000 + len(self.__dict__)
+        self.__dict__[name] = value
+
+        return value
+
+##########################################################
+# UI AND UTILS
+##########################################################
+## ProgressBar stand-in.
+class ProgressBar(Item):
+
+    fields = ("Maximum", "Minimum", "Step", "Value", "Caption", "StatusText", "Visible", "CancelEnabled", "Cancelled")
+
+    def __init__(self, application):
+
+        Item.__init__(self, application, "ProgressBar", "ProgressBar")
+
+        self.Maximum = 100
+        self.Minimum = 0
+        self.Step = 1
+        self.Value = 0
+        self.Caption = ""
+        self.StatusText = ""
+        self.Visible = False
+        self.CancelEnabled = True
+        self.Cancelled = False
+
+    def Increment(self, step=None):
+
+        self.Value += step is None and self.Step or step
+
+        return self.Value
+
+## FileBrowser stand-in. Nothing is picked.
+class FileBrowser(Item):
+
+    fields = ("DialogTitle", "InitialDirectory", "Filter", "FileBaseName", "FileName", "FilePathName")
+
+    def __init__(self, application):
+
+        Item.__init__(self, application, "FileBrowser", "FileBrowser")
+
+        self.DialogTitle = ""
+        self.InitialDirectory = ""
+        self.Filter = ""
+        self.FileBaseName = ""
+        self.FileName = ""
+        self.FilePathName = ""
+
+    def ShowOpen(self):
+        pass
+
+    def ShowSave(self):
+        pass
+
+## XSIUIToolkit stand-in. The messages are logged and answered with the safest button.
+class UIToolkit(Item):
+
+    def __init__(self, application):
+        Item.__init__(self, application, "UIToolkit", "UIToolkit")
+
+    ProgressBar = property(lambda self: ProgressBar(self._application))
+    FileBrowser = property(lambda self: FileBrowser(self._application))
+
+    def MsgBox(self, message, flags=0, caption=""):
+
+        gear.log(message)
+
+        buttons = flags & 7
+        if buttons in [CONSTANTS["siMsgYesNo"], CONSTANTS["siMsgYesNoCancel"]]:
+            return CONSTANTS["siMsgNo"]
+        if buttons == CONSTANTS["siMsgOkCancel"]:
+            return CONSTANTS["siMsgCancel"]
+
+        return CONSTANTS["siMsgOk"]
+
+    def PickFolder(self, initialDirectory="", title=""):
+        return ""
+
+## XSIUtils stand-in.
+class Utils(Item):
+
+    def __init__(self, application):
+        Item.__init__(self, application, "Utils", "Utils")
+
+    Slash = os.sep
+
+    def ResolvePath(self, path):
+
+        if path.lower() == "temp":
+            return tempfile.gettempdir()
+
+        return os.path.expandvars(path)
+
+    def BuildPath(self, *parts):
+        return os.path.join(*[part for part in parts if part])
+
+    def IsWindowsOS(self):
+        return os.name == "nt"
+
+    def IsLinuxOS(self):
+        return not self.IsWindowsOS()
@@ -46,6 +46,10 @@ RESET_ACTION_NAME = "reset"
 INFO_PROP_NAME = "info"
 GLOBAL_CTL_NAME = "global_C0_ctl"
 OGL_PARAM_NAME = "oglLevel"
+DATE_PARAM_NAME = "date"
+
+# Synoptic sessions by model name, with the signature of the model they were made for
+SESSIONS = {}
 
 ##########################################################
 # SELECT
@@ -57,12 +61,15 @@ OGL_PARAM_NAME = "oglLevel"
 # @param name String - object name to select
 def select(in_mousebutton, in_keymodifier, name=None):
 
-    model = getModel()
+    session = getSession()
+    if session is None:
+        gear.log("Can't Find the synoptic model", gear.sev_warning)
+        return
 
     if name is None:
-        ctl = model
+        ctl = session.model
     else:
-        ctl = model.FindChild(name)
+        ctl = session.getObject(name)
 
     # Check if the object exists
     if not ctl:
@@ -81,36 +88,17 @@ def select(in_mousebutton, in_keymodifier, name=None):
     elif in_mousebutton == 1:
         controlers.Add(ctl)
 
-        # Get all controlers of the model
-        controlers_filtered = []
-        for group in getControlersGroups():
-            controlers_filtered.extend(group.Members.GetAsText().split(","))
-
         # First Method, Try to find controlers of the same 'kind'
-        # Find controler index
-        has_index = False
-        sIndex = re.search("[0-9]+_ctl$", ctl.Name)
-        if sIndex:
-            index = int(sIndex.group(0)[:-4])
-            has_index = True
-
-        # Try to find child of the same 'type'
-        if has_index and controlers_filtered:
-            while True:
-                index += 1
-                next_name = re.sub("[0-9]+_ctl$", str(index)+"_ctl", ctl.Name)
-
-                if model.Name+"."+next_name not in controlers_filtered:
-                    break
-
-                controlers.Add(model.FindChild(next_name))
+        siblings = session.getNextSiblings(ctl.Name)
+        if siblings:
+            controlers.AddItems(siblings)
 
         # Second Method if no child found
         # we get all controlers children of selected one
-        if controlers.Count == 1 and controlers_filtered:
-            for child in ctl.FindChildren():
-                if child.FullName in controlers_filtered:
-                    controlers.Add(child)
+        else:
+            children = session.getChildren(ctl)
+            if children:
+                controlers.AddItems(children)
 
     # Right Clic - Do nothing
     elif in_mousebutton == 2:
@@ -164,12 +152,10 @@ def selectMulti(in_mousebutton, in_keymodifier, object_names, exclude=[]):
 
     # Remove objects
     # As we can yuse symbol such as '*' in the name list we might need to filter the result
-    for name in exclude:
-        if model.Name+"."+name in controlers.GetAsText().split(","):
-            controlers.RemoveItems(model.Name+"."+name)
+    removeNames(model, controlers, exclude)
 
     if not controlers.Count:
-        gear.log("Can't Find Controlers : "+",".join(object_names), sn.sev_siError)
+        gear.log("Can't Find Controlers : "+",".join(object_names), gear.sev_error)
         return
 
     # Key pressed =======================================
@@ -230,10 +216,10 @@ def quickSel(in_mousebutton, in_keymodifier, port="A"):
         if quickSel_param.Value == "":
             xsi.DeselectAll()
         else:
-            model = getModel()
+            session = getSession()
 
-            selection = [model.FindChild(name) for name in quickSel_param.Value.split(",") if model.FindChild(name)]
-            xsi.SelectObj(selection)
+            selection = [session.getObject(name) for name in quickSel_param.Value.split(",")]
+            xsi.SelectObj([obj for obj in selection if obj])
 
     # Middle click - Save selection
     elif in_mousebutton == 1:
@@ -295,6 +281,8 @@ def keyMulti(in_mousebutton, in_keymodifier, object_names, exclude=[]):
     
     model = getModel()
 
+    controlers = XSIFactory.CreateObject("XSI.Collection")
+
     # Get objects
     for name in object_names:
         children = model.FindChildren(name)
@@ -303,12 +291,10 @@ def keyMulti(in_mousebutton, in_keymodifier, object_names, exclude=[]):
 
     # Remove objects
     # As we can yuse symbol such as '*' in the name list we might need to filter the result
-    for name in exclude:
-        if model.Name+"."+name in controlers.GetAsText().split(","):
-            controlers.RemoveItems(model.Name+"."+name)
+    removeNames(model, controlers, exclude)
 
     if not controlers.Count:
-        gear.log("Can't Find Controlers : "+",".join(object_names), sn.sev_siError)
+        gear.log("Can't Find Controlers : "+",".join(object_names), gear.sev_error)
         return
 
     ani.setKey(controlers)
@@ -401,6 +387,36 @@ def smooth(in_mousebutton, in_keymodifier, level=0):
 
     anim_prop.Parameters(OGL_PARAM_NAME).Value = level
     
+##########################################################
+# PAGE
+##########################################################
+# ========================================================
+## Bind the regions of a synoptic page to the synoptic functions.\n
+## Each region gets a handler in the namespace of the page, named as the onClick of the region.
+# @param namespace Dictionary - Globals of the page script.
+# @param controlers List of String - Regions selecting the controler of the same name.
+# @param actions Dictionary - Synoptic function name and arguments, by region.
+def bindPage(namespace, controlers, actions):
+
+    for name in controlers:
+        namespace[name] = getHandler("select", (name,))
+
+    for name, (action, args) in actions.items():
+        namespace[name] = getHandler(action, args)
+
+## Return the handler of a synoptic region.
+# @param action String - Name of the synoptic function.
+# @param args Tuple - Arguments of the function, after the mouse button and the key modifier.
+# @return Function
+def getHandler(action, args):
+
+    function = globals()[action]
+
+    def handler(in_obj, in_mousebutton, in_keymodifier):
+        function(in_mousebutton, in_keymodifier, *args)
+
+    return handler
+
 ##########################################################
 # GET
 ##########################################################
@@ -414,15 +430,18 @@ def getSynoptic():
 ## Return the current active model.
 # @return Model
 def getModel():
-    model_name = getSynoptic().Parameters("Model").Value
-    return xsi.ActiveSceneRoot.FindChild(model_name, c.siModelType)
+
+    session = getSession()
+    if session is None:
+        return None
+
+    return session.model
 
 # ========================================================
 ## return a list of controlers groups.
 # @return List of Group
 def getControlersGroups():
-    model = getModel()
-    return [group for group in model.Groups if group.Name.startswith(CTRL_GRP_PREFIX)]
+    return getSession().groups
 
 # ========================================================
 ## Return all the controlers according to filter.
@@ -436,4 +455,150 @@ def getAllControlers():
         if synoptic_prop.Parameters(group.Name) and synoptic_prop.Parameters(group.Name).Value:
             controlers.AddItems(group.Members)
 
-    return controlers
\ No newline at end of file
+    return controlers
+
+##########################################################
+# TOOLS
+##########################################################
+# ========================================================
+## Remove some objects from a collection, with one call.
+# @param model Model
+# @param controlers XSICollection
+# @param names List of String - Names of the objects to remove.
+def removeNames(model, controlers, names):
+
+    if not names or not controlers.Count:
+        return
+
+    members = set(controlers.GetAsText().split(","))
+    removed = [model.Name+"."+name for name in names if model.Name+"."+name in members]
+    if removed:
+        controlers.RemoveItems(",".join(removed))
+
+##########################################################
+# SESSION
+##########################################################
+# ========================================================
+## Return the synoptic session of the current active model.\n
+## The session is kept by model name and made again when the model is replaced or rebuilt.
+# @return SynopticSession - None if the model can't be found.
+def getSession():
+
+    model_name = getSynoptic().Parameters("Model").Value
+
+    session = SESSIONS.get(model_name)
+    if session is not None:
+        model = xsi.Dictionary.GetObject(model_name, False)
+        if model and session.signature == getSignature(model):
+            return session
+
+    model = xsi.ActiveSceneRoot.FindChild(model_name, c.siModelType)
+    if not model:
+        if model_name in SESSIONS:
+            del SESSIONS[model_name]
+        return None
+
+    session = SynopticSession(model)
+    SESSIONS[model_name] = session
+
+    return session
+
+## Return the signature of a model.\n
+## The build date of the rig is set again by a rebuild, so the signature changes with a new model or a rebuild.
+# @param model Model
+# @return Tuple
+def getSignature(model):
+
+    info_prop = model.Properties(INFO_PROP_NAME)
+    if info_prop and info_prop.Parameters(DATE_PARAM_NAME):
+        return (model.ObjectID, str(info_prop.Parameters(DATE_PARAM_NAME).Value))
+
+    return (model.ObjectID, None)
+
+## Remove models from the session cache.
+# @param model_name String - Name of the model to remove. None to clear the whole cache.
+def clearCache(model_name=None):
+
+    if model_name is None:
+        SESSIONS.clear()
+    elif model_name in SESSIONS:
+        del SESSIONS[model_name]
+
+# ========================================================
+## The controlers of a model, read once for all the clicks of the synoptic.
+class SynopticSession(object):
+
+    ## Init Method.\n
+    ## The controlers are read from the controlers groups, with one GetAsText() per group.
+    # @param self
+    # @param model Model
+    def __init__(self, model):
+
+        self.model = model
+        self.signature = getSignature(model)
+
+        self.groups = [group for group in model.Groups if group.Name.startswith(CTRL_GRP_PREFIX)]
+
+        # Full names of the controlers, and objects by name
+        self.names = set()
+        self.objects = {}
+        for group in self.groups:
+            for obj in group.Members:
+                if obj.FullName not in self.names:
+                    self.names.add(obj.FullName)
+                    self.objects[obj.Name] = obj
+
+        # Indexed controlers by name without index
+        self.chains = {}
+        for name in self.objects.keys():
+            sIndex = re.search("[0-9]+_ctl$", name)
+            if sIndex:
+                self.chains.setdefault(name[:sIndex.start()], {})[int(sIndex.group(0)[:-4])] = name
+
+        # Controlers children by name, filled when asked
+        self.children = {}
+
+    ## Return an object of the model by name.
+    # @param self
+    # @param name String - Name of the object.
+    # @return X3DObject - None if the object can't be found.
+    def getObject(self, name):
+
+        if name not in self.objects:
+            obj = self.model.FindChild(name)
+            if not obj:
+                return None
+            self.objects[name] = obj
+
+        return self.objects[name]
+
+    ## Return the controlers following a controler in its chain, as name1_ctl, name2_ctl...
+    # @param self
+    # @param name String - Name of the controler.
+    # @return List of X3DObject
+    def getNextSiblings(self, name):
+
+        sIndex = re.search("[0-9]+_ctl$", name)
+        if not sIndex:
+            return []
+
+        chain = self.chains.get(name[:sIndex.start()], {})
+        index = int(sIndex.group(0)[:-4]) + 1
+
+        siblings = []
+        while index in chain:
+            siblings.append(self.objects[chain[index]])
+            index += 1
+
+        return siblings
+
+    ## Return the controlers under an object.
+    # @param self
+    # @param obj X3DObject
+    # @return List of X3DObject
+    def getChildren(self, obj):
+
+        if obj.FullName not in self.children:
+            self.children[obj.FullName] = [child for child in obj.FindChildren() if child.FullName in self.names]
+
+        return self.children[obj.FullName]
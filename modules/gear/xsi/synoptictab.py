@@ -0,0 +1,470 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+## @package gear.xsi.synoptictab
+# @author Jeremie Passerin
+#
+# @brief compiled tabs of the synoptic.
+#
+# A tab of the synoptic is a folder with a parameters.py, a logic.py and a layout.py. The bundle of a
+# tab keeps the byte-compiled logic, the parameters the tab adds to the synoptic property and the
+# layout calls of the tab, recorded once. Opening the synoptic or switching models replays the
+# bundle instead of executing the tab files again. A bundle is compiled again when one of its files
+# is modified.\n
+# The layout of a tab is recorded without the synoptic property, so it must not depend on the scene.\n
+# The synoptic page of a tab can be generated from a hand written page and the controlers of a rig.
+# The generated page keeps the image map and binds the clickable regions to the synoptic functions
+# from one dispatch table, instead of defining a function for each region.
+
+##########################################################
+# GLOBAL
+##########################################################
+# Built-in
+import os
+import re
+import ast
+import textwrap
+
+# gear
+import gear
+import gear.xsi.parameter as par
+import gear.xsi.synoptic as syn
+
+TAB_FILES = ("parameters.py", "logic.py", "layout.py")
+
+# Handler of a region in a hand written page, as : def name(in_obj, in_mousebutton, in_keymodifier): syn.action(in_mousebutton, in_keymodifier, args)
+HANDLER_PATTERN = re.compile(r"^def (\w+)\(in_obj, in_mousebutton, in_keymodifier\): *syn\.(\w+)\(in_mousebutton, in_keymodifier(?:, *(.*))?\)\s*$")
+REGION_PATTERN = re.compile(r"onClick=\"(\w+)\"", re.IGNORECASE)
+SCRIPT_PATTERN = re.compile(r"(<script[^>]*>)(.*?)(</script>)", re.IGNORECASE | re.DOTALL)
+
+# Dispatch table of a generated page
+CONTROLERS_PATTERN = re.compile(r'^CONTROLERS = """(.*?)"""', re.MULTILINE | re.DOTALL)
+ACTIONS_PATTERN = re.compile(r"^ACTIONS = (\{.*?^\})", re.MULTILINE | re.DOTALL)
+
+# Bundles by tab folder path
+BUNDLES = {}
+
+# Text of the files by path, with their modification time
+TEXTS = {}
+
+##########################################################
+# BUNDLE
+##########################################################
+# ========================================================
+## Return the bundle of a tab.\n
+## The bundle is compiled on first call and when the modification time of one of the tab files changes.
+# @param path String - Path of the tab folder.
+# @param name String - Name of the tab in the layout.
+# @return TabBundle - None if the folder doesn't exist.
+def getBundle(path, name):
+
+    if not os.path.exists(path):
+        return None
+
+    signature = getSignature(path)
+
+    bundle = BUNDLES.get(path)
+    if bundle is not None and bundle.signature == signature and bundle.name == name:
+        return bundle
+
+    bundle = TabBundle(path, name, signature)
+    BUNDLES[path] = bundle
+
+    return bundle
+
+## Return the modification times of the files of a tab.
+# @param path String - Path of the tab folder.
+# @return Tuple - Modification time of each file, None for a missing file.
+def getSignature(path):
+    return tuple([getModificationTime(os.path.join(path, file_name)) for file_name in TAB_FILES])
+
+## Return the modification time of a file.
+# @param path String
+# @return Float - None if the file doesn't exist.
+def getModificationTime(path):
+
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+## Return the text of a file, read again when the file is modified.
+# @param path String
+# @return String
+def getText(path):
+
+    mtime = getModificationTime(path)
+
+    cached = TEXTS.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    f = open(path, "r")
+    try:
+        text = f.read()
+    finally:
+        f.close()
+
+    TEXTS[path] = (mtime, text)
+
+    return text
+
+## Remove the bundles and the texts from the cache.
+def clearCache():
+
+    BUNDLES.clear()
+    TEXTS.clear()
+
+# ========================================================
+## Compiled tab of the synoptic.
+class TabBundle(object):
+
+    ## Init Method.
+    # @param self
+    # @param path String - Path of the tab folder.
+    # @param name String - Name of the tab in the layout.
+    # @param signature Tuple - Modification times of the tab files.
+    def __init__(self, path, name, signature):
+
+        self.path = path
+        self.name = name
+        self.signature = signature
+
+        ## Logic of the tab, added to the logic of the synoptic
+        self.logic = ""
+        ## Arguments of AddParameter3 for each parameter of the tab. None to call the tab function.
+        self.parameters = []
+        ## Layout calls of the tab. None if the tab has no layout, False to call the tab function.
+        self.layout = None
+        ## Calls of the layout on the synoptic property
+        self.properties = None
+
+        # Functions of the tab, used when the recording failed
+        self.functions = {}
+
+        self.compile()
+
+    ## Compile the files of the tab.
+    # @param self
+    def compile(self):
+
+        param_path = os.path.join(self.path, "parameters.py")
+        logic_path = os.path.join(self.path, "logic.py")
+        layout_path = os.path.join(self.path, "layout.py")
+
+        # Logic ------------------
+        if os.path.exists(logic_path):
+            logic = getText(logic_path)
+            try:
+                compile(logic, logic_path, "exec")
+                self.logic = logic
+            except SyntaxError, e:
+                gear.log("Invalid synoptic logic, the tab logic is skipped : " + logic_path + "\r\n" + str(e), gear.sev_error)
+
+        # Parameters -------------
+        if os.path.exists(param_path):
+            function = self.loadFunction(param_path, "addParameters")
+            recorder = ParameterRecorder()
+            try:
+                function(recorder)
+                self.parameters = recorder.parameters
+            except Exception, e:
+                gear.log("Can't record the synoptic parameters : " + param_path + "\r\n" + str(e), gear.sev_warning)
+                self.parameters = None
+
+        # Layout -----------------
+        if os.path.exists(layout_path):
+            function = self.loadFunction(layout_path, "addLayout")
+            layout = CallRecorder()
+            properties = CallRecorder()
+            try:
+                function(layout, properties)
+                self.layout = layout
+                self.properties = properties
+            except Exception, e:
+                gear.log("Can't record the synoptic layout : " + layout_path + "\r\n" + str(e), gear.sev_warning)
+                self.layout = False
+
+    ## Load a function from a file of the tab.
+    # @param self
+    # @param path String - Path of the file.
+    # @param name String - Name of the function.
+    # @return Function
+    def loadFunction(self, path, name):
+
+        code = compile(getText(path), path, "exec")
+
+        namespace = {"__name__":"gear_Synoptic_" + os.path.basename(self.path), "__file__":path}
+        exec code in namespace
+
+        self.functions[name] = namespace[name]
+
+        return namespace[name]
+
+    ## Add the parameters of the tab to the synoptic property.
+    # @param self
+    # @param prop Property - The synoptic property.
+    def addParameters(self, prop):
+
+        if self.parameters is None:
+            self.functions["addParameters"](prop)
+            return
+
+        for args in self.parameters:
+            par.createOrReturnParameters3(prop, *args)
+
+    ## Return True if the tab has a layout.
+    # @param self
+    # @return Boolean
+    def hasLayout(self):
+        return self.layout is not None
+
+    ## Add the layout of the tab.
+    # @param self
+    # @param layout PPGLayout - The layout of the synoptic.
+    # @param prop Property - The synoptic property.
+    def addLayout(self, layout, prop):
+
+        if self.layout is False:
+            self.functions["addLayout"](layout, prop)
+            return
+
+        # The parameter values are set before the controls that use them
+        self.properties.replay(prop)
+        self.layout.replay(layout)
+
+##########################################################
+# PAGE
+##########################################################
+# ========================================================
+## Generate the synoptic page of a tab.\n
+## The regions of the page that select a controler of the same name are bound in one list. With a model, the
+## regions named as one of its controlers are bound too, so a new page only needs its image map.
+# @param path String - Path of the hand written page.
+# @param model Model - A rig built with this page. None to use the functions of the page only.
+# @param out_path String - Path of the generated page. None to replace the hand written page.
+# @return SynopticPage
+def generatePage(path, model=None, out_path=None):
+
+    page = SynopticPage(path)
+
+    controlers = None
+    if model is not None:
+        controlers = syn.SynopticSession(model).objects.keys()
+
+    page.write(out_path or path, controlers)
+
+    return page
+
+# ========================================================
+## Synoptic page, with the handlers of its regions.
+class SynopticPage(object):
+
+    ## Init Method.
+    # @param self
+    # @param path String - Path of the page.
+    def __init__(self, path):
+
+        self.path = path
+
+        ## Html before and after the script
+        self.head = ""
+        self.tail = ""
+        ## Docstring of the script
+        self.header = ""
+        ## Line separator of the page
+        self.newline = "\n"
+        ## Names of the regions, in the image map order
+        self.regions = []
+        ## Synoptic function and arguments by handler name
+        self.handlers = {}
+
+        self.read()
+
+    ## Read the page.
+    # @param self
+    def read(self):
+
+        text = getText(self.path)
+        if "\r\n" in text:
+            self.newline = "\r\n"
+
+        match = SCRIPT_PATTERN.search(text)
+        if not match:
+            gear.log("No script in the synoptic page : " + self.path, gear.sev_warning)
+            self.head = text
+            return
+
+        self.head = text[:match.start()] + match.group(1)
+        self.tail = match.group(3) + text[match.end():]
+
+        script = match.group(2)
+        header = re.match(r"\s*('{3}.*?'{3})", script, re.DOTALL)
+        if header:
+            self.header = header.group(1)
+
+        for line in script.splitlines():
+            handler = HANDLER_PATTERN.match(line)
+            if handler:
+                name, action, args = handler.groups()
+                self.handlers[name] = (action, args and ast.literal_eval("(" + args + ",)") or ())
+
+        # Generated page
+        controlers = CONTROLERS_PATTERN.search(script)
+        if controlers:
+            for name in controlers.group(1).split():
+                self.handlers[name] = ("select", (name,))
+
+        actions = ACTIONS_PATTERN.search(script)
+        if actions:
+            self.handlers.update(ast.literal_eval(actions.group(1).replace("\r\n", "\n")))
+
+        for name in REGION_PATTERN.findall(self.tail):
+            if name not in self.regions:
+                self.regions.append(name)
+
+    ## Return the dispatch table of the page.
+    # @param self
+    # @param controlers List of String - Names of the controlers of a rig. None to use the handlers of the page only.
+    # @return Tuple - The list of the regions selecting the controler of the same name, and the synoptic function and arguments of the other regions by name.
+    def getTable(self, controlers=None):
+
+        if controlers is not None:
+            controlers = set(controlers)
+
+        selections = []
+        actions = {}
+        for name in self.regions:
+            handler = self.handlers.get(name)
+            if handler == ("select", (name,)) or (handler is None and controlers and name in controlers):
+                selections.append(name)
+            elif handler is not None:
+                actions[name] = handler
+            else:
+                gear.log("No function for the synoptic region : " + name, gear.sev_warning)
+
+        if controlers is not None:
+            missing = [name for name in selections if name not in controlers]
+            if missing:
+                gear.log("Regions without controler in the rig : " + ", ".join(missing), gear.sev_warning)
+
+        return selections, actions
+
+    ## Return the html of the generated page.
+    # @param self
+    # @param controlers List of String - Names of the controlers of a rig. None to use the handlers of the page only.
+    # @return String
+    def getHtml(self, controlers=None):
+
+        selections, actions = self.getTable(controlers)
+
+        lines = ["", self.header,
+                 "",
+                 "##########################################################",
+                 "# GLOBAL",
+                 "##########################################################",
+                 "import gear.xsi.synoptic as syn",
+                 "",
+                 "##########################################################",
+                 "# REGIONS",
+                 "##########################################################",
+                 "# Generated by gear.xsi.synoptictab.generatePage()",
+                 "CONTROLERS = \"\"\""]
+        lines.extend(textwrap.wrap(" ".join(selections), 100))
+        lines.append("\"\"\"")
+        lines.append("")
+        lines.append("ACTIONS = {")
+        for name in self.regions:
+            if name in actions:
+                lines.append("    %r:(%r, %r),"%(name, actions[name][0], actions[name][1]))
+        lines.append("}")
+        lines.append("")
+        lines.append("syn.bindPage(globals(), CONTROLERS.split(), ACTIONS)")
+        lines.append("")
+
+        return self.head + self.newline.join(lines) + self.tail
+
+    ## Write the generated page.
+    # @param self
+    # @param path String - Path of the generated page.
+    # @param controlers List of String - Names of the controlers of a rig. None to use the handlers of the page only.
+    def write(self, path, controlers=None):
+
+        html = self.getHtml(controlers)
+
+        f = open(path, "wb")
+        try:
+            f.write(html)
+        finally:
+            f.close()
+
+##########################################################
+# RECORDERS
+##########################################################
+# ========================================================
+## Synoptic property without parameters, that keeps the parameters added to it.
+class ParameterRecorder(object):
+
+    def __init__(self):
+        self.parameters = []
+
+    def Parameters(self, name):
+        return None
+
+    def AddParameter3(self, *args):
+        self.parameters.append(args)
+
+# ========================================================
+## Record the calls and the attributes set on an object, and on the objects returned by the calls.
+class CallRecorder(object):
+
+    def __init__(self):
+        self.__dict__["calls"] = []
+
+    def __getattr__(self, name):
+
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def call(*args):
+            result = CallRecorder()
+            self.calls.append((name, args, result))
+            return result
+
+        return call
+
+    def __setattr__(self, name, value):
+        self.calls.append((name, value, None))
+
+    ## Make the recorded calls on an object.
+    # @param self
+    # @param target Object
+    def replay(self, target):
+
+        for name, args, result in self.calls:
+            if result is None:
+                setattr(target, name, args)
+            elif result.calls:
+                result.replay(getattr(target, name)(*args))
+            else:
+                getattr(target, name)(*args)
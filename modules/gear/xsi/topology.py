@@ -0,0 +1,166 @@
+'''
+
+    This file is part of GEAR.
+
+    GEAR is free software: you can redistribute it and/or modify
+    it under the terms of the GNU Lesser General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU Lesser General Public License for more details.
+
+    You should have received a copy of the GNU Lesser General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/lgpl.html>.
+
+    Author:     Jeremie Passerin      geerem@hotmail.com
+    Company:    Studio Nest (TM)
+    Date:       2010 / 11 / 15
+
+'''
+
+## @package gear.xsi.topology
+# @author Jeremie Passerin
+#
+
+##########################################################
+# GLOBAL
+##########################################################
+from gear.xsi import xsi, c
+
+import gear.topology as top
+
+# Maximum number of meshes and stencils kept in the caches
+CACHE_SIZE = 32
+
+# Topology of the meshes by full name, with their element counts and topology hash
+CACHE = {}
+CACHE_KEYS = []
+
+# Smoothing stencils by operator full name, with their topology and signature
+STENCILS = {}
+STENCILS_KEYS = []
+
+##########################################################
+# TOPOLOGY
+##########################################################
+# ========================================================
+## Return the topology tables of a polygon mesh.\n
+## The topology is read with one call to Get2() and cached by mesh. Each lookup compares the element counts
+## and the topology hash, the tables are only built again when the topology changes.
+# @param mesh Polymsh
+# @return MeshTopology
+def getTopology(mesh):
+    return getGeometryTopology(mesh.ActivePrimitive.Geometry, mesh.FullName)
+
+## Return the topology tables of a geometry, cached with a given key.\n
+## Use it inside operators, where the geometry is known without its object.\n
+## The cache is validated with the point, polygon and sample counts of the geometry. With check, the polygons are also
+## read with Get2() and compared to the topology hash, which catches the changes that keep the counts (ie. a flipped edge).
+## Operators evaluated on every change of their parameters skip the check, to stay independent of the mesh size when
+## the topology is cached, and rely on clearCache() for the changes that keep the counts.
+# @param geometry PolygonMesh
+# @param key String - Cache key, the full name of the mesh or of the operator.
+# @param check Boolean - True to compare the topology hash on each lookup.
+# @return MeshTopology
+def getGeometryTopology(geometry, key, check=True):
+
+    counts = (geometry.Points.Count, geometry.Polygons.Count, geometry.Samples.Count)
+
+    cached = CACHE.get(key)
+    if cached and cached[0] == counts and not check:
+        return cached[2]
+
+    vertices, polygon_data = geometry.Get2()
+    topology_hash = top.getTopologyHash(polygon_data)
+
+    if cached and cached[0] == counts and cached[1] == topology_hash:
+        return cached[2]
+
+    topology = top.MeshTopology(counts[0], polygon_data)
+    __store(CACHE, CACHE_KEYS, key, (counts, topology_hash, topology))
+
+    return topology
+
+## Return the smoothing stencil of an operator.\n
+## The stencil is built once and rebuilt when the points, the depth or the element counts change. The polygons are
+## not read again while the counts don't change, so an evaluation with a cached stencil doesn't depend on the mesh size.
+# @param op Operator - The smoothing operator.
+# @param geometry PolygonMesh
+# @param points List of Integer - Vertex indexes to smooth.
+# @param depth Integer - Neighborhood depth, as NeighborVertices(depth).
+# @return SmoothingStencil
+def getSmoothingStencil(op, geometry, points, depth):
+
+    key = op.FullName
+    topology = getGeometryTopology(geometry, key, False)
+    signature = (depth, hash(tuple(points)))
+
+    cached = STENCILS.get(key)
+    if cached and cached[0] is topology and cached[1] == signature:
+        return cached[2]
+
+    stencil = topology.getSmoothingStencil(points, depth)
+    __store(STENCILS, STENCILS_KEYS, key, (topology, signature, stencil))
+
+    return stencil
+
+## Remove meshes or operators from the topology cache.
+# @param obj Polymsh or Operator - The mesh or the operator to remove. None to clear the whole cache.
+def clearCache(obj=None):
+
+    if obj is None:
+        CACHE.clear()
+        del CACHE_KEYS[:]
+        STENCILS.clear()
+        del STENCILS_KEYS[:]
+        return
+
+    for cache, keys in [(CACHE, CACHE_KEYS), (STENCILS, STENCILS_KEYS)]:
+        if obj.FullName in cache:
+            del cache[obj.FullName]
+            keys.remove(obj.FullName)
+
+## Store a value in a cache, removing the least recently stored keys above CACHE_SIZE.
+# @param cache Dictionary
+# @param keys List - Keys of the cache, in storing order.
+# @param key String
+# @param value
+def __store(cache, keys, key, value):
+
+    if key in cache:
+        keys.remove(key)
+
+    cache[key] = value
+    keys.append(key)
+
+    while len(keys) > CACHE_SIZE:
+        del cache[keys.pop(0)]
+
+## Return the vertex to vertex adjacency of a polygon mesh.
+# @param mesh Polymsh
+# @return Adjacency
+def getVertexAdjacency(mesh):
+    return getTopology(mesh).getVertexAdjacency()
+
+## Return the vertices within a given number of edges from some vertices, as NeighborVertices(depth).
+# @param mesh Polymsh
+# @param indices List of Integer - Vertex indexes.
+# @param depth Integer
+# @return List of Integer
+def getVertexRing(mesh, indices, depth=1):
+    return getTopology(mesh).getVertexRing(indices, depth)
+
+## Return the connected polygon islands of a polygon mesh.
+# @param mesh Polymsh
+# @return List of List of Integer - Polygon indexes of each island.
+def getPolygonIslands(mesh):
+    return getTopology(mesh).getPolygonIslands()
+
+## Return the boundary vertices of a polygon mesh.
+# @param mesh Polymsh
+# @return List of Integer
+def getBoundaryVertices(mesh):
+    return getTopology(mesh).getBoundaryVertices()
@@ -58,6 +58,17 @@ def getTransformLookingAt(position, lookat, normal, axis="xy", negate=False):
 
     return t
 
+# getTransformFromMatrixValues ===========================
+## Get a transform from the values of a 4x4 matrix.
+# @param values List of Double - The 16 values of the matrix, as SIMatrix4.Get2().
+# @return SITransformation - The newly created transform.
+def getTransformFromMatrixValues(values):
+
+    t = XSIMath.CreateTransform()
+    t.SetMatrix4(XSIMath.CreateMatrix4(*values))
+
+    return t
+
 # ===========================================================
 def getChainTransform(positions, normal, negate=False):
 
@@ -35,6 +35,7 @@ from xml.etree.cElementTree import ElementTree, Element, SubElement
 import gear
 import gear.xmldom as xmldom
 import gear.encode as enc
+import gear.weights as wgt
 
 from gear.xsi import xsi, c, XSIMath, dynDispatch, XSIFactory
 
@@ -819,7 +820,7 @@ class X3DObject(SceneItem):
 
         for xml_obj in self.xml.findall("x3dobject"):
             xObject = xmlToObject(xml_obj, obj)
-            xObject.generateObject(parent)
+            xObject.generateObject(obj)
 
         return obj
 
@@ -1305,16 +1306,14 @@ class EnvelopeOp(Operator):
 
         xml_weights = SubElement(self.xml, "weights", points=str(pnt_count), compressed=str(OPTIONS["Compression"]))
 
+        sparse = wgt.getSparseFromArray(weightsTuple)
+
         if OPTIONS["Compression"]:
-            xml_weights.text = enc.encodeData(weightsTuple)
+            xml_weights.text = enc.encodeWeights(sparse)
         else:
-            for pntIndex in range(pnt_count):
+            for pntIndex, indices, weights in sparse.iterPoints():
 
-                pnt_weights = []
-                for defIndex in range(def_count):
-                    weight = weightsTuple[defIndex][pntIndex]
-                    if weight > 0:
-                        pnt_weights.append(str(defIndex)+"="+str(weight))
+                pnt_weights = [str(defIndex)+"="+str(weight) for defIndex, weight in zip(indices, weights) if weight > 0]
 
                 xml_pnt = SubElement(xml_weights, "point")
                 xml_pnt.set("id", str(pntIndex))
@@ -1350,6 +1349,35 @@ class EnvelopeOp(Operator):
             else:
                  deformers[def_index] = deformer
 
+        # retrieve Weights ------------------------------------------
+        # Compressed datas
+        if xml_weights.get("compressed")=="True":
+            try:
+                retrieved_weights = enc.decodeWeights(xml_weights.text)
+            except ValueError, e:
+                gear.log("Unable to retrieve envelope : " + str(e), gear.sev_error)
+                return
+
+        # Uncompressed
+        else:
+            points_weights = {}
+            for xml_point in xml_weights.findall("point"):
+
+                 point_index = int(xml_point.get("id"))
+                 pnt_weights = {}
+
+                 for weight in xml_point.get("weights").split(","):
+
+                      if not weight:
+                            continue
+
+                      weight_info = weight.split("=")
+                      pnt_weights[int(weight_info[0])] = float(weight_info[1])
+
+                 points_weights[point_index] = wgt.splitWeights(pnt_weights)
+
+            retrieved_weights = wgt.getSparseFromDict(pnt_count, len(deformers), points_weights)
+
         # Apply or re-apply envelope --------------------------------
         bWasNotEnveloped = not self.getOperatorFromStack(obj, "envelopop")
 
@@ -1363,13 +1391,6 @@ class EnvelopeOp(Operator):
         envelopeOp = obj.ApplyEnvelope(cDeformers)
         def_count = envelopeOp.Deformers.Count
 
-        # Get original weights (if we have no point selection or mesh wasn't enveloped we start from an empty weights array)
-        if not pnt_selection or bWasNotEnveloped:
-            weights = [0] * pnt_count * envelopeOp.Deformers.Count
-        else:
-            weightsTuple = envelopeOp.Weights.Array
-            weights = [weightsTuple[j][i] for i in range(len(weightsTuple[0])) for j in range(len(weightsTuple))]
-
         # Get real deformer Index -----------------------------------
         deformers_index = [None] * len(deformers)
         for i, deformer in enumerate(deformers):
@@ -1378,57 +1399,18 @@ class EnvelopeOp(Operator):
             else:
                  deformers_index[i] = -1
 
-        # retrieve Weights ------------------------------------------
-        # Compressed datas
-        if xml_weights.get("compressed")=="True":
-
-            retrieved_weights = enc.decodeData(compressed.text)
-
-            for point_index in range(pnt_count):
-
-                # if we have a point selection, we only retrieve envelope on selection
-                if pnt_selection and (point_index not in pnt_selection):
-                    continue
-
-                for deformer_index in range(len(retrieved_weights)):
-
-                    deformer_realIndex = deformers_index[deformer_index]
-
-                    # Skip missing deformer
-                    if deformer_realIndex == -1 :
-                        continue
-
-                    weights[point_index * iDeformers + deformer_realIndex] = retrieved_weights[deformer_index][point_index]
-
-        # Uncompressed
-        else:
-            for xml_point in xml_weights.findall("point"):
-
-                 point_index = int(xml_point.get("id"))
-                 pnt_weights = xml_point.get("weights").split(",")
-
-                 # if we have a point selection, we only retrieve envelope on selection
-                 if pnt_selection and (point_index not in pnt_selection):
-                      continue
-
-                 for weight in pnt_weights:
-
-                      if not weight:
-                            continue
-
-                      weight_info = weight.split("=")
-                      deformer_realIndex = deformers_index[int(weight_info[0])]
-
-                      # Skip missing deformer
-                      if deformer_realIndex == -1 :
-                            continue
-
-                      weights[point_index * def_count + deformer_realIndex] = float(weight_info[1])
+        # Skip missing deformer
+        # if we have a point selection, we only retrieve envelope on selection
+        # (if the mesh wasn't enveloped we start from an empty weights array)
+        current = None
+        if pnt_selection and not bWasNotEnveloped:
+            current = wgt.getSparseFromArray(envelopeOp.Weights.Array)
 
+        weights = wgt.getEnvelopeWeights(retrieved_weights, deformers_index, def_count, pnt_selection, current)
 
         # Finalizing -------------------------------------------------
         # Apply Weights
-        envelopeOp.Weights.Array = weights
+        envelopeOp.Weights.Array = weights.getArray()
 
         # Rebuilt Envelope to have the good deformers colors and warning
         envelopeOp = self.__rebuiltEnvelope(envelopeOp)
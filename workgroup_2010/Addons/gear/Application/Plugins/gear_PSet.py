@@ -75,15 +75,14 @@ def gear_PSet_Define(in_ctxt):
     prop.AddParameter3("layout", c.siString, "", None, None, False, False)
     prop.AddParameter3("logic", c.siString, "", None, None, False, False)
     prop.AddParameter3("debug", c.siBool, False, None, None, False, False)
+    prop.AddParameter3(ppg.LAYOUT_HASH_NAME, c.siString, "", None, None, False, False)
 
 # Define Layout ==========================================
 def gear_PSet_DefineLayout(in_ctxt):
 
     layout = in_ctxt.Source
 
-    path = plu.getPluginFullPath("gear_PSet")
-    f = open(path)
-    layout.Logic = f.read()
+    layout.Logic = plu.getPluginCode("gear_PSet")
 
     return True
 
@@ -94,23 +93,24 @@ def gear_PSet_OnInit():
     layout = PPG.PPGLayout
 
     # Define the Logic -----------------------------------------------
-    path = plu.getPluginFullPath("gear_PSet")
-    f = open(path)
-
-    layout.Logic = f.read()
-    layout.Logic += PPG.Logic.Value
+    layout.Logic = plu.getPluginCode("gear_PSet") + PPG.Logic.Value
 
     # Define Layout --------------------------------------------------
     layout.Clear()
 
-    baseParameters = ["layout", "logic", "debug"]
+    baseParameters = ["layout", "logic", "debug", ppg.LAYOUT_HASH_NAME]
+    baseCount = len([name for name in baseParameters if prop.Parameters(name)])
+
+    # The layout is identified by the hash of its code, so its code is only compiled when it changes
+    key = ppg.getLayoutHash(prop)
+    emptyLayout = key == ppg.getCodeHash("")
 
     # If there is no parameters and debug mode is False
-    if not PPG.debug.Value and prop.Parameters.Count == len(baseParameters):
+    if not PPG.debug.Value and prop.Parameters.Count == baseCount:
         layout.AddStaticText("No Parameter to display")
 
     # If Debug Mode is True or no layout has been define
-    elif PPG.debug.Value or PPG.layout.Value == "":
+    elif PPG.debug.Value or emptyLayout:
 
         layout.AddTab("DEBUG LAYOUT")
 
@@ -145,15 +145,12 @@ def gear_PSet_OnInit():
         layout.EndGroup()
 
         # If there is no layout define we still display the parameter with a default layout
-        if PPG.layout.Value == "":
+        if emptyLayout:
             drawDefaultLayout(prop, baseParameters)
 
     # Add custom Layout -----------------------------------------
-    layoutcode = PPG.layout.Value.replace("\r\n", "\r\n    ")
-    code = "def readLayout(layout, PPG):\r\n    "+layoutcode+"\r\n    return\r\n"
-
     try:
-        xsi.ExecuteScriptCode(code, "Python", "readLayout", [layout, PPG])
+        ppg.readLayout(prop, layout, PPG, key)
     except Exception, e:
 
         gear.log("INVALID LAYOUT DETECTED ========================", gear.sev_error)
@@ -161,7 +158,7 @@ def gear_PSet_OnInit():
             gear.log(arg, gear.sev_error)
 
         gear.log("LAYOUT CODE ====================================", gear.sev_error)
-        gear.log("\r\n"+code, gear.sev_error)
+        gear.log("\r\n"+PPG.layout.Value, gear.sev_error)
         gear.log("END OF LAYOUT CODE =============================", gear.sev_error)
 
         drawDefaultLayout(prop, baseParameters)
@@ -193,6 +190,10 @@ def gear_PSet_hide_OnClicked():
     PPG.debug.Value = False
     gear_PSet_OnInit()
 
+# ========================================================
+def gear_PSet_layout_OnChanged():
+    ppg.setLayoutHash(PPG.Inspected(0), PPG.layout.Value)
+
 # ========================================================
 def gear_PSet_generateLayout_OnClicked():
 
@@ -203,10 +204,10 @@ def gear_PSet_generateLayout_OnClicked():
     tab = ppglayout.addTab(prop.Name)
     group = tab.addGroup("Default Layout")
     for param in prop.Parameters:
-        if param.ScriptName not in ["layout", "logic", "debug"]:
+        if param.ScriptName not in ["layout", "logic", "debug", ppg.LAYOUT_HASH_NAME]:
             group.addItem(param.ScriptName)
 
-    PPG.layout.Value = ppglayout.getValue()
+    ppg.setPSetCode(prop, ppglayout.getValue())
 
     PPG.Refresh()
 
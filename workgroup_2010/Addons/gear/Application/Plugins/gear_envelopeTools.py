@@ -165,23 +165,28 @@ def gear_CopyWeightsOp_Update(ctxt):
     cls = ctxt.GetInputValue(1, 0, 0)
 
     weights_tuple = env_cls.Elements.Array
-    weights = [weights_tuple[j][i] for i in range(len(weights_tuple[0])) for j in range(len(weights_tuple))]
     aPoints = cls.Elements.Array
 
     dBlend = ctxt.GetParameterValue("Blend")
     iRefIndex = ctxt.GetParameterValue("Index")
 
-    # Use upper bound of safearray to get total num of deformers
-    deformer_count = len(weights_tuple)
+    # Only the points of the cluster are rewritten in the buffer
+    weights = ope.getPointBuffer(ctxt.Source)
+    weights.update(weights_tuple)
 
     # Process -----------------------------------------------
+    ref_weights = weights.getSourcePoint(iRefIndex)
     for point_index in aPoints:
-        for deformer_index in range(deformer_count):
-            weights[point_index*deformer_count + deformer_index] = dBlend * weights_tuple[deformer_index][iRefIndex] + (1-dBlend) * weights_tuple[deformer_index][point_index]
+        point_weights = weights.getSourcePoint(point_index)
+        weights.setPoint(point_index, [dBlend * ref + (1-dBlend) * w for ref, w in zip(ref_weights, point_weights)])
 
     # Output -------------------------------------------------
     Out = ctxt.OutputTarget
-    Out.Elements.Array = weights
+    Out.Elements.Array = weights.values
+
+# Term ===================================================
+def gear_CopyWeightsOp_Term(ctxt):
+    ope.clearPointBuffers(ctxt.Source)
 
 # Execute ================================================
 def gear_CopyWeights_Execute():
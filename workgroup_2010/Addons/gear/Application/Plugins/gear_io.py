@@ -30,6 +30,7 @@
 ##########################################################
 # gear
 import gear
+import gear.skinfile as skf
 
 from gear.xsi import xsi, c, dynDispatch
 
@@ -80,7 +81,7 @@ def gear_ImportSkin_Execute():
 
     # -----------------------------------------------------
     # Getting the file path
-    path = uit.fileBrowser("Import Skin", xsi.ActiveProject2.OriginPath, "", ["xml"], False)
+    path = uit.fileBrowser("Import Skin", xsi.ActiveProject2.OriginPath, "", ["xml", skf.EXTENSION], False)
     if not path:
         return
 
@@ -107,7 +108,7 @@ def gear_ImportEnvelope_Execute():
 
     # -----------------------------------------------------
     # Getting the file path
-    path = uit.fileBrowser("Import Envelope", xsi.ActiveProject2.OriginPath, "", ["xml"], False)
+    path = uit.fileBrowser("Import Envelope", xsi.ActiveProject2.OriginPath, "", ["xml", skf.EXTENSION], False)
     if not path:
         return
 
@@ -144,11 +145,15 @@ def gear_ExportSkin_Execute():
 
     # -----------------------------------------------------
     # Getting the file path
-    path = uit.fileBrowser("Export Skin", xsi.ActiveProject2.OriginPath, xsi.Selection(0).Model.Name+"_skin.xml", ["xml"], True)
+    path = uit.fileBrowser("Export Skin", xsi.ActiveProject2.OriginPath, xsi.Selection(0).Model.Name+"_skin.xml", ["xml", skf.EXTENSION], True)
     if not path:
         return
 
-    io.exportSkin(path, xsi.Selection, False)
+    # The file extension gives the format
+    if path.lower().endswith("."+skf.EXTENSION):
+        io.exportBinarySkin(path, xsi.Selection)
+    else:
+        io.exportSkin(path, xsi.Selection, False)
 
 # ========================================================
 ## Export Envelope
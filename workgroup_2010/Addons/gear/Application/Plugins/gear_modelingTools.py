@@ -29,11 +29,13 @@
 # GLOBAL
 ##########################################################
 import gear
+import gear.points as pnt
 
 from gear.xsi import xsi, c, XSIFactory, dynDispatch
 
 import gear.xsi.utils as uti
 import gear.xsi.geometry as geo
+import gear.xsi.operator as ope
 import gear.xsi.uitoolkit as uit
 
 ##########################################################
@@ -115,37 +117,33 @@ def gear_MatchGeometryOp_Update(ctxt):
     blend = ctxt.GetParameterValue("blend")
     mode = ctxt.GetParameterValue("mode")
 
-    mInvOutGeom = XSIMath.CreateMatrix4()
-    mInvOutGeom.Invert(mOutGeom)
+    # Local position from target object to source object
+    if mode == 1:
+        mInvOutGeom = XSIMath.CreateMatrix4()
+        mInvOutGeom.Invert(mOutGeom)
+        mTransform = XSIMath.CreateMatrix4()
+        mTransform.Mul(mInGeom, mInvOutGeom)
+        matrix = mTransform.Get2()
+    else:
+        matrix = None
 
     # Get Arrays --------------------------------------------
     aOutPosTuple = out_geo.Points.PositionArray
     aInPosTuple  = in_geo.Points.PositionArray
 
-    aOutPosition = [aOutPosTuple[j][i] for i in range(len(aOutPosTuple[0])) for j in range(len(aOutPosTuple))]
+    aOutPosition = ope.getPointBuffer(ctxt.Source)
+    aOutPosition.update(aOutPosTuple)
 
     # Process -----------------------------------------------
-    for point_index in cls.Elements.Array:
-
-        vTarget = XSIMath.CreateVector3(aInPosTuple[0][point_index], aInPosTuple[1][point_index], aInPosTuple[2][point_index])
-        vSource = XSIMath.CreateVector3(aOutPosTuple[0][point_index], aOutPosTuple[1][point_index], aOutPosTuple[2][point_index])
-
-        # convert local position from target object to source object
-        if mode == 1:
-            vTarget.MulByMatrix4InPlace(mInGeom)
-            vTarget.MulByMatrix4InPlace(mInvOutGeom)
-
-        vResult = XSIMath.CreateVector3()
-        vResult.Sub(vTarget, vSource)
-
-        vResult.ScaleInPlace(blend)
-
-        aOutPosition[point_index*3+0] = aOutPosTuple[0][point_index]+ vResult.X
-        aOutPosition[point_index*3+1] = aOutPosTuple[1][point_index]+ vResult.Y
-        aOutPosition[point_index*3+2] = aOutPosTuple[2][point_index]+ vResult.Z
+    points = cls.Elements.Array
+    aOutPosition.setPoints(points, pnt.blendPoints(aOutPosTuple, aInPosTuple, points, blend, matrix))
 
     Out = ctxt.OutputTarget
-    Out.Geometry.Points.PositionArray = aOutPosition
+    Out.Geometry.Points.PositionArray = aOutPosition.values
+
+# ========================================================
+def gear_MatchGeometryOp_Term(ctxt):
+    ope.clearPointBuffers(ctxt.Source)
 
 # ========================================================
 def gear_MatchGeometry_Execute():
@@ -245,45 +243,23 @@ def gear_SymmetrizePointsOp_Update(ctxt):
     sym_array = sym_map.Elements.Array
 
     pos_tuple = geometry.Points.PositionArray
-    positions = [pos_tuple[j][i] for i in range(len(pos_tuple[0])) for j in range(len(pos_tuple))]
+    positions = ope.getPointBuffer(ctxt.Source)
+    positions.update(pos_tuple)
 
     # Process
-    for point_index in cls.Elements.Array:
+    points = cls.Elements.Array
+    sym_points = [int(sym_array[0][point_index]) for point_index in points]
 
-        sym_index = int(sym_array[0][point_index])
-
-        if axis == 0:
-            positions[sym_index*3+0] = - pos_tuple[0][point_index]
-            positions[sym_index*3+1] = pos_tuple[1][point_index]
-            positions[sym_index*3+2] = pos_tuple[2][point_index]
-
-            if mirror:
-                positions[point_index*3+0] = - pos_tuple[0][sym_index]
-                positions[point_index*3+1] = pos_tuple[1][sym_index]
-                positions[point_index*3+2] = pos_tuple[2][sym_index]
-
-        elif axis == 1:
-            positions[sym_index*3+0] = pos_tuple[0][point_index]
-            positions[sym_index*3+1] = - pos_tuple[1][point_index]
-            positions[sym_index*3+2] = pos_tuple[2][point_index]
-
-            if mirror:
-                positions[point_index*3+0] = pos_tuple[0][sym_index]
-                positions[point_index*3+1] = - pos_tuple[1][sym_index]
-                positions[point_index*3+2] = pos_tuple[2][sym_index]
-
-        elif axis == 2:
-            positions[sym_index*3+0] = pos_tuple[0][point_index]
-            positions[sym_index*3+1] = pos_tuple[1][point_index]
-            positions[sym_index*3+2] = - pos_tuple[2][point_index]
-
-            if mirror:
-                positions[point_index*3+0] = - pos_tuple[0][sym_index]
-                positions[point_index*3+1] = pos_tuple[1][sym_index]
-                positions[point_index*3+2] = - pos_tuple[2][sym_index]
+    positions.setPoints(sym_points, pnt.mirrorPoints(pos_tuple, points, axis))
+    if mirror:
+        positions.setPoints(points, pnt.mirrorPoints(pos_tuple, sym_points, axis))
 
     Out = ctxt.OutputTarget
-    Out.Geometry.Points.PositionArray = positions
+    Out.Geometry.Points.PositionArray = positions.values
+
+# ========================================================
+def gear_SymmetrizePointsOp_Term(ctxt):
+    ope.clearPointBuffers(ctxt.Source)
 
 # ========================================================
 def gear_SymmetrizePoints_Execute():
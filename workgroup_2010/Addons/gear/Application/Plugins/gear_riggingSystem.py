@@ -35,6 +35,7 @@ import xml.etree.cElementTree as etree
 
 # gear
 import gear
+import gear.profiler as prf
 
 from gear.xsi import xsi, c
 
@@ -75,6 +76,9 @@ def XSILoadPlugin(in_reg):
     # Property
     in_reg.RegisterProperty("gear_GuideToolsUI")
 
+    # Events
+    in_reg.RegisterEvent("gear_BuildProfilerCommand", c.siOnBeginCommand)
+
     return True
 
 # ========================================================
@@ -89,29 +93,76 @@ def XSIUnloadPlugin(in_reg):
 # BUILD
 ##########################################################
 # ========================================================
+def gear_BuildFromSelection_Init(in_ctxt):
+
+    cmd = in_ctxt.Source
+
+    args = cmd.Arguments
+    args.Add("profile", c.siArgumentInput, False)
+    args.Add("profile_path", c.siArgumentInput, "")
+    args.Add("batch", c.siArgumentInput, False)
+    args.Add("refresh_step", c.siArgumentInput, 0)
+    args.Add("incremental", c.siArgumentInput, False)
+    args.Add("use_snapshot", c.siArgumentInput, False)
+
+    return True
+
 ## Build From Selection
-def gear_BuildFromSelection_Execute():
+# @param profile Boolean - True to log the build profile.
+# @param profile_path String - Path of the Chrome trace file of the build profile.
+# @param batch Boolean - True to build without refresh and logs.
+# @param refresh_step Integer - Component steps between refreshes in batch mode.
+# @param incremental Boolean - True to only rebuild the changed components of the last rig built from the guide.
+# @param use_snapshot Boolean - True to load the components unchanged since the last build of the guide from its snapshot.
+def gear_BuildFromSelection_Execute(profile, profile_path, batch, refresh_step, incremental, use_snapshot):
 
     # Build
     rig = Rig()
-    rig.buildFromSelection()
+    rig.buildFromSelection(profile, profile_path or None, batch, refresh_step, use_snapshot, incremental)
 
     return
 
 # ========================================================
+def gear_BuildFromFile_Init(in_ctxt):
+
+    cmd = in_ctxt.Source
+
+    args = cmd.Arguments
+    args.Add("path", c.siArgumentInput, "")
+    args.Add("profile", c.siArgumentInput, False)
+    args.Add("profile_path", c.siArgumentInput, "")
+    args.Add("batch", c.siArgumentInput, False)
+    args.Add("refresh_step", c.siArgumentInput, 0)
+
+    return True
+
 ## Build From File
-def gear_BuildFromFile_Execute():
+# @param path String - Path to the xml guide. Empty to browse for it.
+# @param profile Boolean - True to log the build profile.
+# @param profile_path String - Path of the Chrome trace file of the build profile.
+# @param batch Boolean - True to build without refresh and logs.
+# @param refresh_step Integer - Component steps between refreshes in batch mode.
+def gear_BuildFromFile_Execute(path, profile, profile_path, batch, refresh_step):
 
-    path = uit.fileBrowser("Build From File", TEMPLATE_PATH, "", ["xml"], False)
     if not path:
-        return
+        path = uit.fileBrowser("Build From File", TEMPLATE_PATH, "", ["xml"], False)
+        if not path:
+            return
 
     # Build
     rig = Rig()
-    rig.buildFromFile(path)
+    rig.buildFromFile(path, profile, profile_path or None, batch, refresh_step)
 
     return
 
+# ========================================================
+## Count the commands executed during a profiled build.
+def gear_BuildProfilerCommand_OnEvent(in_ctxt):
+
+    prf.countCommand()
+
+    return False
+
 ##########################################################
 # GUIDE TOOLS
 ##########################################################
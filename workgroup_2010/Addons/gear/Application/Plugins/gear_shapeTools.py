@@ -34,6 +34,7 @@ from gear.xsi import xsi, c, XSIMath, Dispatch, dynDispatch, XSIFactory
 
 import gear.xsi.shape as sha
 import gear.xsi.uitoolkit as uit
+import gear.xsi.topology as topo
 
 ##########################################################
 # XSI LOAD / UNLOAD PLUGIN
@@ -215,31 +216,12 @@ def gear_SmoothShapeOp_Update(ctxt):
 
     # Process ----------------------------------------------
     shape_tuple = shape.Elements.Array
-    shape_array = [shape_tuple[j][i] for i in range(len(shape_tuple[0])) for j in range(len(shape_tuple)) ]
 
     points = cls.Elements.Array
-    vSmoothShape = XSIMath.CreateVector3()
-    vOriShape     = XSIMath.CreateVector3()
-    for i in points:
-
-        vertex = geo.Vertices(i)
-        cNghbVertices = vertex.NeighborVertices(neighbor_depth)
-
-        vSmoothShape.Set(0,0,0)
-        vOriShape.Set(shape_array[i*3+0], shape_array[i*3+1], shape_array[i*3+2])
-        for oVtx in cNghbVertices:
-            index = oVtx.Index
-
-            vSmoothShape.X += shape_array[ index*3+0 ]
-            vSmoothShape.Y += shape_array[ index*3+1 ]
-            vSmoothShape.Z += shape_array[ index*3+2 ]
-
-        vSmoothShape.ScaleInPlace(blend/cNghbVertices.Count)
-        vOriShape.ScaleInPlace(1-blend)
+    stencil = topo.getSmoothingStencil(ctxt.Source, geo, points, neighbor_depth)
+    shape_x, shape_y, shape_z = [stencil.smooth(values, blend) for values in shape_tuple]
 
-        shape_array[ i*3+0 ] = vSmoothShape.X + vOriShape.X
-        shape_array[ i*3+1 ] = vSmoothShape.Y + vOriShape.Y
-        shape_array[ i*3+2 ] = vSmoothShape.Z + vOriShape.Z
+    shape_array = [v for xyz in zip(shape_x, shape_y, shape_z) for v in xyz]
 
     # Output -----------------------------------------------
     Out = ctxt.OutputTarget
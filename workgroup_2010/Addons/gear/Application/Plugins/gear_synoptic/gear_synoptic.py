@@ -36,6 +36,7 @@ import os
 from gear.xsi import xsi, c
 import gear.xsi.plugin as plu
 import gear.xsi.display as dis
+import gear.xsi.synoptictab as stab
 
 ##########################################################
 # XSI LOAD / UNLOAD PLUGIN
@@ -94,8 +95,7 @@ def gear_Synoptic_DefineLayout(in_ctxt):
 
     # Logic
     path = plu.getPluginFullPath("gear_Synoptic")
-    file = open(path)
-    layout.Logic = file.read()
+    layout.Logic = stab.getText(path)
 
     return True
 
@@ -117,8 +117,8 @@ def gear_Synoptic_OnInit():
         PPG.Model.Value = model_items[1]
 
     # Common Logic
-    file = open(plu.getPluginFullPath("gear_Synoptic"))
-    layout.Logic = file.read()
+    logic = [stab.getText(plu.getPluginFullPath("gear_Synoptic"))]
+    layout.Logic = logic[0]
 
     # Default Layout
     if not PPG.Model.Value:
@@ -150,26 +150,23 @@ def gear_Synoptic_OnInit():
     else:
         for tab in tab_names.split(","):
 
-            tab_path = os.path.join(path, "tabs", tab)
-            if not tab or not os.path.exists(tab_path):
+            if not tab:
                 continue
 
-            param_path  = os.path.join(tab_path, "parameters.py")
-            logic_path  = os.path.join(tab_path, "logic.py")
-            layout_path  = os.path.join(tab_path, "layout.py")
+            bundle = stab.getBundle(os.path.join(path, "tabs", tab), tab[tab.find("/")+1:])
+            if bundle is None:
+                continue
 
             # Parameters -------------
-            if os.path.exists(param_path):
-                xsi.ExecuteScript(param_path, "Python", "addParameters", [prop])
+            bundle.addParameters(prop)
 
             # Logic ------------------
-            if os.path.exists(logic_path):
-                file = open(logic_path)
-                layout.Logic += file.read()
+            if bundle.logic:
+                logic.append(bundle.logic)
 
             # Layout -----------------
-            if os.path.exists(layout_path):
-                layout.AddTab(tab[tab.find("/")+1:])
+            if bundle.hasLayout():
+                layout.AddTab(bundle.name)
 
                 layout.AddGroup("Active Model")
                 layout.AddRow()
@@ -181,9 +178,11 @@ def gear_Synoptic_OnInit():
                 layout.EndGroup()
 
                 layout.AddGroup("")
-                xsi.ExecuteScript(layout_path, "Python", "addLayout", [layout, prop])
+                bundle.addLayout(layout, prop)
                 layout.EndGroup()
 
+        layout.Logic = "\n".join(logic)
+
     PPG.Refresh()
 
 ##########################################################
@@ -36,6 +36,7 @@ import gear
 from gear.xsi import xsi, c, XSIMath, Dispatch, dynDispatch
 
 import gear.xsi.utils as uti
+import gear.xsi.topology as topo
 
 ##########################################################
 # XSI LOAD / UNLOAD PLUGIN
@@ -288,21 +289,8 @@ def gear_SmoothWeightMapPointsOp_Update(ctxt):
     # weights = outSel
 
    points = cls.Elements.Array
-   for i in points:
-
-       vertex = geometry.Vertices(i)
-       neighbors = vertex.NeighborVertices(depth)
-
-       smooth_weight = 0
-       for vtx in neighbors:
-           index = vtx.Index
-
-           smooth_weight += weights[index]
-
-       smooth_weight = ((smooth_weight + 0.0) / neighbors.Count) * blend
-       original_weight = weights[i] * (1-blend)
-
-       weights[i] = smooth_weight + original_weight
+   stencil = topo.getSmoothingStencil(ctxt.Source, geometry, points, depth)
+   weights = stencil.smooth(weights, blend)
 
     # Output
    Out = ctxt.OutputTarget